@@ -1,36 +1,73 @@
-from django.db.models import Count, Avg, Q, Min, Max
+from django.db.models import Count, Avg, Exists, F, OuterRef, Q, Min, Max, Sum
+from django.db import transaction
 from django.utils import timezone
 from datetime import datetime, timedelta
 from collections import Counter
 import pandas as pd
-from ..jobs.models import JobPosting, Company, SkillDemand, SalaryInsight
+from ..jobs.models import (
+    AnalyticsRefresh, JobPosting, Company, SkillDemand, SalaryInsight, ScrapeRun, ScrapeTaskStat,
+)
+from ..jobs.gazetteer import get_gazetteer
+from .similarity import build_job_vector, get_similarity_index
+
+# Summed per group by get_scrape_throughput
+SCRAPE_STAT_FIELDS = [
+    'pages_fetched', 'cards_parsed', 'parse_failures', 'jobs_new', 'jobs_updated',
+    'jobs_duplicates', 'jobs_deactivated', 'jobs_reactivated', 'bytes_fetched', 'total_seconds',
+    'page_load_seconds', 'sleep_seconds', 'parse_seconds', 'db_seconds',
+]
 
 class AnalyticsService:
-    def __init__(self):
+    def __init__(self, unique_vacancies=False):
+        self.unique_vacancies = unique_vacancies
         self.current_date = timezone.now()
         self.last_30_days = self.current_date - timedelta(days=30)
         self.last_90_days = self.current_date - timedelta(days=90)
 
+    def _active_jobs(self):
+        """Active postings, collapsed to one per vacancy when requested.
+
+        A vacancy is counted through its canonical posting. Once that is
+        deactivated, its earliest active duplicate stands in for it, so the
+        vacancy is still counted once.
+        """
+        queryset = JobPosting.objects.filter(is_active=True)
+        if self.unique_vacancies:
+            earlier_duplicate = JobPosting.objects.filter(
+                duplicate_of=OuterRef('duplicate_of'), is_active=True, id__lt=OuterRef('id'),
+            )
+            queryset = queryset.filter(
+                Q(duplicate_of__isnull=True)
+                | Q(duplicate_of__is_active=False) & ~Exists(earlier_duplicate)
+            )
+        return queryset
+
+    def _active_job_postings_q(self):
+        """Filter on Company.job_postings matching _active_jobs"""
+        if self.unique_vacancies:
+            return Q(job_postings__in=self._active_jobs())
+        return Q(job_postings__is_active=True)
+
     def get_market_overview(self):
         """Get overall job market statistics"""
-        total_jobs = JobPosting.objects.filter(is_active=True).count()
-        new_jobs_30d = JobPosting.objects.filter(
-            scraped_at__gte=self.last_30_days,
-            is_active=True
+        total_jobs = self._active_jobs().count()
+        new_jobs_30d = self._active_jobs().filter(
+            scraped_at__gte=self.last_30_days
         ).count()
         
-        remote_jobs = JobPosting.objects.filter(
-            remote_type__in=['remote', 'hybrid'],
-            is_active=True
+        remote_jobs = self._active_jobs().filter(
+            remote_type__in=['remote', 'hybrid']
         ).count()
         
-        avg_salary = JobPosting.objects.filter(
-            salary_min__isnull=False,
-            is_active=True
+        avg_salary = self._active_jobs().filter(
+            salary_min__isnull=False
         ).aggregate(Avg('salary_min'))['salary_min__avg']
         
+        unique_vacancies = AnalyticsService(unique_vacancies=True)._active_jobs().count()
+        
         return {
             'total_active_jobs': total_jobs,
+            'unique_vacancies': unique_vacancies,
             'new_jobs_last_30_days': new_jobs_30d,
             'remote_opportunities': remote_jobs,
             'remote_percentage': (remote_jobs / total_jobs * 100) if total_jobs > 0 else 0,
@@ -40,24 +77,25 @@ class AnalyticsService:
     def get_top_companies(self, limit=10):
         """Get companies with most job postings"""
         return Company.objects.annotate(
-            job_count=Count('job_postings', filter=Q(job_postings__is_active=True))
+            job_count=Count('job_postings', filter=self._active_job_postings_q())
         ).filter(job_count__gt=0).order_by('-job_count')[:limit]
 
     def get_location_distribution(self):
         """Get job distribution by location"""
-        return JobPosting.objects.filter(is_active=True).values('county').annotate(
+        # county mirrors county_ref, so grouping on both keeps the indexed key
+        return self._active_jobs().values('county_ref_id', 'county').annotate(
             job_count=Count('id')
         ).order_by('-job_count')[:15]
 
     def get_experience_level_distribution(self):
         """Get job distribution by experience level"""
-        return JobPosting.objects.filter(is_active=True).values('experience_level').annotate(
+        return self._active_jobs().values('experience_level').annotate(
             job_count=Count('id')
         ).order_by('-job_count')
 
     def get_employment_type_distribution(self):
         """Get job distribution by employment type"""
-        return JobPosting.objects.filter(is_active=True).values('employment_type').annotate(
+        return self._active_jobs().values('employment_type').annotate(
             job_count=Count('id')
         ).order_by('-job_count')
 
@@ -69,15 +107,13 @@ class AnalyticsService:
             month_start = self.current_date - timedelta(days=30 * (i + 1))
             month_end = self.current_date - timedelta(days=30 * i)
             
-            total_jobs = JobPosting.objects.filter(
-                scraped_at__range=[month_start, month_end],
-                is_active=True
+            total_jobs = self._active_jobs().filter(
+                scraped_at__range=[month_start, month_end]
             ).count()
             
-            remote_jobs = JobPosting.objects.filter(
+            remote_jobs = self._active_jobs().filter(
                 scraped_at__range=[month_start, month_end],
-                remote_type__in=['remote', 'hybrid'],
-                is_active=True
+                remote_type__in=['remote', 'hybrid']
             ).count()
             
             trends.append({
@@ -91,16 +127,15 @@ class AnalyticsService:
 
     def get_salary_insights(self, job_title=None, location=None):
         """Get salary insights for specific job title or location"""
-        queryset = JobPosting.objects.filter(
-            salary_min__isnull=False,
-            is_active=True
+        queryset = self._active_jobs().filter(
+            salary_min__isnull=False
         )
         
         if job_title:
             queryset = queryset.filter(title__icontains=job_title)
         
         if location:
-            queryset = queryset.filter(location__icontains=location)
+            queryset = queryset.filter(get_gazetteer().location_q(location))
         
         salary_stats = queryset.aggregate(
             min_salary=Min('salary_min'),
@@ -124,7 +159,7 @@ class AnalyticsService:
     def get_top_skills(self, limit=20):
         """Get most in-demand skills"""
         all_skills = []
-        jobs = JobPosting.objects.filter(is_active=True).values_list('skills_required', flat=True)
+        jobs = self._active_jobs().values_list('skills_required', flat=True)
         
         for skill_list in jobs:
             if skill_list:
@@ -136,10 +171,9 @@ class AnalyticsService:
         # Get salary information for each skill
         skills_with_salary = []
         for skill, count in top_skills:
-            avg_salary = JobPosting.objects.filter(
+            avg_salary = self._active_jobs().filter(
                 skills_required__contains=[skill],
-                salary_min__isnull=False,
-                is_active=True
+                salary_min__isnull=False
             ).aggregate(Avg('salary_min'))['salary_min__avg']
             
             skills_with_salary.append({
@@ -150,24 +184,111 @@ class AnalyticsService:
         
         return skills_with_salary
 
+    def _skill_demand(self, skills=None):
+        """Demand, average salary and 30-day growth per skill in one pass over active postings"""
+        jobs = self._active_jobs().exclude(skills_required=[])
+        if skills is not None:
+            jobs = jobs.filter(skills_required__overlap=list(skills))
+        previous_30_days = self.current_date - timedelta(days=60)
+        
+        totals = {}
+        rows = jobs.values_list('skills_required', 'salary_min', 'scraped_at')
+        for skill_list, salary_min, scraped_at in rows.iterator(chunk_size=2000):
+            for skill in set(skill_list):
+                if skills is not None and skill not in skills:
+                    continue
+                total = totals.setdefault(skill, {'demand': 0, 'salary_sum': 0, 'salaries': 0, 'recent': 0, 'previous': 0})
+                total['demand'] += 1
+                if salary_min is not None:
+                    total['salary_sum'] += salary_min
+                    total['salaries'] += 1
+                if scraped_at >= self.last_30_days:
+                    total['recent'] += 1
+                elif scraped_at >= previous_30_days:
+                    total['previous'] += 1
+        
+        demand = {}
+        for skill, total in totals.items():
+            growth = (total['recent'] - total['previous']) / total['previous'] * 100 if total['previous'] else 0
+            demand[skill] = SkillDemand(
+                skill_name=skill,
+                demand_count=total['demand'],
+                avg_salary=round(total['salary_sum'] / total['salaries'], 2) if total['salaries'] else None,
+                growth_rate=round(max(min(growth, 999.99), -999.99), 2),  # fits the column's 5 digits
+            )
+        return demand
+
+    def _save_skill_demand(self, demand, skills):
+        """Upsert the recomputed skills and drop those no active posting asks for any more"""
+        with transaction.atomic():
+            SkillDemand.objects.bulk_create(
+                demand.values(),
+                batch_size=500,
+                update_conflicts=True,
+                unique_fields=['skill_name'],
+                update_fields=['demand_count', 'avg_salary', 'growth_rate', 'last_updated'],
+            )
+            stale = SkillDemand.objects.exclude(skill_name__in=demand.keys())
+            if skills is not None:
+                stale = stale.filter(skill_name__in=skills)
+            stale.delete()
+
     def update_skill_demand(self):
-        """Update skill demand table for faster queries"""
-        skills_data = self.get_top_skills(100)
+        """Recompute the skill demand table from every active posting"""
+        started_at = timezone.now()
+        demand = self._skill_demand()
+        self._save_skill_demand(demand, None)
+        return AnalyticsRefresh.objects.create(
+            kind='full', started_at=started_at, finished_at=timezone.now(), skills_updated=len(demand),
+        )
+
+    def refresh_skill_demand(self, run):
+        """Recompute skill demand only for the skills of postings a scrape run changed.
+
+        Each ingest task records the skills of the postings it inserted,
+        reactivated or deactivated on its stats row. Postings merely seen
+        again change no figures, so every other skill is left as it is.
+        """
+        started_at = timezone.now()
+        skills = set()
+        for skill_list in run.task_stats.values_list('skills_changed', flat=True):
+            skills.update(skill_list)
+        postings_changed = run.task_stats.aggregate(
+            total=Sum(F('jobs_new') + F('jobs_reactivated') + F('jobs_deactivated'))
+        )['total'] or 0
         
-        # Clear existing data
-        SkillDemand.objects.all().delete()
+        demand = self._skill_demand(skills) if skills else {}
+        if skills:
+            self._save_skill_demand(demand, skills)
         
-        # Insert new data
-        skill_objects = []
-        for skill_info in skills_data:
-            skill_objects.append(SkillDemand(
-                skill_name=skill_info['skill'],
-                demand_count=skill_info['demand_count'],
-                avg_salary=skill_info['average_salary'],
-                growth_rate=0  # TODO: Calculate growth rate
-            ))
+        finished_at = timezone.now()
+        first_scraped_at = run.task_stats.aggregate(Min('finished_at'))['finished_at__min']
+        return AnalyticsRefresh.objects.create(
+            run=run,
+            kind='incremental',
+            started_at=started_at,
+            finished_at=finished_at,
+            postings_changed=postings_changed,
+            skills_updated=len(skills),
+            lag_seconds=(finished_at - first_scraped_at).total_seconds() if first_scraped_at else None,
+        )
+
+    def get_analytics_freshness(self, days=7):
+        """How current the skill demand table is, and how long scraped data waits to reach it"""
+        refreshes = AnalyticsRefresh.objects.filter(finished_at__gte=self.current_date - timedelta(days=days))
+        last = AnalyticsRefresh.objects.first()
+        lag = refreshes.filter(kind='incremental').aggregate(
+            avg_lag_seconds=Avg('lag_seconds'), max_lag_seconds=Max('lag_seconds'),
+        )
         
-        SkillDemand.objects.bulk_create(skill_objects)
+        return {
+            'period_days': days,
+            'last_refresh_at': last.finished_at if last else None,
+            'last_refresh_kind': last.kind if last else None,
+            'age_seconds': (self.current_date - last.finished_at).total_seconds() if last else None,
+            'refreshes': refreshes.count(),
+            **lag,
+        }
 
     def get_hiring_trends(self, period_days=30):
         """Get hiring trends over specified period"""
@@ -181,9 +302,8 @@ class AnalyticsService:
         while current_date <= end_date:
             next_date = current_date + timedelta(days=1)
             
-            daily_count = JobPosting.objects.filter(
-                scraped_at__range=[current_date, next_date],
-                is_active=True
+            daily_count = self._active_jobs().filter(
+                scraped_at__range=[current_date, next_date]
             ).count()
             
             daily_trends.append({
@@ -198,9 +318,67 @@ class AnalyticsService:
     def get_industry_insights(self):
         """Get insights by industry (based on company industry)"""
         return Company.objects.filter(
-            industry__isnull=False,
-            job_postings__is_active=True
+            self._active_job_postings_q(),
+            industry__isnull=False
         ).values('industry').annotate(
             job_count=Count('job_postings'),
             avg_salary=Avg('job_postings__salary_min')
-        ).order_by('-job_count')[:15]
\ No newline at end of file
+        ).order_by('-job_count')[:15]
+
+    def get_similar_jobs(self, job, limit=10):
+        """Get active postings most similar to the given job"""
+        vector = job.feature_vector or build_job_vector(
+            job.title, job.skills_required, job.description
+        )
+        matches = get_similarity_index().query(vector, k=limit, exclude={job.id})
+        
+        jobs_by_id = JobPosting.objects.filter(is_active=True).select_related('company').in_bulk(
+            [job_id for job_id, _ in matches]
+        )
+        
+        similar_jobs = []
+        for job_id, score in matches:
+            similar_job = jobs_by_id.get(job_id)
+            if similar_job:
+                similar_job.similarity = round(score, 4)
+                similar_jobs.append(similar_job)
+        
+        return similar_jobs
+
+    def get_scrape_throughput(self, days=7):
+        """Summarise scrape task telemetry by platform, search term and run"""
+        stats = ScrapeTaskStat.objects.filter(started_at__gte=self.current_date - timedelta(days=days))
+        totals = dict(
+            tasks=Count('id'),
+            failed_tasks=Count('id', filter=Q(status='failed')),
+            skipped_tasks=Count('id', filter=Q(status='skipped')),
+            **{field: Sum(field) for field in SCRAPE_STAT_FIELDS},
+        )
+        
+        def with_rates(row):
+            # New postings per worker-hour shows where scraping time pays off
+            hours = (row['total_seconds'] or 0) / 3600
+            row['new_jobs_per_hour'] = round(row['jobs_new'] / hours, 1) if hours else None
+            return row
+        
+        by_platform = stats.values('platform').annotate(**totals).order_by('-total_seconds')
+        by_search_term = stats.values('platform', 'search_term', 'location').annotate(
+            **totals
+        ).order_by('-total_seconds')[:20]
+        recent_runs = ScrapeRun.objects.annotate(
+            tasks_finished=Count('task_stats'),
+            jobs_new=Sum('task_stats__jobs_new'),
+            pages_fetched=Sum('task_stats__pages_fetched'),
+            total_seconds=Sum('task_stats__total_seconds'),
+            last_finished_at=Max('task_stats__finished_at'),
+        ).values(
+            'id', 'started_at', 'trigger', 'tasks_queued', 'tasks_finished',
+            'jobs_new', 'pages_fetched', 'total_seconds', 'last_finished_at',
+        )[:10]
+        
+        return {
+            'period_days': days,
+            'by_platform': [with_rates(row) for row in by_platform],
+            'by_search_term': [with_rates(row) for row in by_search_term],
+            'recent_runs': list(recent_runs),
+        }
@@ -0,0 +1,242 @@
+import re
+import math
+import time
+import zlib
+import threading
+import logging
+from collections import Counter, defaultdict
+from datetime import timedelta
+import numpy as np
+from django.conf import settings
+from django.db import connection
+
+logger = logging.getLogger(__name__)
+
+VECTOR_DIM = 256
+# last_updated is stamped before commit, so a sync can see a later timestamp
+# before an earlier one commits; each sync re-reads this far back
+SYNC_OVERLAP = timedelta(minutes=5)
+
+# Title words say more about a role than description words do
+FIELD_WEIGHTS = {
+    'title': 3.0,
+    'skills': 2.0,
+    'description': 1.0,
+}
+
+STOP_WORDS = {
+    'a', 'an', 'and', 'are', 'as', 'at', 'be', 'by', 'for', 'from', 'in', 'is',
+    'it', 'of', 'on', 'or', 'our', 'that', 'the', 'this', 'to', 'we', 'will',
+    'with', 'you', 'your', 'job', 'role', 'work', 'team', 'kenya',
+}
+
+TOKEN_PATTERN = re.compile(r'[a-z0-9][a-z0-9+#]*')
+
+
+def tokenize(text):
+    """Split text into lowercase tokens, dropping stop words"""
+    return [
+        token for token in TOKEN_PATTERN.findall((text or '').lower())
+        if token not in STOP_WORDS and len(token) > 1
+    ]
+
+
+def _hash_feature(feature):
+    """Map a feature to a (bucket, sign) pair using the hashing trick"""
+    h = zlib.crc32(feature.encode('utf-8'))
+    return h % VECTOR_DIM, 1.0 if h & 0x80000000 else -1.0
+
+
+def build_job_vector(title, skills, description):
+    """Build a unit-length hashed feature vector for a job posting"""
+    features = Counter()
+    for token in tokenize(title):
+        features[token] += FIELD_WEIGHTS['title']
+    for skill in skills or []:
+        features[f"skill:{skill.lower()}"] += FIELD_WEIGHTS['skills']
+    for token in tokenize(description):
+        features[token] += FIELD_WEIGHTS['description']
+
+    vector = np.zeros(VECTOR_DIM, dtype=np.float32)
+    for feature, weight in features.items():
+        bucket, sign = _hash_feature(feature)
+        # Sublinear term frequency keeps long descriptions from dominating
+        vector[bucket] += sign * (1.0 + math.log(weight))
+
+    norm = np.linalg.norm(vector)
+    if norm == 0:
+        return []
+    return [round(float(value), 5) for value in vector / norm]
+
+
+class SimilarityIndex:
+    """In-process random-projection LSH index over job feature vectors"""
+
+    def __init__(self, dim=VECTOR_DIM, num_tables=8, num_bits=10, seed=42):
+        rng = np.random.default_rng(seed)
+        self.planes = rng.standard_normal((num_tables, num_bits, dim)).astype(np.float32)
+        self.bit_weights = 1 << np.arange(num_bits, dtype=np.int64)
+        self.num_bits = num_bits
+        self.tables = [defaultdict(set) for _ in range(num_tables)]
+        self.vectors = {}
+        self.bucket_keys = {}
+        self.lock = threading.RLock()
+        self.refresh_lock = threading.Lock()
+        self.synced_at = None
+        self.last_refresh = None
+
+    def __len__(self):
+        return len(self.vectors)
+
+    def _keys_for(self, vector):
+        bits = np.einsum('tbd,d->tb', self.planes, vector) > 0
+        return tuple(int(key) for key in bits.astype(np.int64) @ self.bit_weights)
+
+    def add(self, job_id, vector):
+        """Insert or replace a job's vector"""
+        if not vector:
+            self.remove(job_id)
+            return
+        vector = np.asarray(vector, dtype=np.float32)
+        keys = self._keys_for(vector)
+        with self.lock:
+            self.remove(job_id)
+            self.vectors[job_id] = vector
+            self.bucket_keys[job_id] = keys
+            for table, key in zip(self.tables, keys):
+                table[key].add(job_id)
+
+    def remove(self, job_id):
+        """Drop a job from the index if present"""
+        with self.lock:
+            keys = self.bucket_keys.pop(job_id, None)
+            self.vectors.pop(job_id, None)
+            if keys is None:
+                return
+            for table, key in zip(self.tables, keys):
+                bucket = table.get(key)
+                if bucket is not None:
+                    bucket.discard(job_id)
+                    if not bucket:
+                        del table[key]
+
+    def _candidates(self, keys, min_candidates):
+        candidates = set()
+        for table, key in zip(self.tables, keys):
+            candidates |= table.get(key, set())
+        if len(candidates) >= min_candidates:
+            return candidates
+
+        # Multi-probe: look in buckets one bit away before giving up
+        for table, key in zip(self.tables, keys):
+            for bit in range(self.num_bits):
+                candidates |= table.get(key ^ (1 << bit), set())
+        return candidates
+
+    def query(self, vector, k=10, exclude=None):
+        """Return up to k (job_id, similarity) pairs, most similar first"""
+        if not vector:
+            return []
+        vector = np.asarray(vector, dtype=np.float32)
+        exclude = exclude or set()
+
+        with self.lock:
+            candidates = [
+                job_id for job_id in self._candidates(self._keys_for(vector), k + len(exclude))
+                if job_id not in exclude
+            ]
+            if not candidates:
+                return []
+            matrix = np.stack([self.vectors[job_id] for job_id in candidates])
+
+        scores = matrix @ vector
+        top = min(k, len(candidates))
+        best = np.argpartition(-scores, top - 1)[:top]
+        best = best[np.argsort(-scores[best])]
+        return [(candidates[i], float(scores[i])) for i in best]
+
+    def _due(self):
+        interval = getattr(settings, 'SIMILAR_JOBS_INDEX_REFRESH', 300)
+        return self.last_refresh is None or time.monotonic() - self.last_refresh >= interval
+
+    def refresh(self, force=False, full=False):
+        """Pull postings changed since the last sync into the index and drop inactive ones.
+
+        Rows are applied one at a time, so queries keep running against the
+        index while a sync reads the table. Only one sync runs at a time.
+        full=True re-reads every active posting whatever its last_updated.
+        """
+        if not force and not self._due():
+            return 0
+        if not self.refresh_lock.acquire(blocking=False):
+            return 0
+
+        from ..jobs.models import JobPosting
+
+        try:
+            synced_at = None if full else self.synced_at
+            if synced_at is None:
+                queryset = JobPosting.objects.filter(is_active=True)
+            else:
+                # add() replaces, so postings read twice are harmless
+                queryset = JobPosting.objects.filter(last_updated__gt=synced_at - SYNC_OVERLAP)
+            rows = queryset.values_list(
+                'id', 'is_active', 'feature_vector', 'title',
+                'skills_required', 'description', 'last_updated'
+            )
+
+            changed = 0
+            for job_id, is_active, vector, title, skills, description, last_updated in rows.iterator(chunk_size=2000):
+                if is_active:
+                    self.add(job_id, vector or build_job_vector(title, skills, description))
+                else:
+                    self.remove(job_id)
+                if synced_at is None or last_updated > synced_at:
+                    synced_at = last_updated
+                changed += 1
+
+            # Postings deleted by cleanup never show up as changed rows
+            removed = 0
+            if self.synced_at is not None:
+                active = set(JobPosting.objects.filter(is_active=True).values_list('id', flat=True))
+                with self.lock:
+                    gone = [job_id for job_id in self.vectors if job_id not in active]
+                for job_id in gone:
+                    self.remove(job_id)
+                removed = len(gone)
+
+            self.synced_at = synced_at
+            self.last_refresh = time.monotonic()
+        finally:
+            self.refresh_lock.release()
+
+        if changed or removed:
+            logger.info(f"Similarity index synced {changed} postings, removed {removed} ({len(self)} indexed)")
+        return changed
+
+    def _refresh_in_thread(self):
+        try:
+            self.refresh(force=True)
+        except Exception as e:
+            logger.error(f"Error syncing similarity index: {e}")
+        finally:
+            connection.close()
+
+    def refresh_in_background(self):
+        """Start a sync on a daemon thread when one is due, so no request waits on it"""
+        if self._due() and not self.refresh_lock.locked():
+            threading.Thread(target=self._refresh_in_thread, name='similarity-index', daemon=True).start()
+
+
+_index = None
+_index_lock = threading.Lock()
+
+
+def get_similarity_index():
+    """Return the process-wide similarity index, starting a background sync if stale"""
+    global _index
+    with _index_lock:
+        if _index is None:
+            _index = SimilarityIndex()
+    _index.refresh_in_background()
+    return _index
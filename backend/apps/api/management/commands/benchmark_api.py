@@ -0,0 +1,131 @@
+import json
+import time
+import statistics
+from django.core.management import call_command
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test import Client
+from django.test.utils import CaptureQueriesContext
+from django.urls import URLPattern, reverse
+from ....jobs.models import JobPosting
+from ....jobs.synthetic import SYNTHETIC_PLATFORM
+from ....analytics.similarity import get_similarity_index
+from ...urls import urlpatterns
+
+# Routes that change state, hold the connection open or need an owner's email or token are not benchmarked
+SKIPPED_ROUTES = {
+    'trigger-scraping', 'job-stream', 'saved-search-list', 'saved-search-detail', 'saved-search-alerts',
+}
+
+# Extra query strings measured alongside the bare route
+ROUTE_VARIANTS = {
+    'job-list': ['search=python', 'location=Nairobi', 'skills=Python', 'min_salary=100000', 'unique=true'],
+    'salary-insights': ['job_title=engineer', 'location=Nairobi'],
+    'hiring-trends': ['period=90'],
+    'top-skills': ['limit=50'],
+}
+
+
+class Command(BaseCommand):
+    help = 'Measure latency and query counts for every API route, optionally at several synthetic dataset sizes'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--repeat', type=int, default=5, help='Timed requests per route')
+        parser.add_argument(
+            '--sizes', type=int, nargs='+',
+            help='Regenerate the synthetic dataset with this many postings before each round',
+        )
+        parser.add_argument('--route', help='Only routes whose name contains this')
+        parser.add_argument('--output', help='Write the report to this JSON file')
+        parser.add_argument('--baseline', help='Report from --output to compare latency against')
+
+    def handle(self, *args, **options):
+        report = {}
+        for size in options['sizes'] or [None]:
+            if size is not None:
+                self.stdout.write(f"Generating {size} synthetic postings")
+                call_command('generate_synthetic_data', jobs=size, verbosity=0)
+            label = str(size) if size is not None else 'current'
+            report[label] = self._benchmark(options)
+            self._print(label, report[label])
+
+        if options['output']:
+            with open(options['output'], 'w', encoding='utf-8') as handle:
+                json.dump(report, handle, indent=2)
+        if options['baseline']:
+            self._compare(report, options['baseline'])
+
+    def _urls(self, route_filter):
+        """(name, url) for every GET route, with a sample posting for detail routes"""
+        # The detail route counts views, so only generated postings are requested
+        sample = (
+            JobPosting.objects.filter(is_active=True, source_platform=SYNTHETIC_PLATFORM)
+            .order_by('-posted_date').values_list('id', flat=True).first()
+        )
+        for pattern in urlpatterns:
+            if not isinstance(pattern, URLPattern) or pattern.name in SKIPPED_ROUTES:
+                continue
+            if route_filter and route_filter not in pattern.name:
+                continue
+            if 'pk' in pattern.pattern.converters:
+                if sample is None:
+                    self.stderr.write(f"Skipping {pattern.name}: no active synthetic postings")
+                    continue
+                url = reverse(pattern.name, kwargs={'pk': sample})
+            else:
+                url = reverse(pattern.name)
+            yield pattern.name, url
+            for query in ROUTE_VARIANTS.get(pattern.name, []):
+                yield f"{pattern.name}?{query}", f"{url}?{query}"
+
+    def _benchmark(self, options):
+        # SERVER_NAME must be an allowed host; the test client's default 'testserver' is not
+        client = Client(SERVER_NAME='localhost')
+        # Requests only start a background sync; measure against a loaded index
+        get_similarity_index().refresh(full=True)
+        results = {}
+        for name, url in self._urls(options['route']):
+            # The first request warms connections and imports; it is not timed
+            response = client.get(url)
+            timings = []
+            with CaptureQueriesContext(connection) as queries:
+                for _ in range(options['repeat']):
+                    start = time.perf_counter()
+                    client.get(url)
+                    timings.append((time.perf_counter() - start) * 1000)
+            timings.sort()
+            results[name] = {
+                'status': response.status_code,
+                'queries': len(queries) / options['repeat'],
+                'mean_ms': statistics.mean(timings),
+                'p50_ms': statistics.median(timings),
+                'p95_ms': timings[min(int(len(timings) * 0.95), len(timings) - 1)],
+            }
+        return results
+
+    def _print(self, label, results):
+        self.stdout.write(f"\nDataset: {label}")
+        self.stdout.write(f"{'route':<48}{'status':>7}{'queries':>9}{'mean ms':>10}{'p50 ms':>10}{'p95 ms':>10}")
+        for name, result in results.items():
+            self.stdout.write(
+                f"{name:<48}{result['status']:>7}{result['queries']:>9.0f}{result['mean_ms']:>10.1f}"
+                f"{result['p50_ms']:>10.1f}{result['p95_ms']:>10.1f}"
+            )
+
+    def _compare(self, report, baseline_path):
+        try:
+            with open(baseline_path, encoding='utf-8') as handle:
+                baseline = json.load(handle)
+        except (OSError, ValueError) as e:
+            raise CommandError(f"Could not read baseline {baseline_path}: {e}")
+
+        self.stdout.write(f"\nAgainst {baseline_path} (p50 ratio, queries before -> after)")
+        for label, results in report.items():
+            for name, result in results.items():
+                before = baseline.get(label, {}).get(name)
+                if not before or not before['p50_ms']:
+                    continue
+                self.stdout.write(
+                    f"{label:>10} {name:<48}{result['p50_ms'] / before['p50_ms']:>7.2f}x"
+                    f"{before['queries']:>6.0f} -> {result['queries']:.0f}"
+                )
@@ -1,5 +1,7 @@
 from rest_framework import serializers
-from ..jobs.models import JobPosting, Company, SkillDemand
+from ..jobs.models import JobPosting, Company, SkillDemand, SavedSearch, JobAlert
+from ..jobs.gazetteer import get_gazetteer
+from ..jobs.skills import SKILLS, normalize
 
 class CompanySerializer(serializers.ModelSerializer):
     job_count = serializers.IntegerField(read_only=True)
@@ -21,7 +23,57 @@ class JobPostingSerializer(serializers.ModelSerializer):
             'posted_date', 'scraped_at', 'is_active'
         ]
 
+class SimilarJobSerializer(JobPostingSerializer):
+    similarity = serializers.FloatField(read_only=True)
+    
+    class Meta(JobPostingSerializer.Meta):
+        fields = JobPostingSerializer.Meta.fields + ['similarity']
+
 class SkillDemandSerializer(serializers.ModelSerializer):
     class Meta:
         model = SkillDemand
-        fields = ['skill_name', 'demand_count', 'growth_rate', 'avg_salary', 'last_updated']
\ No newline at end of file
+        fields = ['skill_name', 'demand_count', 'growth_rate', 'avg_salary', 'last_updated']
+
+# Skill names and synonyms, case-insensitively, to their canonical name
+SKILL_NAMES = {
+    normalize(term): canonical
+    for canonical, synonyms in SKILLS.items()
+    for term in [canonical] + synonyms
+}
+
+class SavedSearchSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = SavedSearch
+        fields = [
+            'id', 'email', 'name', 'skills', 'county', 'min_salary', 'remote_type',
+            'is_active', 'created_at', 'updated_at'
+        ]
+        read_only_fields = ['created_at', 'updated_at']
+    
+    def validate_skills(self, skills):
+        unknown = [skill for skill in skills if normalize(skill) not in SKILL_NAMES]
+        if unknown:
+            raise serializers.ValidationError(f"Unknown skills: {', '.join(unknown)}")
+        return list(dict.fromkeys(SKILL_NAMES[normalize(skill)] for skill in skills))
+    
+    def validate_county(self, county):
+        if not county:
+            return ''
+        # Stored as the canonical name, which is what postings carry
+        match = get_gazetteer().match(county)
+        if match.county is None:
+            raise serializers.ValidationError(f"Unknown county: {county}")
+        return match.county
+
+class SavedSearchCreateSerializer(SavedSearchSerializer):
+    """Adds the management token, which is only ever shown to whoever created the search"""
+    class Meta(SavedSearchSerializer.Meta):
+        fields = SavedSearchSerializer.Meta.fields + ['token']
+        read_only_fields = SavedSearchSerializer.Meta.read_only_fields + ['token']
+
+class JobAlertSerializer(serializers.ModelSerializer):
+    job = JobPostingSerializer(read_only=True)
+    
+    class Meta:
+        model = JobAlert
+        fields = ['id', 'job', 'created_at', 'sent_at']
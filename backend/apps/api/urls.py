@@ -5,11 +5,18 @@ from . import views
 urlpatterns = [
     # Job listings
     path('jobs/', views.JobPostingListView.as_view(), name='job-list'),
+    path('jobs/stream/', views.job_stream, name='job-stream'),
     path('jobs/<uuid:pk>/', views.JobPostingDetailView.as_view(), name='job-detail'),
+    path('jobs/<uuid:pk>/similar/', views.similar_jobs, name='job-similar'),
     
     # Companies
     path('companies/', views.CompanyListView.as_view(), name='company-list'),
     
+    # Saved searches and job alerts
+    path('saved-searches/', views.SavedSearchListView.as_view(), name='saved-search-list'),
+    path('saved-searches/<int:pk>/', views.SavedSearchDetailView.as_view(), name='saved-search-detail'),
+    path('saved-searches/<int:pk>/alerts/', views.JobAlertListView.as_view(), name='saved-search-alerts'),
+    
     # Skills
     path('skills/', views.SkillDemandListView.as_view(), name='skill-list'),
     path('skills/top/', views.top_skills, name='top-skills'),
@@ -23,6 +30,8 @@ urlpatterns = [
     path('analytics/salary-insights/', views.salary_insights, name='salary-insights'),
     path('analytics/hiring-trends/', views.hiring_trends, name='hiring-trends'),
     path('analytics/industry-insights/', views.industry_insights, name='industry-insights'),
+    path('analytics/scrape-stats/', views.scrape_stats, name='scrape-stats'),
+    path('analytics/freshness/', views.analytics_freshness, name='analytics-freshness'),
     
     # Admin actions
     path('admin/trigger-scraping/', views.trigger_scraping, name='trigger-scraping'),
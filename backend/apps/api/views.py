@@ -1,18 +1,32 @@
 from rest_framework import generics, status
 from rest_framework.decorators import api_view
+from rest_framework.exceptions import ValidationError
 from rest_framework.response import Response
 from rest_framework.pagination import PageNumberPagination
+from django.conf import settings
 from django.db.models import Q
+from django.http import StreamingHttpResponse
+from django.shortcuts import get_object_or_404
+from django.views.decorators.http import require_GET
 from django_filters.rest_framework import DjangoFilterBackend
-from ..jobs.models import JobPosting, Company, SkillDemand
+from ..jobs.models import JobPosting, Company, SkillDemand, SavedSearch, JobAlert
+from ..jobs.gazetteer import get_gazetteer
+from ..jobs.change_feed import stream_changes
 from ..analytics.services import AnalyticsService
-from .serializers import JobPostingSerializer, CompanySerializer, SkillDemandSerializer
+from .serializers import (
+    JobPostingSerializer, CompanySerializer, SkillDemandSerializer, SimilarJobSerializer,
+    SavedSearchSerializer, SavedSearchCreateSerializer, JobAlertSerializer,
+)
 
 class StandardResultsSetPagination(PageNumberPagination):
     page_size = 20
     page_size_query_param = 'page_size'
     max_page_size = 100
 
+def unique_vacancies_requested(request):
+    """Whether analytics should collapse cross-platform duplicates"""
+    return request.query_params.get('unique', '').lower() in ('1', 'true', 'yes')
+
 class JobPostingListView(generics.ListAPIView):
     serializer_class = JobPostingSerializer
     pagination_class = StandardResultsSetPagination
@@ -35,10 +49,7 @@ class JobPostingListView(generics.ListAPIView):
         # Location filter
         location = self.request.query_params.get('location', None)
         if location:
-            queryset = queryset.filter(
-                Q(location__icontains=location) |
-                Q(county__icontains=location)
-            )
+            queryset = queryset.filter(get_gazetteer().location_q(location))
         
         # Salary range filter
         min_salary = self.request.query_params.get('min_salary', None)
@@ -72,6 +83,36 @@ class JobPostingDetailView(generics.RetrieveAPIView):
         serializer = self.get_serializer(instance)
         return Response(serializer.data)
 
+@api_view(['GET'])
+def similar_jobs(request, pk):
+    """Get postings similar to a job"""
+    job = get_object_or_404(JobPosting, pk=pk, is_active=True)
+    try:
+        limit = int(request.query_params.get('limit', 10))
+    except ValueError:
+        raise ValidationError({'limit': 'A whole number is required.'})
+    limit = max(1, min(limit, settings.SIMILAR_JOBS_MAX_RESULTS))
+    
+    analytics = AnalyticsService()
+    jobs = analytics.get_similar_jobs(job, limit)
+    serializer = SimilarJobSerializer(jobs, many=True)
+    return Response(serializer.data)
+
+# A plain Django view: DRF content negotiation would reject Accept: text/event-stream
+@require_GET
+def job_stream(request):
+    """Stream new and deactivated postings as Server-Sent Events"""
+    last_event_id = request.headers.get('Last-Event-ID') or request.GET.get('last_event_id') or '0'
+    try:
+        last_id = int(last_event_id)
+    except ValueError:
+        last_id = 0
+    
+    response = StreamingHttpResponse(stream_changes(last_id), content_type='text/event-stream')
+    response['Cache-Control'] = 'no-cache'
+    response['X-Accel-Buffering'] = 'no'  # stop nginx holding events back
+    return response
+
 class CompanyListView(generics.ListAPIView):
     serializer_class = CompanySerializer
     pagination_class = StandardResultsSetPagination
@@ -80,6 +121,44 @@ class CompanyListView(generics.ListAPIView):
         analytics = AnalyticsService()
         return analytics.get_top_companies(50)
 
+def saved_search_token(request):
+    """The management token returned when a search was created, from a header or ?token="""
+    return request.headers.get('X-Search-Token') or request.query_params.get('token', '')
+
+class SavedSearchListView(generics.ListCreateAPIView):
+    pagination_class = StandardResultsSetPagination
+    
+    def get_serializer_class(self):
+        if self.request.method == 'POST':
+            return SavedSearchCreateSerializer
+        return SavedSearchSerializer
+    
+    def get_queryset(self):
+        # One search's token lists its owner's searches; an email alone exposes nothing
+        token = saved_search_token(self.request)
+        if not token:
+            raise ValidationError({'token': 'An X-Search-Token header or token query parameter is required.'})
+        email = SavedSearch.objects.filter(token=token).values_list('email', flat=True).first()
+        if email is None:
+            return SavedSearch.objects.none()
+        return SavedSearch.objects.filter(email__iexact=email).order_by('-created_at')
+
+class SavedSearchDetailView(generics.RetrieveUpdateDestroyAPIView):
+    """One saved search; a missing or wrong token is a 404 so ids cannot be probed"""
+    serializer_class = SavedSearchSerializer
+    
+    def get_queryset(self):
+        return SavedSearch.objects.filter(token=saved_search_token(self.request))
+
+class JobAlertListView(generics.ListAPIView):
+    """Postings that matched a saved search, newest first"""
+    serializer_class = JobAlertSerializer
+    pagination_class = StandardResultsSetPagination
+    
+    def get_queryset(self):
+        get_object_or_404(SavedSearch, pk=self.kwargs['pk'], token=saved_search_token(self.request))
+        return JobAlert.objects.filter(saved_search_id=self.kwargs['pk']).select_related('job__company')
+
 class SkillDemandListView(generics.ListAPIView):
     queryset = SkillDemand.objects.all()
     serializer_class = SkillDemandSerializer
@@ -88,35 +167,35 @@ class SkillDemandListView(generics.ListAPIView):
 @api_view(['GET'])
 def market_overview(request):
     """Get overall market statistics"""
-    analytics = AnalyticsService()
+    analytics = AnalyticsService(unique_vacancies_requested(request))
     data = analytics.get_market_overview()
     return Response(data)
 
 @api_view(['GET'])
 def location_distribution(request):
     """Get job distribution by location"""
-    analytics = AnalyticsService()
+    analytics = AnalyticsService(unique_vacancies_requested(request))
     data = analytics.get_location_distribution()
     return Response(data)
 
 @api_view(['GET'])
 def experience_distribution(request):
     """Get job distribution by experience level"""
-    analytics = AnalyticsService()
+    analytics = AnalyticsService(unique_vacancies_requested(request))
     data = analytics.get_experience_level_distribution()
     return Response(data)
 
 @api_view(['GET'])
 def employment_type_distribution(request):
     """Get job distribution by employment type"""
-    analytics = AnalyticsService()
+    analytics = AnalyticsService(unique_vacancies_requested(request))
     data = analytics.get_employment_type_distribution()
     return Response(data)
 
 @api_view(['GET'])
 def remote_work_trends(request):
     """Get remote work trends over time"""
-    analytics = AnalyticsService()
+    analytics = AnalyticsService(unique_vacancies_requested(request))
     data = analytics.get_remote_work_trends()
     return Response(data)
 
@@ -126,7 +205,7 @@ def salary_insights(request):
     job_title = request.query_params.get('job_title', None)
     location = request.query_params.get('location', None)
     
-    analytics = AnalyticsService()
+    analytics = AnalyticsService(unique_vacancies_requested(request))
     data = analytics.get_salary_insights(job_title, location)
     return Response(data)
 
@@ -134,7 +213,7 @@ def salary_insights(request):
 def top_skills(request):
     """Get top skills in demand"""
     limit = int(request.query_params.get('limit', 20))
-    analytics = AnalyticsService()
+    analytics = AnalyticsService(unique_vacancies_requested(request))
     data = analytics.get_top_skills(limit)
     return Response(data)
 
@@ -142,24 +221,40 @@ def top_skills(request):
 def hiring_trends(request):
     """Get hiring trends"""
     period = int(request.query_params.get('period', 30))
-    analytics = AnalyticsService()
+    analytics = AnalyticsService(unique_vacancies_requested(request))
     data = analytics.get_hiring_trends(period)
     return Response(data)
 
 @api_view(['GET'])
 def industry_insights(request):
     """Get industry insights"""
-    analytics = AnalyticsService()
+    analytics = AnalyticsService(unique_vacancies_requested(request))
     data = analytics.get_industry_insights()
     return Response(data)
 
+@api_view(['GET'])
+def scrape_stats(request):
+    """Get scraper throughput and time breakdown per platform and search term"""
+    days = int(request.query_params.get('days', 7))
+    analytics = AnalyticsService()
+    data = analytics.get_scrape_throughput(days)
+    return Response(data)
+
+@api_view(['GET'])
+def analytics_freshness(request):
+    """Get how current the skill demand analytics are"""
+    days = int(request.query_params.get('days', 7))
+    analytics = AnalyticsService()
+    data = analytics.get_analytics_freshness(days)
+    return Response(data)
+
 @api_view(['POST'])
 def trigger_scraping(request):
     """Manually trigger scraping jobs"""
     from ..scrapers.tasks import scrape_all_platforms
     
     # Trigger background task
-    task = scrape_all_platforms.delay()
+    task = scrape_all_platforms.delay(trigger='manual')
     
     return Response({
         'message': 'Scraping initiated',
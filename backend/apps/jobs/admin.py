@@ -1,6 +1,10 @@
 
 from django.contrib import admin
-from .models import Company, JobPosting, SalaryInsight, SkillDemand
+from django.db.models import Count, Sum
+from .models import (
+    AnalyticsRefresh, ArchivedPage, CareerSite, Company, County, JobAlert, JobPosting, SalaryInsight,
+    SavedSearch, ScrapeRun, ScrapeTaskStat, SkillDemand, Town,
+)
 
 @admin.register(Company)
 class CompanyAdmin(admin.ModelAdmin):
@@ -9,6 +13,19 @@ class CompanyAdmin(admin.ModelAdmin):
     search_fields = ['name', 'industry', 'location']
     ordering = ['-created_at']
 
+@admin.register(County)
+class CountyAdmin(admin.ModelAdmin):
+    list_display = ['code', 'name']
+    search_fields = ['name']
+    ordering = ['code']
+
+@admin.register(Town)
+class TownAdmin(admin.ModelAdmin):
+    list_display = ['name', 'county']
+    list_filter = ['county']
+    search_fields = ['name', 'county__name']
+    ordering = ['name']
+
 @admin.register(JobPosting)
 class JobPostingAdmin(admin.ModelAdmin):
     list_display = [
@@ -29,7 +46,7 @@ class JobPostingAdmin(admin.ModelAdmin):
             'fields': ('title', 'company', 'description', 'requirements')
         }),
         ('Location & Work Type', {
-            'fields': ('location', 'county', 'remote_type')
+            'fields': ('location', 'county', 'county_ref', 'town', 'remote_type')
         }),
         ('Employment Details', {
             'fields': ('employment_type', 'experience_level')
@@ -67,7 +84,7 @@ class SalaryInsightAdmin(admin.ModelAdmin):
 @admin.action(description='Trigger job scraping')
 def trigger_scraping(modeladmin, request, queryset):
     from apps.scrapers.tasks import scrape_all_platforms
-    scrape_all_platforms.delay()
+    scrape_all_platforms.delay(trigger='manual')
     modeladmin.message_user(request, "Job scraping has been triggered.")
 
 @admin.action(description='Update skill demand analytics')
@@ -77,4 +94,99 @@ def update_skill_analytics(modeladmin, request, queryset):
     modeladmin.message_user(request, "Skill demand analytics update has been triggered.")
 
 # Add actions to JobPosting admin
-JobPostingAdmin.actions = [trigger_scraping, update_skill_analytics]
\ No newline at end of file
+JobPostingAdmin.actions = [trigger_scraping, update_skill_analytics]
+
+@admin.register(ArchivedPage)
+class ArchivedPageAdmin(admin.ModelAdmin):
+    list_display = ['url', 'platform', 'page_type', 'compressed_size', 'fetched_at']
+    list_filter = ['platform', 'page_type', 'fetched_at']
+    search_fields = ['url', 'content_hash']
+    ordering = ['-fetched_at']
+
+class ScrapeTaskStatInline(admin.TabularInline):
+    model = ScrapeTaskStat
+    extra = 0
+    can_delete = False
+    fields = [
+        'platform', 'search_term', 'location', 'status', 'pages_fetched', 'cards_parsed',
+        'parse_failures', 'jobs_new', 'jobs_updated', 'total_seconds', 'page_load_seconds',
+        'sleep_seconds', 'parse_seconds', 'db_seconds',
+    ]
+    readonly_fields = fields
+
+@admin.register(ScrapeRun)
+class ScrapeRunAdmin(admin.ModelAdmin):
+    list_display = [
+        'id', 'started_at', 'trigger', 'tasks_queued', 'tasks_finished',
+        'pages_fetched', 'jobs_new', 'worker_seconds',
+    ]
+    list_filter = ['trigger', 'started_at']
+    ordering = ['-started_at']
+    inlines = [ScrapeTaskStatInline]
+
+    def get_queryset(self, request):
+        return super().get_queryset(request).annotate(
+            tasks_finished=Count('task_stats'),
+            pages_fetched=Sum('task_stats__pages_fetched'),
+            jobs_new=Sum('task_stats__jobs_new'),
+            worker_seconds=Sum('task_stats__total_seconds'),
+        )
+
+    @admin.display(ordering='tasks_finished')
+    def tasks_finished(self, obj):
+        return obj.tasks_finished
+
+    @admin.display(ordering='pages_fetched')
+    def pages_fetched(self, obj):
+        return obj.pages_fetched
+
+    @admin.display(ordering='jobs_new')
+    def jobs_new(self, obj):
+        return obj.jobs_new
+
+    @admin.display(ordering='worker_seconds')
+    def worker_seconds(self, obj):
+        return round(obj.worker_seconds or 0, 1)
+
+@admin.register(ScrapeTaskStat)
+class ScrapeTaskStatAdmin(admin.ModelAdmin):
+    list_display = [
+        'platform', 'search_term', 'location', 'status', 'pages_fetched', 'cards_parsed',
+        'parse_failures', 'jobs_new', 'jobs_updated', 'jobs_duplicates', 'total_seconds',
+        'page_load_seconds', 'sleep_seconds', 'parse_seconds', 'db_seconds', 'started_at',
+    ]
+    list_filter = ['platform', 'status', 'started_at']
+    search_fields = ['search_term', 'location', 'error']
+    ordering = ['-started_at']
+
+@admin.register(AnalyticsRefresh)
+class AnalyticsRefreshAdmin(admin.ModelAdmin):
+    list_display = ['finished_at', 'kind', 'run', 'postings_changed', 'skills_updated', 'lag_seconds']
+    list_filter = ['kind', 'finished_at']
+    ordering = ['-finished_at']
+
+@admin.register(CareerSite)
+class CareerSiteAdmin(admin.ModelAdmin):
+    list_display = [
+        'company', 'career_url', 'is_active', 'listing_selector', 'title_selector',
+        'last_success_at', 'consecutive_failures', 'next_attempt_at',
+    ]
+    list_filter = ['is_active', 'last_success_at']
+    search_fields = ['company', 'career_url']
+    ordering = ['company']
+
+@admin.register(SavedSearch)
+class SavedSearchAdmin(admin.ModelAdmin):
+    list_display = ['email', 'name', 'skills', 'county', 'min_salary', 'remote_type', 'is_active', 'created_at']
+    list_filter = ['is_active', 'remote_type', 'county']
+    search_fields = ['email', 'name']
+    readonly_fields = ['token']
+    ordering = ['-created_at']
+
+@admin.register(JobAlert)
+class JobAlertAdmin(admin.ModelAdmin):
+    list_display = ['saved_search', 'job', 'created_at', 'sent_at']
+    list_filter = ['sent_at', 'created_at']
+    search_fields = ['saved_search__email', 'job__title']
+    raw_id_fields = ['saved_search', 'job']
+    ordering = ['-created_at']
@@ -0,0 +1,92 @@
+import time
+import logging
+from django.utils import timezone
+from .models import JobPosting
+from .extraction import EXTRACTION_VERSION, extract_fields
+from ..analytics.similarity import build_job_vector
+
+logger = logging.getLogger(__name__)
+
+# bulk_update skips auto_now, so last_updated is set by hand for the similarity index sync
+DERIVED_FIELDS = [
+    'skills_required', 'experience_level', 'remote_type', 'feature_vector', 'extraction_version', 'last_updated',
+]
+
+
+def stale_postings():
+    """Postings whose rule-based fields came from an older extraction version"""
+    return JobPosting.objects.exclude(extraction_version=EXTRACTION_VERSION)
+
+
+def pk_ranges(chunk_size):
+    """Yield (lower, upper] primary key bounds covering the stale postings.
+
+    Bounds are found by walking the primary key index, so each step reads
+    chunk_size keys rather than the whole table. lower is None for the
+    first range and upper is None for the last.
+    """
+    ids = stale_postings().order_by('id').values_list('id', flat=True)
+    lower = None
+    while True:
+        page = ids if lower is None else ids.filter(id__gt=lower)
+        upper = page[chunk_size - 1:chunk_size].first()
+        yield lower, upper
+        if upper is None:
+            return
+        lower = upper
+
+
+def reextract_range(bounds):
+    """Re-run extraction over one primary key range and write it back.
+
+    Each row's extraction_version is written in the same statements as its
+    fields, so an interrupted backfill resumes with exactly the rows it had
+    not finished. Returns (rows checked, rows changed).
+    """
+    lower, upper = bounds
+    rows = stale_postings().order_by()
+    if lower is not None:
+        rows = rows.filter(id__gt=lower)
+    if upper is not None:
+        rows = rows.filter(id__lte=upper)
+
+    now = timezone.now()
+    changed, unchanged = [], []
+    for posting in rows.only('id', 'title', 'description', 'skills_required', 'experience_level', 'remote_type'):
+        fields = extract_fields(posting.title, posting.description)
+        fields['skills_required'] = [skill[:50] for skill in fields['skills_required']]
+        if all(getattr(posting, name) == value for name, value in fields.items()):
+            unchanged.append(posting.id)
+            continue
+        for name, value in fields.items():
+            setattr(posting, name, value)
+        posting.feature_vector = build_job_vector(posting.title, posting.skills_required, posting.description)
+        posting.extraction_version = EXTRACTION_VERSION
+        posting.last_updated = now
+        changed.append(posting)
+
+    if changed:
+        JobPosting.objects.bulk_update(changed, DERIVED_FIELDS, batch_size=500)
+    if unchanged:
+        JobPosting.objects.filter(id__in=unchanged).update(extraction_version=EXTRACTION_VERSION)
+    return len(changed) + len(unchanged), len(changed)
+
+
+class Throughput:
+    """Running totals for a backfill, with rows-per-second reporting"""
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.rows = 0
+        self.changed = 0
+
+    def add(self, rows, changed):
+        self.rows += rows
+        self.changed += changed
+
+    @property
+    def rate(self):
+        return self.rows / max(time.perf_counter() - self.started, 1e-9)
+
+    def summary(self):
+        return f"{self.rows} rows checked, {self.changed} changed, {self.rate:.0f} rows/s"
@@ -0,0 +1,254 @@
+import json
+import time
+import secrets
+import itertools
+import threading
+import logging
+from collections import Counter, deque
+import redis
+from django.conf import settings
+from django.utils import timezone
+
+logger = logging.getLogger(__name__)
+
+# Tells EventSource clients how long to wait before reconnecting (ms)
+RETRY_MS = 3000
+
+# Numbers, stores and publishes an event in one step. Redis runs scripts one
+# at a time, so events are published in id order; with separate INCR and
+# PUBLISH calls a later id could arrive first and the earlier one be dropped.
+# The epoch is set alongside the counter, so a Redis restart that loses the
+# counter also starts a new epoch and subscribers know the ids began again.
+PUBLISH_SCRIPT = """
+local epoch = redis.call('GET', KEYS[4])
+if not epoch then
+    epoch = ARGV[4]
+    redis.call('SET', KEYS[4], epoch)
+end
+local id = redis.call('INCR', KEYS[1])
+local message = '{"id": ' .. id .. ', "epoch": "' .. epoch .. '", "type": ' .. ARGV[1] .. ', "data": ' .. ARGV[2] .. '}'
+redis.call('LPUSH', KEYS[2], message)
+redis.call('LTRIM', KEYS[2], 0, tonumber(ARGV[3]) - 1)
+redis.call('PUBLISH', KEYS[3], message)
+return id
+"""
+
+
+def encode_event(event_id, event_type, data):
+    """An SSE frame; data is already-serialized JSON"""
+    return f"id: {event_id}\nevent: {event_type}\ndata: {data}\n\n"
+
+
+def posting_changes(new_postings, deactivated_ids, platform='', reactivated_ids=()):
+    """Change event for one ingest batch: the ids plus the deltas dashboards apply"""
+    return {
+        'at': timezone.now().isoformat(),
+        'platform': platform,
+        'inserted': [str(posting.id) for posting in new_postings],
+        'reactivated': [str(job_id) for job_id in reactivated_ids],
+        'deactivated': [str(job_id) for job_id in deactivated_ids],
+        'deltas': {
+            'active_jobs': len(new_postings) + len(reactivated_ids) - len(deactivated_ids),
+            'new_jobs': len(new_postings),
+            'reactivated_jobs': len(reactivated_ids),
+            'deactivated_jobs': len(deactivated_ids),
+            'counties': Counter(posting.county for posting in new_postings if posting.county),
+            'remote_types': Counter(posting.remote_type for posting in new_postings),
+            'skills': Counter(skill for posting in new_postings for skill in posting.skills_required),
+        },
+    }
+
+
+class ChangeBuffer:
+    """This process's recent change events, shared by every open stream.
+
+    Events are encoded once when they arrive. Streams wait on one condition
+    and copy the frames after their last event id, so a publish costs the
+    same whether one dashboard is connected or thousands.
+    """
+
+    def __init__(self, size):
+        self.events = deque(maxlen=size)
+        self.condition = threading.Condition()
+        self.epoch = None
+        self.resets = 0
+
+    def append(self, event_id, frame, epoch=None):
+        with self.condition:
+            if epoch != self.epoch:
+                # The publisher's ids started over; what is buffered is from the old run
+                if self.events:
+                    self.events.clear()
+                    self.resets += 1
+                self.epoch = epoch
+            # Seeding from Redis can overlap with live messages
+            if self.events and event_id <= self.events[-1][0]:
+                return
+            self.events.append((event_id, frame))
+            self.condition.notify_all()
+
+    def bounds(self):
+        """(oldest, latest) buffered event ids, (0, 0) when empty"""
+        with self.condition:
+            if not self.events:
+                return 0, 0
+            return self.events[0][0], self.events[-1][0]
+
+    def after(self, last_id, timeout):
+        """Frames newer than last_id, waiting up to timeout seconds for one"""
+        with self.condition:
+            if not self.events or self.events[-1][0] <= last_id:
+                self.condition.wait(timeout)
+            newer = []
+            for event_id, frame in reversed(self.events):
+                if event_id <= last_id:
+                    break
+                newer.append((event_id, frame))
+            newer.reverse()
+            return newer
+
+
+class RedisChangeFeed:
+    """Change feed over Redis pub/sub.
+
+    Each process holds one subscription, started by the first stream, that
+    fills its ChangeBuffer. The last buffer_size events are also kept in a
+    Redis list so a new process can replay them to reconnecting clients.
+    """
+
+    def __init__(self, client, channel, buffer_size):
+        self.client = client
+        self.channel = channel
+        self.buffer_size = buffer_size
+        self.buffer = ChangeBuffer(buffer_size)
+        self._publish = client.register_script(PUBLISH_SCRIPT)
+        self._listener = None
+        self._lock = threading.Lock()
+
+    def publish(self, event_type, event):
+        try:
+            self._publish(
+                keys=[f"{self.channel}:seq", f"{self.channel}:recent", self.channel, f"{self.channel}:epoch"],
+                args=[json.dumps(event_type), json.dumps(event), self.buffer_size, secrets.token_hex(8)],
+            )
+        except redis.RedisError as e:
+            logger.warning(f"Could not publish {event_type} change: {e}")
+
+    def _add(self, message):
+        payload = json.loads(message)
+        self.buffer.append(
+            payload['id'], encode_event(payload['id'], payload['type'], json.dumps(payload['data'])),
+            payload.get('epoch'),
+        )
+
+    def _seed(self):
+        for message in reversed(self.client.lrange(f"{self.channel}:recent", 0, -1)):
+            self._add(message)
+
+    def _listen(self):
+        while True:
+            try:
+                pubsub = self.client.pubsub(ignore_subscribe_messages=True)
+                pubsub.subscribe(self.channel)
+                # Subscribed first, so nothing published during the replay is missed
+                self._seed()
+                for message in pubsub.listen():
+                    self._add(message['data'])
+            except redis.RedisError as e:
+                logger.warning(f"Change feed subscription lost, reconnecting: {e}")
+                time.sleep(1)
+
+    def listen(self):
+        """Start this process's subscriber once and return the shared buffer"""
+        with self._lock:
+            if self._listener is None:
+                try:
+                    self._seed()
+                except redis.RedisError as e:
+                    logger.warning(f"Could not replay recent changes: {e}")
+                self._listener = threading.Thread(target=self._listen, name='change-feed', daemon=True)
+                self._listener.start()
+        return self.buffer
+
+
+class LocalChangeFeed:
+    """Stand-in when no Redis is configured; events reach only this process's streams"""
+
+    def __init__(self, buffer_size):
+        self.buffer = ChangeBuffer(buffer_size)
+        self._ids = itertools.count(1)
+        self._lock = threading.Lock()
+
+    def publish(self, event_type, event):
+        with self._lock:
+            event_id = next(self._ids)
+            self.buffer.append(event_id, encode_event(event_id, event_type, json.dumps(event)))
+
+    def listen(self):
+        return self.buffer
+
+
+_feed = None
+_feed_lock = threading.Lock()
+
+
+def get_change_feed():
+    """Return the process-wide change feed"""
+    global _feed
+    with _feed_lock:
+        if _feed is None:
+            if settings.CHANGE_FEED_REDIS_URL:
+                _feed = RedisChangeFeed(
+                    redis.Redis.from_url(settings.CHANGE_FEED_REDIS_URL),
+                    settings.CHANGE_FEED_CHANNEL,
+                    settings.CHANGE_FEED_BUFFER_SIZE,
+                )
+            else:
+                _feed = LocalChangeFeed(settings.CHANGE_FEED_BUFFER_SIZE)
+    return _feed
+
+
+def publish_posting_changes(new_postings, deactivated_ids, platform='', reactivated_ids=()):
+    """Announce an ingest batch's new, reactivated and deactivated postings; call after commit"""
+    if new_postings or deactivated_ids or reactivated_ids:
+        get_change_feed().publish(
+            'postings', posting_changes(new_postings, deactivated_ids, platform, reactivated_ids)
+        )
+
+
+def stream_changes(last_id=0):
+    """Yield SSE frames for events after last_id until the stream's time is up.
+
+    A client whose last_id is no longer buffered (or from before a feed
+    reset) gets a 'reset' event and should refetch what it shows. Comment
+    lines keep idle connections open through proxies.
+    """
+    buffer = get_change_feed().listen()
+    yield f"retry: {RETRY_MS}\n\n"
+
+    resets = buffer.resets
+    oldest, latest = buffer.bounds()
+    if last_id and (last_id > latest or last_id < oldest - 1):
+        yield encode_event(latest, 'reset', '{}')
+        last_id = latest
+    elif not last_id:
+        last_id = latest
+
+    # Streams end now and then so WSGI threads are recycled; EventSource
+    # reconnects with Last-Event-ID and misses nothing still buffered
+    deadline = time.monotonic() + settings.CHANGE_FEED_STREAM_SECONDS
+    while time.monotonic() < deadline:
+        events = buffer.after(last_id, settings.CHANGE_FEED_HEARTBEAT_SECONDS)
+        if buffer.resets != resets:
+            # Ids started over while streaming; the client refetches from here
+            resets = buffer.resets
+            latest = buffer.bounds()[1]
+            yield encode_event(latest, 'reset', '{}')
+            last_id = latest
+            continue
+        if not events:
+            yield ': keep-alive\n\n'
+            continue
+        for event_id, frame in events:
+            yield frame
+        last_id = events[-1][0]
@@ -0,0 +1,61 @@
+import re
+from .skills import TAXONOMY_VERSION, extract_skills
+
+# Bump when the experience or remote rules below change
+RULES_VERSION = 1
+# Stored on each posting so rows produced by older rules can be re-extracted
+EXTRACTION_VERSION = TAXONOMY_VERSION * 100 + RULES_VERSION
+
+# Checked in order, so "head of engineering" is senior, not mid
+EXPERIENCE_RULES = [
+    ('executive', ['chief', 'ceo', 'cto', 'cfo', 'coo', 'vp', 'vice president', 'managing director']),
+    ('senior', ['senior', 'snr', 'sr', 'lead', 'principal', 'head', 'director', 'manager']),
+    ('entry', ['junior', 'jnr', 'jr', 'entry level', 'entry-level', 'graduate', 'trainee', 'intern',
+               'internship', 'attachment']),
+]
+
+REMOTE_RULES = [
+    ('remote', ['remote', 'fully remote', 'work from home', 'wfh', 'work from anywhere']),
+    ('hybrid', ['hybrid', 'flexible working']),
+]
+
+
+def _compile(rules):
+    return [
+        (value, re.compile(r'\b(?:' + '|'.join(re.escape(term) for term in terms) + r')\b'))
+        for value, terms in rules
+    ]
+
+
+_EXPERIENCE_PATTERNS = _compile(EXPERIENCE_RULES)
+_REMOTE_PATTERNS = _compile(REMOTE_RULES)
+
+
+def _first_match(patterns, text):
+    for value, pattern in patterns:
+        if pattern.search(text):
+            return value
+    return None
+
+
+def guess_experience_level(title, description=''):
+    """Classify seniority, trusting the title over mentions in the description"""
+    return (
+        _first_match(_EXPERIENCE_PATTERNS, (title or '').lower())
+        or _first_match(_EXPERIENCE_PATTERNS, (description or '').lower())
+        or 'mid'
+    )
+
+
+def guess_remote_type(title, description=''):
+    """Classify on-site/remote/hybrid work from title and description"""
+    return _first_match(_REMOTE_PATTERNS, f"{title or ''} {description or ''}".lower()) or 'on_site'
+
+
+def extract_fields(title, description):
+    """Derive the rule-based posting fields from its title and description"""
+    return {
+        'skills_required': extract_skills(f"{title or ''} {description or ''}"),
+        'experience_level': guess_experience_level(title, description),
+        'remote_type': guess_remote_type(title, description),
+    }
@@ -0,0 +1,290 @@
+import re
+import threading
+import time
+from collections import namedtuple
+from django.db.models import Q
+
+# Kenya's 47 counties keyed by official county code. Each county lists its
+# aliases and its main towns; each town is (name, aliases).
+COUNTIES = {
+    1: ('Mombasa', ['msa'], [
+        ('Mombasa', []), ('Nyali', []), ('Likoni', []), ('Changamwe', []),
+        ('Bamburi', []), ('Kisauni', []),
+    ]),
+    2: ('Kwale', [], [
+        ('Kwale', []), ('Ukunda', []), ('Diani', ['diani beach']), ('Msambweni', []),
+        ('Lunga Lunga', []),
+    ]),
+    3: ('Kilifi', [], [
+        ('Kilifi', []), ('Malindi', []), ('Watamu', []), ('Mtwapa', []), ('Mariakani', []),
+    ]),
+    4: ('Tana River', ['tana'], [
+        ('Hola', []), ('Garsen', []), ('Bura', []),
+    ]),
+    5: ('Lamu', [], [
+        ('Lamu', []), ('Mpeketoni', []),
+    ]),
+    6: ('Taita-Taveta', ['taita', 'taita taveta'], [
+        ('Voi', []), ('Wundanyi', []), ('Taveta', []), ('Mwatate', []),
+    ]),
+    7: ('Garissa', [], [
+        ('Garissa', []), ('Dadaab', []),
+    ]),
+    8: ('Wajir', [], [
+        ('Wajir', []), ('Habaswein', []),
+    ]),
+    9: ('Mandera', [], [
+        ('Mandera', []), ('El Wak', ['elwak']),
+    ]),
+    10: ('Marsabit', [], [
+        ('Marsabit', []), ('Moyale', []), ('Laisamis', []),
+    ]),
+    11: ('Isiolo', [], [
+        ('Isiolo', []), ('Merti', []),
+    ]),
+    12: ('Meru', [], [
+        ('Meru', []), ('Maua', []), ('Nkubu', []), ('Timau', []),
+    ]),
+    13: ('Tharaka-Nithi', ['tharaka', 'tharaka nithi'], [
+        ('Chuka', []), ('Kathwana', []), ('Marimanti', []),
+    ]),
+    14: ('Embu', [], [
+        ('Embu', []), ('Runyenjes', []), ('Siakago', []),
+    ]),
+    15: ('Kitui', [], [
+        ('Kitui', []), ('Mwingi', []), ('Mutomo', []),
+    ]),
+    16: ('Machakos', [], [
+        ('Machakos', []), ('Athi River', ['mavoko']), ('Mlolongo', []), ('Kangundo', []),
+        ('Syokimau', []), ('Matuu', []),
+    ]),
+    17: ('Makueni', [], [
+        ('Wote', []), ('Makindu', []), ('Emali', []), ('Mtito Andei', []),
+        ('Sultan Hamud', []),
+    ]),
+    18: ('Nyandarua', [], [
+        ('Ol Kalou', ['olkalou']), ('Njabini', []),
+    ]),
+    19: ('Nyeri', [], [
+        ('Nyeri', []), ('Karatina', []), ('Othaya', []), ('Mukurweini', []),
+    ]),
+    20: ('Kirinyaga', [], [
+        ('Kerugoya', []), ('Kutus', []), ('Sagana', []), ("Wang'uru", ['mwea']),
+    ]),
+    21: ("Murang'a", [], [
+        ("Murang'a", []), ('Kenol', []), ('Kangema', []), ('Maragua', []),
+    ]),
+    22: ('Kiambu', [], [
+        ('Kiambu', []), ('Thika', []), ('Ruiru', []), ('Juja', []), ('Limuru', []),
+        ('Kikuyu', []), ('Githunguri', []), ('Karuri', []),
+    ]),
+    23: ('Turkana', [], [
+        ('Lodwar', []), ('Kakuma', []), ('Lokichogio', ['lokichoggio']),
+    ]),
+    24: ('West Pokot', ['pokot'], [
+        ('Kapenguria', []), ('Makutano', []),
+    ]),
+    25: ('Samburu', [], [
+        ('Maralal', []), ('Baragoi', []),
+    ]),
+    26: ('Trans Nzoia', ['transnzoia'], [
+        ('Kitale', []), ('Endebess', []),
+    ]),
+    27: ('Uasin Gishu', [], [
+        ('Eldoret', []), ('Burnt Forest', []),
+    ]),
+    28: ('Elgeyo-Marakwet', ['elgeyo marakwet', 'keiyo'], [
+        ('Iten', []), ('Kapsowar', []),
+    ]),
+    29: ('Nandi', [], [
+        ('Kapsabet', []), ('Nandi Hills', []),
+    ]),
+    30: ('Baringo', [], [
+        ('Kabarnet', []), ('Eldama Ravine', []), ('Marigat', []),
+    ]),
+    31: ('Laikipia', [], [
+        ('Nanyuki', []), ('Nyahururu', []), ('Rumuruti', []),
+    ]),
+    32: ('Nakuru', [], [
+        ('Nakuru', []), ('Naivasha', []), ('Gilgil', []), ('Molo', []), ('Njoro', []),
+    ]),
+    33: ('Narok', [], [
+        ('Narok', []), ('Kilgoris', []),
+    ]),
+    34: ('Kajiado', [], [
+        ('Kajiado', []), ('Kitengela', []), ('Ngong', []), ('Ongata Rongai', ['rongai']),
+        ('Namanga', []), ('Loitokitok', []), ('Isinya', []),
+    ]),
+    35: ('Kericho', [], [
+        ('Kericho', []), ('Litein', []), ('Londiani', []),
+    ]),
+    36: ('Bomet', [], [
+        ('Bomet', []), ('Sotik', []),
+    ]),
+    37: ('Kakamega', [], [
+        ('Kakamega', []), ('Mumias', []), ('Malava', []),
+    ]),
+    38: ('Vihiga', [], [
+        ('Vihiga', []), ('Mbale', []), ('Luanda', []),
+    ]),
+    39: ('Bungoma', [], [
+        ('Bungoma', []), ('Webuye', []), ('Kimilili', []),
+    ]),
+    40: ('Busia', [], [
+        ('Busia', []), ('Malaba', []), ('Port Victoria', []),
+    ]),
+    41: ('Siaya', [], [
+        ('Siaya', []), ('Bondo', []), ('Ugunja', []),
+    ]),
+    42: ('Kisumu', [], [
+        ('Kisumu', []), ('Ahero', []), ('Maseno', []), ('Muhoroni', []),
+    ]),
+    43: ('Homa Bay', ['homabay'], [
+        ('Homa Bay', ['homabay']), ('Mbita', []), ('Oyugis', []), ('Kendu Bay', []),
+    ]),
+    44: ('Migori', [], [
+        ('Migori', []), ('Awendo', []), ('Rongo', []), ('Kehancha', []),
+    ]),
+    45: ('Kisii', [], [
+        ('Kisii', []), ('Ogembo', []), ('Keroka', []),
+    ]),
+    46: ('Nyamira', [], [
+        ('Nyamira', []), ('Nyansiongo', []),
+    ]),
+    47: ('Nairobi', ['nairobi city', 'nbi'], [
+        ('Nairobi', ['nairobi cbd']), ('Westlands', []), ('Karen', []), ('Kilimani', []),
+        ('Upper Hill', ['upperhill']), ('Industrial Area', []), ('Gigiri', []),
+        ('Parklands', []), ('Embakasi', []), ('Kasarani', []), ('Lavington', []),
+        ('Runda', []), ('Eastleigh', []), ('Langata', ["lang'ata"]), ('Kileleshwa', []),
+    ]),
+}
+
+LocationMatch = namedtuple('LocationMatch', ['county', 'town'])
+
+# A place name followed by one of these is a road ("Mombasa Road"), not a place
+ROAD_WORDS = {'road', 'rd', 'street', 'st', 'avenue', 'ave', 'highway', 'hwy', 'drive', 'lane', 'way', 'bypass'}
+
+# County and town ids are reloaded after this many seconds, or sooner after a
+# miss, so workers started before load_gazetteer pick the rows up
+IDS_TTL = 600
+IDS_MISS_RETRY = 30
+
+
+def normalize(text):
+    """Lowercase a place name and reduce it to space-separated words"""
+    text = (text or '').lower().replace("'", '').replace('’', '')
+    return ' '.join(re.findall(r'[a-z0-9]+', text))
+
+
+class Gazetteer:
+    """Dictionary matcher over county and town names and their aliases"""
+
+    def __init__(self, counties=COUNTIES):
+        self.counties = {}
+        self.towns = {}
+        self.town_county = {}
+        for code, (county_name, county_aliases, towns) in counties.items():
+            for alias in [county_name, f"{county_name} county"] + county_aliases:
+                self.counties[normalize(alias)] = county_name
+            for town_name, town_aliases in towns:
+                self.town_county[town_name] = county_name
+                for alias in [town_name] + town_aliases:
+                    self.towns[normalize(alias)] = town_name
+
+        self.max_words = max(len(key.split()) for key in list(self.counties) + list(self.towns))
+        self._county_ids = None
+        self._town_ids = None
+        self._ids_loaded_at = 0
+        self._lock = threading.Lock()
+
+    def _scan(self, text):
+        """Yield (kind, name) for place names in text, longest match first"""
+        words = normalize(text).split()
+        i = 0
+        while i < len(words):
+            for size in range(min(self.max_words, len(words) - i), 0, -1):
+                phrase = ' '.join(words[i:i + size])
+                if phrase in self.counties or phrase in self.towns:
+                    if i + size < len(words) and words[i + size] in ROAD_WORDS:
+                        i += size + 1
+                        break
+                    if phrase in self.towns:
+                        yield 'town', self.towns[phrase]
+                    if phrase in self.counties:
+                        yield 'county', self.counties[phrase]
+                    i += size
+                    break
+            else:
+                i += 1
+
+    def match(self, text):
+        """Resolve free-text location to the most specific county/town match.
+
+        A county named in the text wins; towns in other counties are dropped,
+        so "Thika, Nairobi" stays in Nairobi. Without a county the first
+        town's county is used.
+        """
+        counties = []
+        towns = []
+        for kind, name in self._scan(text):
+            (towns if kind == 'town' else counties).append(name)
+        county = counties[0] if counties else None
+        town = next((name for name in towns if county in (None, self.town_county[name])), None)
+        if town and not county:
+            county = self.town_county[town]
+        return LocationMatch(county, town)
+
+    def _ids(self, missed=False):
+        """Return (county ids, town ids) by name, reloading stale or missing ones"""
+        from .models import County, Town
+        with self._lock:
+            age = time.monotonic() - self._ids_loaded_at
+            if self._county_ids is None or age > IDS_TTL or (missed and age > IDS_MISS_RETRY):
+                self._county_ids = dict(County.objects.values_list('name', 'id'))
+                self._town_ids = dict(Town.objects.values_list('name', 'id'))
+                self._ids_loaded_at = time.monotonic()
+            return self._county_ids, self._town_ids
+
+    def resolve_ids(self, text):
+        """Return (county_name, county_id, town_id) for a location string"""
+        match = self.match(text)
+        if match.county is None:
+            return '', None, None
+        county_ids, town_ids = self._ids()
+        if match.county not in county_ids or (match.town and match.town not in town_ids):
+            county_ids, town_ids = self._ids(missed=True)
+        return (
+            match.county,
+            county_ids.get(match.county),
+            town_ids.get(match.town) if match.town else None,
+        )
+
+    def location_q(self, query, prefix=''):
+        """Build a filter for a location search, using indexed ids when possible"""
+        key = normalize(query)
+        county = self.counties.get(key)
+        town = self.towns.get(key)
+        county_ids, town_ids = self._ids()
+        if (county and county not in county_ids) or (town and town not in town_ids):
+            county_ids, town_ids = self._ids(missed=True)
+        if county in county_ids:
+            return Q(**{f'{prefix}county_ref_id': county_ids[county]})
+        if town in town_ids:
+            return Q(**{f'{prefix}town_id': town_ids[town]})
+        return Q(**{f'{prefix}location__icontains': query}) | Q(**{f'{prefix}county__icontains': query})
+
+    def reset_ids(self):
+        with self._lock:
+            self._county_ids = None
+            self._town_ids = None
+
+
+_gazetteer = None
+
+
+def get_gazetteer():
+    """Return the process-wide gazetteer"""
+    global _gazetteer
+    if _gazetteer is None:
+        _gazetteer = Gazetteer()
+    return _gazetteer
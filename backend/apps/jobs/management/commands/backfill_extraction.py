@@ -0,0 +1,44 @@
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from django.core.management.base import BaseCommand
+from django.db import connections
+from ...backfill import Throughput, pk_ranges, reextract_range, stale_postings
+from ...extraction import EXTRACTION_VERSION
+from ....analytics.services import AnalyticsService
+
+
+class Command(BaseCommand):
+    help = 'Re-extract skills, experience level and remote type for postings from older extraction rules'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--processes', type=int, default=multiprocessing.cpu_count())
+        parser.add_argument('--chunk-size', type=int, default=2000, help='Postings per primary key range')
+
+    def handle(self, *args, **options):
+        # Rows already at the current version were finished by an earlier run
+        total = stale_postings().count()
+        if not total:
+            self.stdout.write(self.style.SUCCESS(f"All postings are at extraction version {EXTRACTION_VERSION}"))
+            return
+
+        ranges = list(pk_ranges(options['chunk_size']))
+        self.stdout.write(
+            f"Re-extracting {total} postings to version {EXTRACTION_VERSION} "
+            f"in {len(ranges)} ranges on {options['processes']} processes"
+        )
+
+        progress = Throughput()
+        # Forked workers must open their own database connections
+        connections.close_all()
+        with ProcessPoolExecutor(
+            max_workers=max(1, options['processes']), mp_context=multiprocessing.get_context('fork')
+        ) as executor:
+            for done, (rows, changed) in enumerate(executor.map(reextract_range, ranges), start=1):
+                progress.add(rows, changed)
+                self.stdout.write(f"[{done}/{len(ranges)}] {progress.summary()}")
+
+        self.stdout.write(self.style.SUCCESS(f"Backfill complete: {progress.summary()}"))
+        if progress.changed:
+            # Re-extracted skills move the demand figures
+            refresh = AnalyticsService().update_skill_demand()
+            self.stdout.write(f"Skill demand updated for {refresh.skills_updated} skills")
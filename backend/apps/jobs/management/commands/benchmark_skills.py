@@ -0,0 +1,88 @@
+import time
+from pathlib import Path
+from django.core.management.base import BaseCommand
+from lxml import html
+from ...models import JobPosting
+from ...skills import SKILLS, TAXONOMY_VERSION, SkillExtractor
+
+BENCH_PAGES_DIR = Path(__file__).resolve().parents[3] / 'scrapers' / 'bench_pages'
+
+# The per-scraper list and substring loop that SkillExtractor replaced
+LEGACY_SKILLS = [
+    'python', 'java', 'javascript', 'react', 'angular', 'vue', 'nodejs', 'django',
+    'flask', 'spring', 'mysql', 'postgresql', 'mongodb', 'aws', 'azure', 'gcp',
+    'docker', 'kubernetes', 'git', 'jenkins', 'terraform', 'ansible',
+    'machine learning', 'data science', 'artificial intelligence', 'blockchain',
+    'devops', 'agile', 'scrum', 'project management', 'digital marketing',
+    'seo', 'content marketing', 'social media', 'graphic design', 'ui/ux',
+    'excel', 'powerpoint', 'word', 'accounting', 'finance', 'sales', 'marketing',
+    'customer service', 'human resources', 'operations', 'strategy',
+]
+
+
+def substring_extractor(terms):
+    terms = list(dict.fromkeys(term.lower() for term in terms))
+
+    def extract(text):
+        text_lower = text.lower()
+        return [term for term in terms if term in text_lower]
+    return extract
+
+
+class Command(BaseCommand):
+    help = 'Measure skill extraction throughput on stored or fixture job descriptions'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--source', choices=['db', 'fixtures'], default='db',
+            help='Stored posting descriptions, or the scraper fixture pages',
+        )
+        parser.add_argument('--limit', type=int, default=5000, help='Descriptions to load from the database')
+        parser.add_argument('--repeat', type=int, default=5, help='Passes over the corpus per extractor')
+
+    def handle(self, *args, **options):
+        corpus = self._load_corpus(options)
+        if not corpus:
+            self.stderr.write('No descriptions to benchmark')
+            return
+
+        corpus_mb = sum(len(text) for text in corpus) / 1_000_000
+        self.stdout.write(
+            f"{len(corpus)} descriptions, {corpus_mb:.2f} MB, taxonomy v{TAXONOMY_VERSION} "
+            f"with {len(SKILLS)} skills"
+        )
+
+        all_terms = [term for canonical, synonyms in SKILLS.items() for term in [canonical] + synonyms]
+        extractors = [
+            ('legacy substring list', substring_extractor(LEGACY_SKILLS)),
+            ('taxonomy substring loop', substring_extractor(all_terms)),
+            ('aho-corasick', SkillExtractor().extract),
+        ]
+
+        self.stdout.write(f"{'extractor':<26}{'docs/s':>12}{'MB/s':>9}{'skills/doc':>12}")
+        for name, extract in extractors:
+            found = 0
+            start = time.perf_counter()
+            for _ in range(options['repeat']):
+                found = sum(len(extract(text)) for text in corpus)
+            elapsed = (time.perf_counter() - start) / options['repeat']
+            self.stdout.write(
+                f"{name:<26}{len(corpus) / elapsed:>12.0f}{corpus_mb / elapsed:>9.2f}"
+                f"{found / len(corpus):>12.2f}"
+            )
+
+    def _load_corpus(self, options):
+        if options['source'] == 'db':
+            return [
+                description for description in JobPosting.objects.exclude(description='')
+                .order_by('-scraped_at').values_list('description', flat=True)[:options['limit']]
+            ]
+
+        corpus = []
+        for page in sorted(BENCH_PAGES_DIR.glob('*.html')):
+            document = html.parse(str(page)).getroot()
+            corpus.extend(
+                text for text in (element.text_content().strip() for element in document.xpath('//p|//li'))
+                if len(text) > 40
+            )
+        return corpus
@@ -0,0 +1,41 @@
+import time
+from django.core.management.base import BaseCommand, CommandError
+from ....analytics.services import AnalyticsService
+from ...synthetic import SyntheticDataGenerator, clear_synthetic_data
+
+
+class Command(BaseCommand):
+    help = 'Replace the synthetic dataset with generated companies, postings, salary reports and skill demand'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--jobs', type=int, default=100000)
+        parser.add_argument('--companies', type=int, help='Defaults to one company per 50 postings')
+        parser.add_argument('--salary-reports', type=int, help='Defaults to one report per 10 postings')
+        parser.add_argument('--seed', type=int, default=42, help='The same seed always gives the same dataset')
+        parser.add_argument('--batch-size', type=int, default=50000, help='Rows per COPY')
+        parser.add_argument('--clear', action='store_true', help='Only remove the synthetic dataset and recompute skill demand')
+
+    def handle(self, *args, **options):
+        # Generated ids and names depend only on the seed, so any earlier dataset must go first
+        clear_synthetic_data()
+        if options['clear']:
+            AnalyticsService().update_skill_demand()
+            self.stdout.write(self.style.SUCCESS('Removed the synthetic dataset'))
+            return
+
+        jobs = options['jobs']
+        if jobs < 1:
+            raise CommandError('--jobs must be at least 1')
+        companies = options['companies'] or max(jobs // 50, 1)
+        salary_reports = options['salary_reports'] if options['salary_reports'] is not None else jobs // 10
+
+        start = time.perf_counter()
+        counts = SyntheticDataGenerator(options['seed'], options['batch_size']).generate(
+            jobs, companies, salary_reports
+        )
+        elapsed = time.perf_counter() - start
+        self.stdout.write(self.style.SUCCESS(
+            f"Generated {counts['companies']} companies, {counts['jobs']} job postings, "
+            f"{counts['salary_insights']} salary reports and {counts['skill_demand']} skill demand rows "
+            f"in {elapsed:.1f}s ({counts['jobs'] / elapsed:.0f} postings/s)"
+        ))
@@ -0,0 +1,41 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from ...gazetteer import COUNTIES, get_gazetteer
+from ...models import County, JobPosting, Town
+
+
+class Command(BaseCommand):
+    help = "Load Kenya's counties and towns, optionally re-resolving stored posting locations"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--backfill', action='store_true',
+            help='Resolve county/town for existing job postings',
+        )
+
+    def handle(self, *args, **options):
+        with transaction.atomic():
+            for code, (county_name, _, towns) in COUNTIES.items():
+                county, _ = County.objects.update_or_create(code=code, defaults={'name': county_name})
+                for town_name, _ in towns:
+                    Town.objects.update_or_create(name=town_name, defaults={'county': county})
+
+        gazetteer = get_gazetteer()
+        gazetteer.reset_ids()
+        self.stdout.write(self.style.SUCCESS(
+            f"Loaded {County.objects.count()} counties and {Town.objects.count()} towns"
+        ))
+
+        if options['backfill']:
+            self._backfill(gazetteer)
+
+    def _backfill(self, gazetteer):
+        # One UPDATE per distinct location string rather than per posting
+        updated = 0
+        locations = JobPosting.objects.order_by().values_list('location', flat=True).distinct()
+        for location in locations.iterator():
+            county_name, county_id, town_id = gazetteer.resolve_ids(location)
+            updated += JobPosting.objects.filter(location=location).update(
+                county=county_name, county_ref_id=county_id, town_id=town_id
+            )
+        self.stdout.write(self.style.SUCCESS(f"Re-resolved locations for {updated} job postings"))
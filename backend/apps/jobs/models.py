@@ -1,6 +1,8 @@
 from django.db import models
 from django.contrib.postgres.fields import ArrayField
+from django.contrib.postgres.indexes import BrinIndex, GinIndex
 import uuid
+import secrets
 
 class Company(models.Model):
     name = models.CharField(max_length=200, unique=True)
@@ -18,6 +20,27 @@ class Company(models.Model):
     class Meta:
         verbose_name_plural = "Companies"
 
+class County(models.Model):
+    code = models.PositiveSmallIntegerField(unique=True)  # official county code, 1-47
+    name = models.CharField(max_length=50, unique=True)
+
+    def __str__(self):
+        return self.name
+
+    class Meta:
+        ordering = ['code']
+        verbose_name_plural = "Counties"
+
+class Town(models.Model):
+    name = models.CharField(max_length=100, unique=True)
+    county = models.ForeignKey(County, on_delete=models.CASCADE, related_name='towns')
+
+    def __str__(self):
+        return f"{self.name}, {self.county.name}"
+
+    class Meta:
+        ordering = ['name']
+
 class JobPosting(models.Model):
     EMPLOYMENT_TYPES = [
         ('full_time', 'Full Time'),
@@ -49,6 +72,12 @@ class JobPosting(models.Model):
     # Location and remote work
     location = models.CharField(max_length=100)
     county = models.CharField(max_length=50, blank=True)
+    county_ref = models.ForeignKey(
+        County, on_delete=models.SET_NULL, null=True, blank=True, related_name='job_postings'
+    )
+    town = models.ForeignKey(
+        Town, on_delete=models.SET_NULL, null=True, blank=True, related_name='job_postings'
+    )
     remote_type = models.CharField(max_length=20, choices=REMOTE_TYPES, default='on_site')
     
     # Employment details
@@ -64,6 +93,18 @@ class JobPosting(models.Model):
     # Skills and technologies
     skills_required = ArrayField(models.CharField(max_length=50), blank=True, default=list)
     technologies = ArrayField(models.CharField(max_length=50), blank=True, default=list)
+    # Version of the skill/experience/remote rules that produced the fields above
+    extraction_version = models.IntegerField(default=0, db_index=True)
+    
+    # Hashed title/skills/description features used by the similar-jobs index
+    feature_vector = ArrayField(models.FloatField(), blank=True, default=list)
+    
+    # Near-duplicate detection across platforms
+    minhash = ArrayField(models.IntegerField(), blank=True, default=list)
+    lsh_bands = ArrayField(models.BigIntegerField(), blank=True, default=list)
+    duplicate_of = models.ForeignKey(
+        'self', on_delete=models.SET_NULL, null=True, blank=True, related_name='duplicates'
+    )
     
     # Source information
     source_platform = models.CharField(max_length=50)  # linkedin, indeed, glassdoor, etc.
@@ -90,8 +131,78 @@ class JobPosting(models.Model):
             models.Index(fields=['experience_level', 'employment_type']),
             models.Index(fields=['posted_date', 'is_active']),
             models.Index(fields=['source_platform']),
+            GinIndex(fields=['lsh_bands'], name='jobposting_lsh_bands_gin'),
+            # scraped_at grows with insert order, so a BRIN index lets
+            # time-windowed analytics skip whole block ranges cheaply
+            BrinIndex(fields=['scraped_at'], name='jobposting_scraped_at_brin'),
+            # Retention scans only the inactive rows, oldest first
+            models.Index(
+                fields=['last_updated'], condition=models.Q(is_active=False),
+                name='jobposting_inactive_updated',
+            ),
+        ]
+        constraints = [
+            # Upsert key for batched ingest
+            models.UniqueConstraint(
+                fields=['source_platform', 'external_id'], name='unique_platform_external_id'
+            ),
+        ]
+
+class ScrapePartition(models.Model):
+    """One (platform, search term, location) slice of the scrape schedule"""
+    platform = models.CharField(max_length=50)
+    search_term = models.CharField(max_length=200, blank=True)
+    location = models.CharField(max_length=100, blank=True)
+    runs = models.IntegerField(default=0)  # completed runs that returned postings
+    full_runs = models.IntegerField(default=0)  # of those, the ones that paged through all results
+    last_run_at = models.DateTimeField(null=True, blank=True)
+    last_queued_at = models.DateTimeField(null=True, blank=True)  # set by the adaptive scheduler
+
+    def __str__(self):
+        return f"{self.platform}: {self.search_term or '*'} in {self.location or '*'}"
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=['platform', 'search_term', 'location'], name='unique_scrape_partition'
+            ),
+        ]
+
+class PartitionSighting(models.Model):
+    """When a posting was last listed in a partition, as the partition's full-run count at the time"""
+    partition = models.ForeignKey(ScrapePartition, on_delete=models.CASCADE, related_name='sightings')
+    job = models.ForeignKey(JobPosting, on_delete=models.CASCADE, related_name='sightings')
+    last_seen_run = models.IntegerField()  # ScrapePartition.full_runs, including the run if it was full
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['partition', 'job'], name='unique_partition_sighting'),
+        ]
+        indexes = [
+            models.Index(fields=['partition', 'last_seen_run']),
         ]
 
+class CareerSite(models.Model):
+    """A company careers page scraped by CareerPagesScraper, with the selectors that last worked on it"""
+    company = models.CharField(max_length=200, unique=True)
+    career_url = models.URLField(max_length=500)
+    is_active = models.BooleanField(default=True)
+    
+    # Learned selector profile, tried before the generic selector lists
+    listing_selector = models.CharField(max_length=200, blank=True)
+    title_selector = models.CharField(max_length=200, blank=True)
+    
+    last_success_at = models.DateTimeField(null=True, blank=True)
+    consecutive_failures = models.IntegerField(default=0)
+    next_attempt_at = models.DateTimeField(null=True, blank=True)  # failing sites back off
+    last_error = models.TextField(blank=True)
+
+    def __str__(self):
+        return self.company
+
+    class Meta:
+        ordering = ['company']
+
 class SalaryInsight(models.Model):
     job_title = models.CharField(max_length=200)
     company = models.ForeignKey(Company, on_delete=models.CASCADE, null=True, blank=True)
@@ -118,4 +229,165 @@ class SkillDemand(models.Model):
         return f"{self.skill_name} (Demand: {self.demand_count})"
 
     class Meta:
-        ordering = ['-demand_count']
\ No newline at end of file
+        ordering = ['-demand_count']
+
+class ArchivedPage(models.Model):
+    """A fetched scraper page; the body lives in the content-addressed archive"""
+    PAGE_TYPES = [
+        ('listing', 'Listing'),
+        ('detail', 'Detail'),
+    ]
+
+    url = models.URLField(max_length=2000)
+    platform = models.CharField(max_length=50)
+    page_type = models.CharField(max_length=20, choices=PAGE_TYPES, default='listing')
+    content_hash = models.CharField(max_length=64)  # sha256 of the page body
+    compressed_size = models.IntegerField(default=0)
+    context = models.JSONField(default=dict, blank=True)  # parser inputs not in the page
+    fetched_at = models.DateTimeField(db_index=True)
+
+    def __str__(self):
+        return f"{self.platform} {self.page_type}: {self.url}"
+
+    class Meta:
+        ordering = ['-fetched_at']
+        indexes = [
+            models.Index(fields=['url', 'fetched_at']),
+            models.Index(fields=['platform', 'page_type', 'fetched_at']),
+        ]
+
+class ScrapeRun(models.Model):
+    """One scrape_all_platforms fan-out; its tasks report ScrapeTaskStat rows"""
+    TRIGGERS = [
+        ('schedule', 'Schedule'),
+        ('manual', 'Manual'),
+    ]
+
+    started_at = models.DateTimeField(auto_now_add=True)
+    trigger = models.CharField(max_length=20, choices=TRIGGERS, default='schedule')
+    tasks_queued = models.IntegerField(default=0)
+
+    def __str__(self):
+        return f"Scrape run {self.id} ({self.trigger}) at {self.started_at:%Y-%m-%d %H:%M}"
+
+    class Meta:
+        ordering = ['-started_at']
+
+class ScrapeTaskStat(models.Model):
+    """Counters and time breakdown of one scrape task, written once when it ends"""
+    STATUSES = [
+        ('ok', 'OK'),
+        ('failed', 'Failed'),
+        ('skipped', 'Skipped'),  # its platform had no free slot
+    ]
+
+    run = models.ForeignKey(ScrapeRun, on_delete=models.CASCADE, null=True, blank=True, related_name='task_stats')
+    platform = models.CharField(max_length=50)
+    search_term = models.CharField(max_length=200, blank=True)
+    location = models.CharField(max_length=100, blank=True)
+    status = models.CharField(max_length=20, choices=STATUSES, default='ok')
+    error = models.TextField(blank=True)
+    started_at = models.DateTimeField()
+    finished_at = models.DateTimeField()
+
+    pages_fetched = models.IntegerField(default=0)
+    cards_parsed = models.IntegerField(default=0)
+    parse_failures = models.IntegerField(default=0)
+    jobs_new = models.IntegerField(default=0)
+    jobs_updated = models.IntegerField(default=0)
+    jobs_duplicates = models.IntegerField(default=0)
+    jobs_deactivated = models.IntegerField(default=0)
+    jobs_reactivated = models.IntegerField(default=0)
+    bytes_fetched = models.BigIntegerField(default=0)
+    # Skills of the postings the task inserted, reactivated or deactivated
+    skills_changed = ArrayField(models.CharField(max_length=50), blank=True, default=list)
+
+    # Seconds spent per phase; the remainder of the wall time is overhead
+    total_seconds = models.FloatField(default=0)
+    page_load_seconds = models.FloatField(default=0)
+    sleep_seconds = models.FloatField(default=0)
+    parse_seconds = models.FloatField(default=0)
+    db_seconds = models.FloatField(default=0)
+
+    def __str__(self):
+        return f"{self.platform} {self.search_term or '*'} in {self.location or '*'} ({self.status})"
+
+    class Meta:
+        ordering = ['-started_at']
+        indexes = [
+            models.Index(fields=['started_at', 'platform']),
+        ]
+
+class AnalyticsRefresh(models.Model):
+    """One skill demand refresh, with how long scraped data waited to reach it"""
+    KINDS = [
+        ('incremental', 'Incremental'),
+        ('full', 'Full'),
+    ]
+
+    run = models.ForeignKey(
+        ScrapeRun, on_delete=models.SET_NULL, null=True, blank=True, related_name='analytics_refreshes'
+    )
+    kind = models.CharField(max_length=20, choices=KINDS)
+    started_at = models.DateTimeField()
+    finished_at = models.DateTimeField()
+    postings_changed = models.IntegerField(default=0)
+    skills_updated = models.IntegerField(default=0)
+    # Seconds from the run's first finished scrape task to this refresh finishing
+    lag_seconds = models.FloatField(null=True, blank=True)
+
+    def __str__(self):
+        return f"{self.kind} refresh at {self.finished_at:%Y-%m-%d %H:%M}"
+
+    class Meta:
+        ordering = ['-finished_at']
+        indexes = [
+            models.Index(fields=['finished_at']),
+        ]
+
+def new_search_token():
+    return secrets.token_urlsafe(32)
+
+class SavedSearch(models.Model):
+    """A job alert: new postings matching every filter that is set notify its owner"""
+    email = models.EmailField()
+    # Returned once on creation; required to read, change or delete the search
+    token = models.CharField(max_length=64, unique=True, default=new_search_token, editable=False)
+    name = models.CharField(max_length=200, blank=True)
+    skills = ArrayField(models.CharField(max_length=50), blank=True, default=list)  # postings need all of them
+    county = models.CharField(max_length=50, blank=True)
+    min_salary = models.DecimalField(max_digits=10, decimal_places=2, null=True, blank=True)
+    remote_type = models.CharField(max_length=20, choices=JobPosting.REMOTE_TYPES, blank=True)
+    is_active = models.BooleanField(default=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)  # the percolator index syncs on this
+
+    def __str__(self):
+        return self.name or f"Search {self.pk} for {self.email}"
+
+    class Meta:
+        verbose_name_plural = "Saved searches"
+        indexes = [
+            models.Index(fields=['updated_at']),
+            models.Index(fields=['email']),
+        ]
+
+class JobAlert(models.Model):
+    """A new posting that matched a saved search, until it is sent"""
+    saved_search = models.ForeignKey(SavedSearch, on_delete=models.CASCADE, related_name='alerts')
+    job = models.ForeignKey(JobPosting, on_delete=models.CASCADE, related_name='alerts')
+    created_at = models.DateTimeField(auto_now_add=True)
+    sent_at = models.DateTimeField(null=True, blank=True)
+
+    def __str__(self):
+        return f"{self.job_id} for {self.saved_search_id}"
+
+    class Meta:
+        ordering = ['-created_at']
+        constraints = [
+            models.UniqueConstraint(fields=['saved_search', 'job'], name='unique_alert_search_job'),
+        ]
+        indexes = [
+            # Senders read only the pending alerts
+            models.Index(fields=['created_at'], condition=models.Q(sent_at__isnull=True), name='jobalert_pending'),
+        ]
@@ -0,0 +1,178 @@
+import time
+from datetime import timedelta
+import threading
+import logging
+from collections import defaultdict
+from decimal import Decimal, InvalidOperation
+from django.conf import settings
+from .models import JobAlert, SavedSearch, SkillDemand
+
+logger = logging.getLogger(__name__)
+
+# Bucket for searches that set no skill, county or remote type
+MATCH_ALL = ('any', '')
+# updated_at is stamped before commit, so a sync can see a later timestamp
+# before an earlier one commits; each sync re-reads this far back
+SYNC_OVERLAP = timedelta(minutes=5)
+
+
+def _salary(value):
+    if value in (None, ''):
+        return None
+    try:
+        return Decimal(str(value))
+    except InvalidOperation:
+        return None
+
+
+class SearchIndex:
+    """In-process reverse index of active saved searches.
+
+    Each search is filed under one value that every posting it matches must
+    have: its least common skill, else its county, else its remote type.
+    A posting then only looks up the buckets for its own skills, county and
+    remote type, and checks each candidate search's remaining filters. The
+    cost grows with the batch and the candidates, not with every stored search.
+    """
+
+    def __init__(self):
+        self.searches = {}
+        self.search_keys = {}
+        self.buckets = defaultdict(set)
+        self.lock = threading.RLock()
+        self.synced_at = None
+        self.last_refresh = 0.0
+
+    def __len__(self):
+        return len(self.searches)
+
+    def _key(self, skills, county, remote_type, skill_counts):
+        if skills:
+            # Postings with a rare skill are few, so its bucket is looked up least
+            return ('skill', min(skills, key=lambda skill: (skill_counts.get(skill, 0), skill)))
+        if county:
+            return ('county', county)
+        if remote_type:
+            return ('remote', remote_type)
+        return MATCH_ALL
+
+    def add(self, search_id, skills, county, remote_type, min_salary, skill_counts=None):
+        """Insert or replace a saved search"""
+        skills = frozenset(skills)
+        key = self._key(skills, county, remote_type, skill_counts or {})
+        with self.lock:
+            self.remove(search_id)
+            self.searches[search_id] = (skills, county, remote_type, _salary(min_salary))
+            self.search_keys[search_id] = key
+            self.buckets[key].add(search_id)
+
+    def remove(self, search_id):
+        """Drop a saved search if present"""
+        with self.lock:
+            key = self.search_keys.pop(search_id, None)
+            self.searches.pop(search_id, None)
+            if key is None:
+                return
+            bucket = self.buckets.get(key)
+            if bucket is not None:
+                bucket.discard(search_id)
+                if not bucket:
+                    del self.buckets[key]
+
+    def match(self, skills, county, remote_type, salary_min):
+        """Ids of the saved searches a posting with these fields satisfies"""
+        skills = set(skills or [])
+        salary_min = _salary(salary_min)
+        keys = [('skill', skill) for skill in skills] + [('county', county), ('remote', remote_type), MATCH_ALL]
+
+        matched = []
+        with self.lock:
+            for key in keys:
+                for search_id in self.buckets.get(key, ()):
+                    search_skills, search_county, search_remote, search_salary = self.searches[search_id]
+                    if search_county and search_county != county:
+                        continue
+                    if search_remote and search_remote != remote_type:
+                        continue
+                    if search_salary is not None and (salary_min is None or salary_min < search_salary):
+                        continue
+                    if not search_skills <= skills:
+                        continue
+                    matched.append(search_id)
+        return matched
+
+    def refresh(self, force=False):
+        """Pull saved searches changed since the last sync into the index"""
+        interval = getattr(settings, 'SAVED_SEARCH_INDEX_REFRESH', 60)
+        if not force and time.monotonic() - self.last_refresh < interval:
+            return 0
+
+        with self.lock:
+            queryset = SavedSearch.objects.all()
+            if self.synced_at is not None:
+                # add() replaces, so searches read twice are harmless
+                queryset = queryset.filter(updated_at__gt=self.synced_at - SYNC_OVERLAP)
+            rows = queryset.values_list(
+                'id', 'is_active', 'skills', 'county', 'remote_type', 'min_salary', 'updated_at'
+            )
+
+            skill_counts = None
+            changed = 0
+            for search_id, is_active, skills, county, remote_type, min_salary, updated_at in rows.iterator(chunk_size=2000):
+                if is_active:
+                    if skill_counts is None:
+                        skill_counts = dict(SkillDemand.objects.values_list('skill_name', 'demand_count'))
+                    self.add(search_id, skills, county, remote_type, min_salary, skill_counts)
+                else:
+                    self.remove(search_id)
+                if self.synced_at is None or updated_at > self.synced_at:
+                    self.synced_at = updated_at
+                changed += 1
+
+            self.last_refresh = time.monotonic()
+
+        if changed:
+            logger.info(f"Saved search index synced {changed} searches ({len(self)} indexed)")
+        return changed
+
+
+_index = None
+_index_lock = threading.Lock()
+
+
+def get_search_index():
+    """Return the process-wide saved search index, syncing it if stale"""
+    global _index
+    with _index_lock:
+        if _index is None:
+            _index = SearchIndex()
+    _index.refresh()
+    return _index
+
+
+def percolate(postings):
+    """Match new postings against the saved searches and store the alerts in bulk.
+
+    Returns the number of alerts created. Searches deleted since the index
+    last synced are dropped here, from the alerts and from the index.
+    """
+    index = get_search_index()
+    matches = [
+        (search_id, posting.id)
+        for posting in postings
+        for search_id in index.match(posting.skills_required, posting.county, posting.remote_type, posting.salary_min)
+    ]
+    if not matches:
+        return 0
+
+    matched = {search_id for search_id, _ in matches}
+    live = set(SavedSearch.objects.filter(id__in=matched, is_active=True).values_list('id', flat=True))
+    for search_id in matched - live:
+        index.remove(search_id)
+    alerts = [
+        JobAlert(saved_search_id=search_id, job_id=job_id)
+        for search_id, job_id in matches
+        if search_id in live
+    ]
+    JobAlert.objects.bulk_create(alerts, batch_size=1000, ignore_conflicts=True)
+    return len(alerts)
@@ -0,0 +1,60 @@
+import io
+import csv
+from django.db import connection
+
+
+def pg_array(values):
+    """Postgres array literal for COPY"""
+    items = ('"' + str(value).replace('\\', '\\\\').replace('"', '\\"') + '"' for value in values)
+    return '{' + ','.join(items) + '}'
+
+
+def _copy_value(value):
+    if value is None:
+        return '\\N'
+    if isinstance(value, bool):
+        return 't' if value else 'f'
+    if isinstance(value, (list, tuple)):
+        return pg_array(value)
+    if hasattr(value, 'isoformat'):
+        return value.isoformat()
+    return str(value)
+
+
+def copy_into(table, columns, rows):
+    """Load rows of values, in column order, into table with COPY.
+
+    The batch is buffered in memory, so callers stream large loads in
+    batches. Returns the rows written.
+    """
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    count = 0
+    for row in rows:
+        writer.writerow([_copy_value(value) for value in row])
+        count += 1
+    buffer.seek(0)
+
+    column_list = ', '.join(connection.ops.quote_name(column) for column in columns)
+    with connection.cursor() as cursor:
+        cursor.copy_expert(
+            f"COPY {connection.ops.quote_name(table)} ({column_list}) FROM STDIN WITH (FORMAT csv, NULL '\\N')",
+            buffer,
+        )
+    return count
+
+
+def copy_rows(model, rows):
+    """Load dicts keyed by field attname into model's table with COPY.
+
+    Fields a row leaves out get the field default. Columns the database
+    generates, such as serial primary keys, are left for Postgres to fill.
+    Returns the rows written.
+    """
+    fields = [field for field in model._meta.concrete_fields if not field.db_returning]
+    defaults = {field.attname: field.get_default() for field in fields}
+    return copy_into(
+        model._meta.db_table,
+        [field.column for field in fields],
+        ([row.get(field.attname, defaults[field.attname]) for field in fields] for row in rows),
+    )
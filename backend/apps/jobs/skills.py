@@ -0,0 +1,337 @@
+import ahocorasick
+
+# Bump whenever SKILLS changes so stored postings can be re-extracted
+TAXONOMY_VERSION = 1
+
+# Canonical skill name -> synonyms, matched case-insensitively on word
+# boundaries. The canonical name is matched too unless it is ambiguous.
+SKILLS = {
+    # Programming languages
+    'Python': ['python3'],
+    'Java': ['java 8', 'java 11', 'java 17', 'core java'],
+    'JavaScript': ['js', 'ecmascript', 'es6', 'vanilla js'],
+    'TypeScript': [],
+    'C': ['c programming', 'c language', 'ansi c'],
+    'C++': ['cpp', 'c plus plus'],
+    'C#': ['c sharp', 'csharp'],
+    'Go': ['golang', 'go programming', 'go language'],
+    'Rust': ['rustlang'],
+    'Ruby': [],
+    'PHP': ['php7', 'php8'],
+    'Kotlin': [],
+    'Swift': ['swiftui'],
+    'Objective-C': ['objective c', 'objc'],
+    'Scala': [],
+    'R': ['r programming', 'r language', 'rstudio', 'r studio'],
+    'MATLAB': [],
+    'Perl': [],
+    'Dart': [],
+    'Elixir': [],
+    'Haskell': [],
+    'Lua': [],
+    'Bash': ['shell scripting', 'bash scripting', 'shell script'],
+    'PowerShell': [],
+    'VBA': ['excel vba', 'visual basic for applications'],
+    'COBOL': [],
+    'SQL': ['structured query language', 't-sql', 'tsql', 'pl/sql', 'plsql'],
+    'HTML': ['html5'],
+    'CSS': ['css3', 'scss', 'sass', 'less css'],
+
+    # Frameworks and libraries
+    'React': ['react.js', 'reactjs', 'react js'],
+    'React Native': ['react-native'],
+    'Angular': ['angularjs', 'angular.js', 'angular js'],
+    'Vue.js': ['vue', 'vuejs', 'vue js', 'nuxt', 'nuxt.js'],
+    'Svelte': ['sveltekit'],
+    'Next.js': ['nextjs', 'next js'],
+    'Node.js': ['node', 'nodejs', 'node js'],
+    'Express.js': ['expressjs', 'express js'],
+    'NestJS': ['nest.js'],
+    'Django': ['django rest framework', 'drf'],
+    'Flask': [],
+    'FastAPI': ['fast api'],
+    'Spring': ['spring boot', 'springboot', 'spring framework', 'spring mvc'],
+    'Hibernate': [],
+    '.NET': ['dotnet', 'dot net', '.net core', 'asp.net', 'asp.net core', 'asp.net mvc'],
+    'Laravel': [],
+    'Symfony': [],
+    'CodeIgniter': [],
+    'Ruby on Rails': ['rails', 'ror'],
+    'Flutter': [],
+    'Xamarin': [],
+    'Ionic': [],
+    'jQuery': [],
+    'Bootstrap': [],
+    'Tailwind CSS': ['tailwind', 'tailwindcss'],
+    'Redux': [],
+    'GraphQL': [],
+    'REST APIs': ['restful', 'rest api', 'restful api', 'restful apis', 'rest apis'],
+    'gRPC': [],
+    'Microservices': ['microservice', 'micro services', 'microservice architecture'],
+
+    # Data and machine learning
+    'Machine Learning': ['machine-learning'],
+    'Deep Learning': ['deep-learning', 'neural networks', 'neural network'],
+    'Artificial Intelligence': ['ai'],
+    'Data Science': ['data scientist'],
+    'Data Analysis': ['data analytics', 'data analyst', 'analysing data', 'analyzing data'],
+    'Data Engineering': ['data engineer', 'data pipelines', 'etl', 'elt'],
+    'Data Visualization': ['data visualisation', 'dashboards', 'dashboarding'],
+    'Statistics': ['statistical analysis', 'statistical modelling', 'statistical modeling'],
+    'Natural Language Processing': ['nlp'],
+    'Computer Vision': ['opencv'],
+    'Pandas': [],
+    'NumPy': [],
+    'scikit-learn': ['sklearn', 'scikit learn'],
+    'TensorFlow': ['tensor flow', 'keras'],
+    'PyTorch': [],
+    'Apache Spark': ['pyspark', 'spark sql', 'spark streaming'],
+    'Hadoop': ['hdfs', 'hive', 'mapreduce'],
+    'Apache Kafka': ['kafka'],
+    'Airflow': ['apache airflow'],
+    'dbt': ['data build tool'],
+    'Power BI': ['powerbi', 'power-bi'],
+    'Tableau': [],
+    'Looker': ['looker studio', 'google data studio'],
+    'Excel': ['microsoft excel', 'ms excel', 'advanced excel', 'spreadsheets'],
+    'SPSS': [],
+    'Stata': [],
+    'SAS': [],
+    'Big Data': [],
+    'Data Warehousing': ['data warehouse', 'data warehouses'],
+    'Business Intelligence': [],
+
+    # Databases
+    'PostgreSQL': ['postgres', 'postgresql database'],
+    'MySQL': ['mariadb'],
+    'Microsoft SQL Server': ['sql server', 'mssql', 'ms sql'],
+    'Oracle Database': ['oracle db', 'oracle database administration', 'oracle sql'],
+    'SQLite': [],
+    'MongoDB': ['mongo'],
+    'Redis': [],
+    'Elasticsearch': ['elastic search', 'elk stack', 'opensearch'],
+    'Cassandra': ['apache cassandra'],
+    'DynamoDB': [],
+    'Firebase': ['firestore'],
+    'Snowflake': [],
+    'BigQuery': ['big query'],
+
+    # Cloud and DevOps
+    'AWS': ['amazon web services', 'ec2', 's3', 'aws lambda'],
+    'Azure': ['microsoft azure'],
+    'Google Cloud': ['gcp', 'google cloud platform'],
+    'DevOps': ['dev ops'],
+    'Docker': ['containerization', 'containerisation'],
+    'Kubernetes': ['k8s', 'eks', 'aks', 'gke'],
+    'Terraform': [],
+    'Ansible': [],
+    'Jenkins': [],
+    'CI/CD': ['ci cd', 'continuous integration', 'continuous delivery', 'continuous deployment'],
+    'GitHub Actions': [],
+    'GitLab CI': ['gitlab-ci'],
+    'Git': ['github', 'gitlab', 'bitbucket', 'version control'],
+    'Linux': ['unix', 'ubuntu', 'centos', 'red hat', 'rhel'],
+    'Windows Server': [],
+    'Nginx': [],
+    'Apache HTTP Server': ['apache web server', 'httpd'],
+    'Prometheus': [],
+    'Grafana': [],
+    'Site Reliability Engineering': ['sre'],
+    'Networking': ['tcp/ip', 'computer networks', 'network administration'],
+    'Cisco': ['ccna', 'ccnp'],
+    'Cybersecurity': ['cyber security', 'information security', 'infosec', 'it security'],
+    'Penetration Testing': ['pen testing', 'pentesting', 'ethical hacking'],
+    'Blockchain': ['web3', 'smart contracts', 'solidity'],
+
+    # Software engineering practice
+    'Agile': ['agile methodology', 'agile methodologies'],
+    'Scrum': ['scrum master'],
+    'Kanban': [],
+    'Jira': ['atlassian jira'],
+    'Test Automation': ['automated testing', 'automation testing'],
+    'Unit Testing': ['unit tests', 'tdd', 'test driven development'],
+    'Selenium': [],
+    'Quality Assurance': ['qa', 'software testing', 'manual testing'],
+    'System Design': ['software architecture', 'solution architecture'],
+    'Object-Oriented Programming': ['oop', 'object oriented programming'],
+    'Mobile Development': ['mobile app development', 'mobile applications'],
+    'Android': ['android development', 'android sdk'],
+    'iOS': ['ios development'],
+    'Full Stack Development': ['full stack', 'full-stack', 'fullstack'],
+    'Frontend Development': ['front end', 'front-end', 'frontend'],
+    'Backend Development': ['back end', 'back-end', 'backend'],
+    'WordPress': ['wordpress development'],
+    'Salesforce': [],
+    'SAP': ['sap erp', 'sap s/4hana', 'sap fico'],
+    'ERP Systems': ['erp', 'enterprise resource planning', 'microsoft dynamics', 'dynamics 365'],
+    'USSD': [],
+    'M-Pesa Integration': ['mpesa', 'm-pesa', 'daraja api', 'mpesa api'],
+
+    # Design
+    'UI/UX Design': ['ui/ux', 'ux/ui', 'ui ux', 'ux design', 'ui design', 'user experience', 'user interface design'],
+    'Graphic Design': ['graphic designer', 'visual design'],
+    'Figma': [],
+    'Sketch': [],
+    'Adobe XD': [],
+    'Photoshop': ['adobe photoshop'],
+    'Illustrator': ['adobe illustrator'],
+    'InDesign': ['adobe indesign'],
+    'Adobe Premiere Pro': ['premiere pro'],
+    'After Effects': ['adobe after effects'],
+    'Canva': [],
+    'AutoCAD': ['auto cad'],
+    'Video Editing': [],
+
+    # Marketing and sales
+    'Digital Marketing': ['online marketing'],
+    'Marketing': ['marketing strategy'],
+    'SEO': ['search engine optimization', 'search engine optimisation'],
+    'SEM': ['search engine marketing', 'google ads', 'ppc', 'pay per click'],
+    'Content Marketing': ['content creation', 'content strategy'],
+    'Social Media Marketing': ['social media', 'social media management'],
+    'Email Marketing': ['mailchimp'],
+    'Copywriting': ['copy writing'],
+    'Google Analytics': [],
+    'Brand Management': ['branding'],
+    'Market Research': [],
+    'Public Relations': ['media relations'],
+    'Sales': ['selling', 'business development', 'b2b sales', 'b2c sales'],
+    'Account Management': ['key account management'],
+    'Customer Service': ['customer care', 'customer support', 'customer experience', 'client service'],
+    'CRM': ['customer relationship management', 'hubspot', 'zoho crm'],
+    'Negotiation': ['negotiation skills'],
+    'Telesales': ['telemarketing'],
+    'Merchandising': [],
+
+    # Business, finance and operations
+    'Project Management': ['project manager', 'project planning'],
+    'PMP': ['project management professional'],
+    'PRINCE2': [],
+    'Product Management': ['product manager', 'product owner'],
+    'Business Analysis': ['business analyst', 'requirements gathering'],
+    'Strategy': ['strategic planning', 'business strategy'],
+    'Operations Management': ['operations', 'operations manager'],
+    'Supply Chain Management': ['supply chain', 'logistics', 'procurement', 'purchasing'],
+    'Inventory Management': ['stock control', 'inventory control'],
+    'Accounting': ['bookkeeping', 'book keeping', 'accounts payable', 'accounts receivable'],
+    'Finance': ['financial analysis', 'financial modelling', 'financial modeling', 'financial reporting'],
+    'Auditing': ['audit', 'internal audit', 'external audit'],
+    'Taxation': ['tax compliance', 'kra compliance', 'vat'],
+    'IFRS': ['international financial reporting standards'],
+    'CPA': ['cpa(k)', 'cpa k', 'certified public accountant'],
+    'ACCA': [],
+    'CFA': [],
+    'QuickBooks': ['quick books'],
+    'Sage': ['sage pastel', 'pastel'],
+    'Payroll': ['payroll management'],
+    'Budgeting': ['budget management', 'forecasting'],
+    'Risk Management': ['risk assessment', 'credit risk'],
+    'Compliance': ['regulatory compliance', 'aml', 'kyc'],
+    'Banking': ['retail banking', 'corporate banking'],
+    'Insurance': ['underwriting', 'claims management'],
+    'Microfinance': [],
+    'Human Resources': ['hr', 'human resource management', 'hrm'],
+    'Recruitment': ['talent acquisition', 'recruiting', 'headhunting'],
+    'Training and Development': ['learning and development', 'l&d'],
+    'Performance Management': [],
+    'Employee Relations': ['labour relations', 'labor relations'],
+    'Office Administration': ['administration', 'office management', 'secretarial'],
+    'Microsoft Office': ['ms office', 'microsoft office suite', 'office 365', 'microsoft 365'],
+    'Microsoft Word': ['ms word'],
+    'PowerPoint': ['microsoft powerpoint', 'ms powerpoint'],
+    'Data Entry': [],
+
+    # Soft skills
+    'Communication': ['communication skills', 'written communication', 'verbal communication'],
+    'Leadership': ['team leadership', 'people management'],
+    'Teamwork': ['team player', 'collaboration'],
+    'Problem Solving': ['problem-solving', 'analytical skills', 'critical thinking'],
+    'Time Management': [],
+    'Presentation Skills': ['public speaking'],
+    'Stakeholder Management': ['stakeholder engagement'],
+
+    # Sector skills common in Kenyan listings
+    'Monitoring and Evaluation': ['m&e', 'monitoring & evaluation', 'monitoring, evaluation'],
+    'Grant Writing': ['proposal writing', 'grant management'],
+    'Community Development': ['community mobilization', 'community mobilisation'],
+    'Public Health': ['epidemiology'],
+    'Nursing': ['registered nurse', 'enrolled nurse', 'kenya registered community health nurse'],
+    'Clinical Medicine': ['clinical officer', 'clinical practice'],
+    'Pharmacy': ['pharmaceutical technologist', 'pharmacist'],
+    'Laboratory Skills': ['lab technician', 'laboratory analysis'],
+    'Teaching': ['classroom management', 'lesson planning', 'tutoring'],
+    'Agronomy': ['crop production', 'agribusiness', 'agricultural extension'],
+    'Civil Engineering': ['structural engineering', 'construction management'],
+    'Electrical Engineering': ['electrical installation', 'power systems'],
+    'Mechanical Engineering': ['maintenance engineering'],
+    'Quantity Surveying': ['quantity surveyor', 'bill of quantities'],
+    'Health and Safety': ['hse', 'occupational health and safety', 'osha'],
+    'Hospitality': ['front office', 'food and beverage', 'housekeeping'],
+    'Driving': ['driving licence', "driver's license", 'valid driving license'],
+    'Swahili': ['kiswahili'],
+    'French': ['french language'],
+    'Legal Research': ['legal drafting', 'litigation', 'conveyancing'],
+    'Journalism': ['news writing', 'news reporting'],
+}
+
+# Names that are also letters or everyday words; only their synonyms match
+AMBIGUOUS_NAMES = {'C', 'R', 'Go', 'Rust', 'Swift'}
+
+
+def _is_word_char(ch):
+    return ch.isalnum() or ch == '_'
+
+
+def normalize(text):
+    """Lowercase text and collapse runs of whitespace to single spaces"""
+    return ' '.join((text or '').lower().split())
+
+
+class SkillExtractor:
+    """Aho-Corasick matcher over every skill name and synonym in SKILLS.
+
+    A description is scanned once whatever the taxonomy size; each raw hit
+    is then kept only if it starts and ends on a word boundary, so "git"
+    does not fire inside "digital" nor "java" inside "javascript".
+    """
+
+    def __init__(self, skills=SKILLS, version=TAXONOMY_VERSION):
+        self.version = version
+        self.automaton = ahocorasick.Automaton()
+        for canonical, synonyms in skills.items():
+            terms = synonyms if canonical in AMBIGUOUS_NAMES else [canonical] + synonyms
+            for term in terms:
+                term = normalize(term)
+                self.automaton.add_word(term, (len(term), canonical))
+        self.automaton.make_automaton()
+
+    def extract(self, text):
+        """Return the canonical skills mentioned in text, in order of first mention"""
+        text = normalize(text)
+        if not text:
+            return []
+        found = {}
+        for end, (length, canonical) in self.automaton.iter(text):
+            start = end - length + 1
+            if start > 0 and _is_word_char(text[start - 1]) and _is_word_char(text[start]):
+                continue
+            if end + 1 < len(text) and _is_word_char(text[end + 1]) and _is_word_char(text[end]):
+                continue
+            found.setdefault(canonical, start)
+        return sorted(found, key=found.get)
+
+
+_extractor = None
+
+
+def get_skill_extractor():
+    """Return the process-wide skill extractor"""
+    global _extractor
+    if _extractor is None:
+        _extractor = SkillExtractor()
+    return _extractor
+
+
+def extract_skills(text):
+    """Extract canonical skill names from free text"""
+    return get_skill_extractor().extract(text)
@@ -0,0 +1,219 @@
+import math
+import uuid
+import random
+import logging
+from datetime import timedelta
+from django.db import connection, transaction
+from django.utils import timezone
+from ..analytics.services import AnalyticsService
+from .models import Company, JobPosting, SalaryInsight
+from .extraction import EXTRACTION_VERSION
+from .gazetteer import COUNTIES, get_gazetteer
+from .pgcopy import copy_rows
+from .skills import SKILLS
+
+logger = logging.getLogger(__name__)
+
+# Marks every generated row so it can be told apart from scraped data and removed
+SYNTHETIC_PLATFORM = 'synthetic'
+SYNTHETIC_COMPANY_PREFIX = 'Synthetic Co'
+
+# Largest labour markets first; the remaining counties follow in code order
+COUNTY_ORDER = [47, 1, 42, 32, 22, 27, 12, 21, 37, 17]
+
+ROLES = [
+    'Software Engineer', 'Data Analyst', 'Accountant', 'Sales Representative', 'Project Manager',
+    'Marketing Officer', 'Customer Service Agent', 'Business Analyst', 'Data Scientist',
+    'Product Manager', 'HR Officer', 'Finance Manager', 'DevOps Engineer', 'Procurement Officer',
+    'Graphic Designer', 'Nurse', 'Teacher', 'Logistics Coordinator', 'Credit Analyst', 'Auditor',
+]
+LEVEL_TITLES = {'entry': 'Junior', 'mid': '', 'senior': 'Senior', 'executive': 'Head of'}
+INDUSTRIES = ['Banking', 'Telecommunications', 'Manufacturing', 'Retail', 'Healthcare', 'Technology',
+              'Education', 'Logistics', 'Agriculture', 'Insurance', 'Media', 'Energy']
+COMPANY_SIZES = ['1-10 employees', '11-50 employees', '51-200 employees', '201-1000 employees',
+                 '1000+ employees']
+
+EXPERIENCE_WEIGHTS = {'entry': 30, 'mid': 40, 'senior': 22, 'executive': 8}
+EMPLOYMENT_WEIGHTS = {'full_time': 80, 'contract': 12, 'internship': 4, 'part_time': 3, 'freelance': 1}
+REMOTE_WEIGHTS = {'on_site': 75, 'hybrid': 17, 'remote': 8}
+# Median monthly KES salary per level; salaries are log-normal around it
+MEDIAN_SALARY = {'entry': 40000, 'mid': 90000, 'senior': 180000, 'executive': 350000}
+SALARY_SIGMA = 0.45
+SALARY_DISCLOSED = 0.6
+
+
+def zipf_weights(count, exponent=1.1):
+    """Cumulative Zipf weights, so a few items take most of the draws"""
+    total = 0.0
+    cumulative = []
+    for rank in range(1, count + 1):
+        total += 1 / rank ** exponent
+        cumulative.append(total)
+    return cumulative
+
+
+def clear_synthetic_data():
+    """Delete every generated row with set-based deletes.
+
+    Generated rows are never referenced by sightings, duplicates or other
+    scraped data, so the ORM's per-row cascade collection is not needed.
+    """
+    with transaction.atomic(), connection.cursor() as cursor:
+        cursor.execute(
+            f"DELETE FROM {SalaryInsight._meta.db_table} WHERE source = %s", [SYNTHETIC_PLATFORM]
+        )
+        cursor.execute(
+            f"DELETE FROM {JobPosting._meta.db_table} WHERE source_platform = %s", [SYNTHETIC_PLATFORM]
+        )
+        cursor.execute(
+            f"DELETE FROM {Company._meta.db_table} WHERE name LIKE %s", [f"{SYNTHETIC_COMPANY_PREFIX} %"]
+        )
+
+
+class SyntheticDataGenerator:
+    """Builds production-shaped companies, postings, salary reports and skill demand.
+
+    Employers, skills and counties follow Zipf distributions, so a few of each
+    dominate as in scraped data. Salaries are log-normal per experience level.
+    The same seed always gives the same dataset.
+    """
+
+    def __init__(self, seed=42, batch_size=50000):
+        self.random = random.Random(seed)
+        self.batch_size = batch_size
+        self.now = timezone.now()
+
+        self.skills = list(SKILLS)
+        self.random.shuffle(self.skills)
+        self.skill_weights = zipf_weights(len(self.skills))
+
+        county_codes = COUNTY_ORDER + [code for code in COUNTIES if code not in COUNTY_ORDER]
+        self.counties = [COUNTIES[code] for code in county_codes]
+        self.county_weights = zipf_weights(len(self.counties), exponent=1.3)
+        self.town_ids = {}
+
+    def _pick(self, weights):
+        return self.random.choices(list(weights), weights=list(weights.values()))[0]
+
+    def _town(self):
+        """A (town, county name, county id, town id), resolving ids once per town"""
+        county_name, _, towns = self.random.choices(self.counties, cum_weights=self.county_weights)[0]
+        town = self.random.choice(towns)[0]
+        if town not in self.town_ids:
+            resolved_county, county_id, town_id = get_gazetteer().resolve_ids(town)
+            self.town_ids[town] = (resolved_county or county_name, county_id, town_id)
+        return (town,) + self.town_ids[town]
+
+    def _salary(self, level):
+        return round(MEDIAN_SALARY[level] * math.exp(self.random.gauss(0, SALARY_SIGMA)), -2)
+
+    def generate(self, jobs, companies, salary_reports):
+        """Insert the dataset in COPY batches and return the row counts"""
+        company_ids = self._generate_companies(companies)
+        company_weights = zipf_weights(len(company_ids), exponent=0.9)
+
+        inserted = 0
+        while inserted < jobs:
+            size = min(self.batch_size, jobs - inserted)
+            batch = (self._job(inserted + offset, company_ids, company_weights) for offset in range(size))
+            with transaction.atomic():
+                copy_rows(JobPosting, batch)
+            inserted += size
+            logger.info(f"Generated {inserted}/{jobs} synthetic job postings")
+
+        reports = 0
+        while reports < salary_reports:
+            size = min(self.batch_size, salary_reports - reports)
+            with transaction.atomic():
+                copy_rows(SalaryInsight, (self._salary_report(company_ids, company_weights) for _ in range(size)))
+            reports += size
+
+        return {
+            'companies': len(company_ids),
+            'jobs': inserted,
+            'salary_insights': reports,
+            # Recomputed from every active posting, so scraped counts stay included
+            'skill_demand': AnalyticsService().update_skill_demand().skills_updated,
+        }
+
+    def _generate_companies(self, count):
+        rows = [
+            {
+                'name': f"{SYNTHETIC_COMPANY_PREFIX} {number:06d}",
+                'industry': self.random.choice(INDUSTRIES),
+                'size': self.random.choice(COMPANY_SIZES),
+                'location': self._town()[0],
+                'created_at': self.now,
+                'updated_at': self.now,
+            }
+            for number in range(count)
+        ]
+        with transaction.atomic():
+            copy_rows(Company, rows)
+        return list(
+            Company.objects.filter(name__startswith=f"{SYNTHETIC_COMPANY_PREFIX} ")
+            .order_by('name').values_list('id', flat=True)
+        )
+
+    def _job(self, number, company_ids, company_weights):
+        level = self._pick(EXPERIENCE_WEIGHTS)
+        role = self.random.choice(ROLES)
+        title = f"{LEVEL_TITLES[level]} {role}".strip()
+        skills = list(dict.fromkeys(
+            self.random.choices(self.skills, cum_weights=self.skill_weights, k=self.random.randint(2, 8))
+        ))
+        town, county, county_id, town_id = self._town()
+
+        salary_min = salary_max = None
+        if self.random.random() < SALARY_DISCLOSED:
+            salary_min = self._salary(level)
+            salary_max = round(salary_min * self.random.uniform(1.1, 1.5), -2)
+
+        # Most postings are recent; older ones have mostly been taken down
+        age = min(self.random.expovariate(1 / 20), 120)
+        posted_date = self.now - timedelta(days=age)
+        scraped_at = min(posted_date + timedelta(hours=self.random.uniform(0, 48)), self.now)
+        is_active = age < 60 or self.random.random() < 0.3
+
+        return {
+            'id': uuid.UUID(int=self.random.getrandbits(128), version=4),
+            'title': title,
+            'company_id': self.random.choices(company_ids, cum_weights=company_weights)[0],
+            'description': (
+                f"We are hiring a {title} in {town}. You will work with {', '.join(skills)} "
+                f"and collaborate with teams across {county}. "
+                + "Strong communication skills and attention to detail are essential. " * 3
+            ),
+            'location': town,
+            'county': county,
+            'county_ref_id': county_id,
+            'town_id': town_id,
+            'remote_type': self._pick(REMOTE_WEIGHTS),
+            'employment_type': self._pick(EMPLOYMENT_WEIGHTS),
+            'experience_level': level,
+            'salary_min': salary_min,
+            'salary_max': salary_max,
+            'skills_required': skills,
+            'extraction_version': EXTRACTION_VERSION,
+            'source_platform': SYNTHETIC_PLATFORM,
+            'source_url': f"https://synthetic.invalid/jobs/{number}",
+            'external_id': f"syn-{number}",
+            'posted_date': posted_date,
+            'scraped_at': scraped_at,
+            'last_updated': scraped_at,
+            'is_active': is_active,
+            'view_count': int(self.random.paretovariate(1.5)) - 1,
+        }
+
+    def _salary_report(self, company_ids, company_weights):
+        level = self._pick(EXPERIENCE_WEIGHTS)
+        return {
+            'job_title': f"{LEVEL_TITLES[level]} {self.random.choice(ROLES)}".strip(),
+            'company_id': self.random.choices(company_ids, cum_weights=company_weights)[0],
+            'location': self._town()[0],
+            'experience_level': level,
+            'salary_amount': self._salary(level),
+            'source': SYNTHETIC_PLATFORM,
+            'reported_date': self.now - timedelta(days=self.random.uniform(0, 365)),
+            'created_at': self.now,
+        }
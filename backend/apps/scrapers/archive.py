@@ -0,0 +1,78 @@
+import gzip
+import hashlib
+import logging
+import os
+import tempfile
+from pathlib import Path
+from django.conf import settings
+from django.utils import timezone
+from ..jobs.models import ArchivedPage
+
+logger = logging.getLogger(__name__)
+
+
+class BlobStore:
+    """Content-addressed store of gzip-compressed page bodies on local disk"""
+
+    def __init__(self, root):
+        self.root = Path(root)
+
+    def path_for(self, content_hash):
+        return self.root / content_hash[:2] / content_hash[2:4] / f"{content_hash}.html.gz"
+
+    def put(self, html):
+        """Store html once per distinct content and return (hash, compressed size)"""
+        data = html.encode('utf-8')
+        content_hash = hashlib.sha256(data).hexdigest()
+        path = self.path_for(content_hash)
+        if path.exists():
+            return content_hash, path.stat().st_size
+
+        path.parent.mkdir(parents=True, exist_ok=True)
+        compressed = gzip.compress(data, compresslevel=6)
+        # Write then rename so a reader never sees a half-written blob
+        fd, tmp_path = tempfile.mkstemp(dir=path.parent, suffix='.tmp')
+        with os.fdopen(fd, 'wb') as tmp:
+            tmp.write(compressed)
+        os.replace(tmp_path, path)
+        return content_hash, len(compressed)
+
+    def get(self, content_hash):
+        """Return the stored html for a content hash"""
+        with gzip.open(self.path_for(content_hash), 'rb') as blob:
+            return blob.read().decode('utf-8')
+
+
+class PageArchive:
+    """Writes fetched pages to the blob store and buffers their index rows"""
+
+    def __init__(self, store):
+        self.store = store
+        self.pending = []
+
+    def record(self, url, html, platform, page_type, context=None):
+        try:
+            content_hash, size = self.store.put(html)
+        except OSError as e:
+            logger.warning(f"Could not archive {url}: {e}")
+            return
+        self.pending.append(ArchivedPage(
+            url=url[:2000],
+            platform=platform or '',
+            page_type=page_type,
+            content_hash=content_hash,
+            compressed_size=size,
+            context=context or {},
+            fetched_at=timezone.now(),
+        ))
+
+    def flush(self):
+        """Write buffered index rows in one bulk insert"""
+        pending, self.pending = self.pending, []
+        if pending:
+            ArchivedPage.objects.bulk_create(pending, batch_size=500)
+        return len(pending)
+
+
+def get_blob_store():
+    return BlobStore(settings.SCRAPER_ARCHIVE_ROOT)
@@ -1,43 +1,217 @@
-import time
-import random
+import threading
 from abc import ABC, abstractmethod
-from selenium import webdriver
-from selenium.webdriver.chrome.options import Options
+from concurrent.futures import ThreadPoolExecutor
+from django.conf import settings
+from fake_useragent import UserAgent
+import requests
+from lxml import etree
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
-from fake_useragent import UserAgent
+from selenium.common.exceptions import TimeoutException, WebDriverException
+from .browser_pool import build_chrome_driver, get_browser_pool, page_transfer
+from .http_client import get_http_client, domain_slot
+from .rate_limit import get_rate_limiter
+from .parsing import parse_html, select_one
+from .seen_index import get_seen_index
+from .archive import PageArchive, get_blob_store
+from .telemetry import ScrapeStats
+from .ingest import stable_external_id
+from ..jobs.models import JobPosting
 import logging
 
 logger = logging.getLogger(__name__)
 
 class BaseScraper(ABC):
-    def __init__(self, headless=True, delay_range=(2, 5)):
+    # Key into settings.SCRAPER_FETCH_BACKENDS
+    platform = None
+    # Most records taken from one listing page (None for all)
+    max_records_per_page = None
+
+    def __init__(self, headless=True, use_pool=True, fetch_backend=None, incremental=True, full_scan=False,
+                 browser_profile=None, base_url=None):
         self.ua = UserAgent()
-        self.delay_range = delay_range
-        self.driver = self._setup_driver(headless)
+        # Search page URL; overridden to point scrapers at a fixture server
+        self.base_url = base_url or settings.SCRAPER_BASE_URLS.get(self.platform)
+        self.incremental = incremental
+        # Page through every result even when pages are mostly known (sweep runs)
+        self.full_scan = full_scan
+        self.headless = headless
+        self.use_pool = use_pool
+        # Key into settings.SCRAPER_BROWSER_PROFILES; pooled browsers use the default
+        self.browser_profile = browser_profile or settings.SCRAPER_BROWSER_PROFILE
+        self.last_transfer = None
+        self.fetch_backend = fetch_backend or settings.SCRAPER_FETCH_BACKENDS.get(self.platform, 'browser')
+        self.session = None
+        self._driver = None
+        # WebDriver is not thread-safe; concurrent fetches share it one at a time
+        self._browser_lock = threading.Lock()
+        # Raw pages are kept so parsers can be re-run offline (reparse_archive)
+        self.archive = PageArchive(get_blob_store()) if settings.SCRAPER_ARCHIVE_ENABLED else None
+        self.stats = ScrapeStats()
+
+    @property
+    def driver(self):
+        # Chrome is only started the first time a page actually needs it
+        if self._driver is None:
+            if self.use_pool and self.headless and self.browser_profile == settings.SCRAPER_BROWSER_PROFILE:
+                # Borrow a warm browser from this worker's pool instead of starting Chrome
+                self.session = get_browser_pool().acquire()
+                self._driver = self.session.driver
+            else:
+                self._driver = self._setup_driver(self.headless)
+        return self._driver
 
     def _setup_driver(self, headless):
-        options = Options()
-        if headless:
-            options.add_argument('--headless')
-        options.add_argument('--no-sandbox')
-        options.add_argument('--disable-dev-shm-usage')
-        options.add_argument(f'--user-agent={self.ua.random}')
-        options.add_argument('--disable-blink-features=AutomationControlled')
-        options.add_experimental_option("excludeSwitches", ["enable-automation"])
-        options.add_experimental_option('useAutomationExtension', False)
-        
-        driver = webdriver.Chrome(options=options)
-        driver.execute_script("Object.defineProperty(navigator, 'webdriver', {get: () => undefined})")
-        return driver
-
-    def random_delay(self):
-        time.sleep(random.uniform(*self.delay_range))
+        return build_chrome_driver(headless=headless, user_agent=self.ua.random, profile=self.browser_profile)
+
+    def load_page(self, url):
+        """Navigate the browser to url, flagging the session if Chrome died"""
+        self.stats.add_time('sleep', get_rate_limiter().acquire(url))
+        try:
+            with self.stats.timer('page_load'):
+                self.driver.get(url)
+        except TimeoutException:
+            raise
+        except WebDriverException:
+            if self.session:
+                self.session.broken = True
+            raise
+        finally:
+            if self.session:
+                self.session.pages += 1
+
+    def fetch_document(self, url, wait_selector=None, page_type='listing', context=None):
+        """Fetch and parse a page, over HTTP when configured, else in the browser.
+
+        An HTTP response that is empty or lacks wait_selector (blocked, or
+        rendered client-side) falls back to the browser for that page. The page is
+        archived with context, the parser inputs that are not in the page.
+        """
+        if self.fetch_backend == 'http':
+            try:
+                # Wait for a permit before taking one of the domain's connection slots
+                self.stats.add_time('sleep', get_rate_limiter().acquire(url))
+                with domain_slot(url), self.stats.timer('page_load'):
+                    html = get_http_client().get_html(url)
+                with self.stats.timer('parse'):
+                    document = parse_html(html, base_url=url)
+                if wait_selector is None or select_one(document, wait_selector) is not None:
+                    self._page_fetched(url, html, page_type, context)
+                    return document
+                logger.info(f"No {wait_selector} in HTTP response for {url}, retrying in browser")
+            except (requests.RequestException, ValueError, etree.ParserError) as e:
+                logger.warning(f"HTTP fetch failed for {url}, retrying in browser: {e}")
+
+        with self._browser_lock:
+            self.load_page(url)
+            with self.stats.timer('page_load'):
+                self._wait_for(wait_selector)
+                html = self.driver.page_source
+            self.last_transfer = page_transfer(self.driver)
+        self._page_fetched(url, html, page_type, context, self.last_transfer['bytes'])
+        with self.stats.timer('parse'):
+            return parse_html(html, base_url=url)
+
+    def _wait_for(self, wait_selector):
+        """Wait until the page holds what the parser needs.
+
+        Lean profiles hand control back before the load event, so the wait
+        is on the scraper's own selector, or on the DOM being parsed when
+        there is none.
+        """
+        wait = WebDriverWait(self.driver, settings.SCRAPER_BROWSER_WAIT_TIMEOUT)
+        if wait_selector:
+            wait.until(EC.presence_of_element_located((By.CSS_SELECTOR, wait_selector)))
+        else:
+            wait.until(lambda driver: driver.execute_script('return document.readyState') != 'loading')
+
+    def _page_fetched(self, url, html, page_type, context, transferred=None):
+        self.stats.add('pages_fetched')
+        # Browser loads report every byte received; HTTP fetches are just the page
+        self.stats.add('bytes_fetched', transferred or len(html.encode('utf-8')))
+        if self.archive is not None:
+            self.archive.record(url, html, self.platform, page_type, context)
+
+    def fetch_documents(self, urls, wait_selector=None, max_workers=None, page_type='listing'):
+        """Fetch several pages through a bounded thread pool.
+
+        Returns {url: document}, with None for pages that could not be
+        fetched. Per-domain slots in the HTTP client cap how many of the
+        requests hit one site at once.
+        """
+        def fetch(url):
+            try:
+                return self.fetch_document(url, wait_selector, page_type)
+            except Exception as e:
+                logger.error(f"Error fetching {url}: {e}")
+                return None
+
+        urls = list(dict.fromkeys(urls))
+        workers = max_workers or settings.SCRAPER_DETAIL_WORKERS
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            return dict(zip(urls, executor.map(fetch, urls)))
+
+    def known_ids(self, jobs):
+        """Return the external ids among jobs that earlier runs already stored"""
+        if not self.incremental or not jobs:
+            return set()
+        return get_seen_index().known(self.platform, [stable_external_id(job) for job in jobs])
+
+    def stored_ids(self, external_ids):
+        """The external ids among these that still have a posting row.
+
+        The seen index outlives postings removed by cleanup, so only these
+        can skip their detail pages; ingest refreshes them as existing rows.
+        """
+        if not external_ids:
+            return set()
+        return set(JobPosting.objects.filter(
+            source_platform=self.platform, external_id__in=external_ids
+        ).values_list('external_id', flat=True))
+
+    def page_mostly_known(self, jobs, known):
+        """Whether a results page is mostly postings seen before, so paging can stop"""
+        if not self.incremental or self.full_scan or not jobs:
+            return False
+        seen = sum(1 for job in jobs if stable_external_id(job) in known)
+        return seen / len(jobs) >= settings.SCRAPER_KNOWN_PAGE_RATIO
+
+    def parse_record(self, card, context=None):
+        """Turn one listing card into a job dict, or None if it is not a job"""
+        return self.parse_job_details(card)
+
+    def parse_page(self, document, context=None):
+        """Parse every job on an already fetched listing page, without network access"""
+        jobs = []
+        failures = 0
+        with self.stats.timer('parse'):
+            for card in self.parse_listing(document)[:self.max_records_per_page]:
+                try:
+                    job_data = self.parse_record(card, context)
+                except Exception as e:
+                    logger.error(f"Error parsing {self.platform} job card: {e}")
+                    job_data = None
+                if job_data:
+                    jobs.append(job_data)
+                else:
+                    failures += 1
+        self.stats.add('cards_parsed', len(jobs))
+        self.stats.add('parse_failures', failures)
+        return jobs
 
     def close(self):
-        if self.driver:
-            self.driver.quit()
+        if self.archive is not None:
+            try:
+                self.archive.flush()
+            except Exception as e:
+                logger.error(f"Error saving {self.platform} page archive index: {e}")
+        if self.session:
+            get_browser_pool().release(self.session)
+            self.session = None
+        elif self._driver:
+            self._driver.quit()
+        self._driver = None
 
     @abstractmethod
     def scrape_jobs(self, search_term, location, max_pages=5):
@@ -45,4 +219,4 @@ class BaseScraper(ABC):
 
     @abstractmethod
     def parse_job_details(self, job_element):
-        pass
\ No newline at end of file
+        pass
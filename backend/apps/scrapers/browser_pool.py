@@ -0,0 +1,208 @@
+import atexit
+import json
+import random
+import threading
+import logging
+from django.conf import settings
+from selenium import webdriver
+from selenium.webdriver.chrome.options import Options
+from selenium.common.exceptions import WebDriverException
+
+logger = logging.getLogger(__name__)
+
+
+# URL patterns for Network.setBlockedURLs, added by the block_* profile flags
+IMAGE_URL_PATTERNS = ['*.png', '*.jpg', '*.jpeg', '*.gif', '*.webp', '*.svg', '*.ico']
+MEDIA_URL_PATTERNS = ['*.mp4', '*.webm', '*.m3u8', '*.mp3', '*.ogg']
+FONT_URL_PATTERNS = ['*.woff', '*.woff2', '*.ttf', '*.otf']
+
+
+def browser_profile(name=None):
+    """Return a SCRAPER_BROWSER_PROFILES entry, the configured default when name is None"""
+    name = name or settings.SCRAPER_BROWSER_PROFILE
+    try:
+        return settings.SCRAPER_BROWSER_PROFILES[name]
+    except KeyError:
+        raise ValueError(f"Unknown browser profile {name!r}")
+
+
+def build_chrome_driver(headless=True, user_agent=None, profile=None):
+    """Start a Chrome WebDriver configured for scraping.
+
+    profile names a SCRAPER_BROWSER_PROFILES entry: its page load strategy,
+    and which images, media, fonts and third-party hosts are never requested.
+    """
+    profile = browser_profile(profile)
+    options = Options()
+    if headless:
+        options.add_argument('--headless')
+    options.add_argument('--no-sandbox')
+    options.add_argument('--disable-dev-shm-usage')
+    if user_agent:
+        options.add_argument(f'--user-agent={user_agent}')
+    options.add_argument('--disable-blink-features=AutomationControlled')
+    options.add_experimental_option("excludeSwitches", ["enable-automation"])
+    options.add_experimental_option('useAutomationExtension', False)
+    # 'eager' returns at DOMContentLoaded and 'none' at once; callers wait for their own selectors
+    options.page_load_strategy = profile['page_load_strategy']
+    if profile['block_images']:
+        options.add_experimental_option('prefs', {'profile.managed_default_content_settings.images': 2})
+    if profile['block_media']:
+        options.add_argument('--autoplay-policy=user-gesture-required')
+    # Network events let page_transfer count the bytes each page load cost
+    options.set_capability('goog:loggingPrefs', {'performance': 'ALL'})
+
+    driver = webdriver.Chrome(options=options)
+    driver.execute_script("Object.defineProperty(navigator, 'webdriver', {get: () => undefined})")
+
+    blocked = list(profile['blocked_urls'])
+    if profile['block_images']:
+        blocked += IMAGE_URL_PATTERNS
+    if profile['block_media']:
+        blocked += MEDIA_URL_PATTERNS
+    if profile['block_fonts']:
+        blocked += FONT_URL_PATTERNS
+    if blocked:
+        driver.execute_cdp_cmd('Network.enable', {})
+        driver.execute_cdp_cmd('Network.setBlockedURLs', {'urls': blocked})
+    return driver
+
+
+def page_transfer(driver):
+    """Bytes received, requests finished and requests blocked since the last call.
+
+    Reads and clears Chrome's performance log, so call it once after each
+    page load.
+    """
+    transfer = {'bytes': 0, 'requests': 0, 'blocked': 0}
+    try:
+        entries = driver.get_log('performance')
+    except WebDriverException as e:
+        logger.debug(f"Performance log unavailable: {e}")
+        return transfer
+
+    for entry in entries:
+        message = json.loads(entry['message'])['message']
+        if message['method'] == 'Network.loadingFinished':
+            transfer['bytes'] += int(message['params'].get('encodedDataLength', 0))
+            transfer['requests'] += 1
+        elif message['method'] == 'Network.loadingFailed' and message['params'].get('blockedReason'):
+            transfer['blocked'] += 1
+    return transfer
+
+
+class BrowserSession:
+    """A pooled WebDriver plus the bookkeeping needed to recycle it"""
+
+    def __init__(self, driver):
+        self.driver = driver
+        self.pages = 0
+        self.broken = False
+
+    def reset(self):
+        """Clear per-task browser state so the next task starts clean"""
+        driver = self.driver
+        handles = driver.window_handles
+        for handle in handles[1:]:
+            driver.switch_to.window(handle)
+            driver.close()
+        driver.switch_to.window(handles[0])
+        try:
+            driver.execute_script('window.localStorage.clear(); window.sessionStorage.clear();')
+        except WebDriverException:
+            pass  # about:blank and some error pages have no storage
+        driver.delete_all_cookies()
+        driver.get('about:blank')
+
+    def quit(self):
+        try:
+            self.driver.quit()
+        except Exception as e:
+            logger.warning(f"Error quitting pooled browser: {e}")
+
+
+class BrowserPool:
+    """Per-process pool of warm headless Chrome sessions"""
+
+    def __init__(self, size=1, max_pages=200, acquire_timeout=300):
+        self.size = size
+        self.max_pages = max_pages
+        self.acquire_timeout = acquire_timeout
+        self.idle = []
+        self.in_use = 0
+        self.condition = threading.Condition()
+
+    def acquire(self):
+        """Check out a session, starting a browser only if none is idle"""
+        with self.condition:
+            while not self.idle and self.in_use >= self.size:
+                if not self.condition.wait(timeout=self.acquire_timeout):
+                    raise TimeoutError(f"No browser available after {self.acquire_timeout}s")
+            self.in_use += 1
+            if self.idle:
+                return self.idle.pop()
+
+        try:
+            user_agent = random.choice(settings.USER_AGENT_LIST)
+            return BrowserSession(build_chrome_driver(headless=True, user_agent=user_agent))
+        except Exception:
+            with self.condition:
+                self.in_use -= 1
+                self.condition.notify()
+            raise
+
+    def release(self, session):
+        """Return a session, recycling it if it crashed or is worn out.
+
+        The slot is always given back, so a dead chromedriver cannot leave
+        later acquire() calls waiting for it.
+        """
+        keep = not session.broken and session.pages < self.max_pages
+        try:
+            if keep:
+                try:
+                    session.reset()
+                except Exception as e:
+                    # A dead chromedriver surfaces as urllib3/connection errors, not WebDriverException
+                    logger.warning(f"Discarding browser that failed to reset: {e}")
+                    keep = False
+
+            if not keep:
+                logger.info(f"Recycling browser after {session.pages} pages")
+                session.quit()
+        finally:
+            with self.condition:
+                self.in_use -= 1
+                if keep:
+                    self.idle.append(session)
+                self.condition.notify()
+
+    def close_all(self):
+        """Quit every idle browser, e.g. when the worker process exits"""
+        with self.condition:
+            idle, self.idle = self.idle, []
+        for session in idle:
+            session.quit()
+
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def get_browser_pool():
+    """Return this worker process's browser pool"""
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = BrowserPool(
+                size=settings.SCRAPER_BROWSER_POOL_SIZE,
+                max_pages=settings.SCRAPER_BROWSER_MAX_PAGES,
+            )
+            atexit.register(_pool.close_all)
+    return _pool
+
+
+def shutdown_browser_pool(**kwargs):
+    """Signal handler that closes pooled browsers before a worker exits"""
+    if _pool is not None:
+        _pool.close_all()
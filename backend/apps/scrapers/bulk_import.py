@@ -0,0 +1,484 @@
+import csv
+import gzip
+import json
+import time
+import uuid
+import logging
+import multiprocessing
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from decimal import Decimal, InvalidOperation
+from django.conf import settings
+from django.db import connection, transaction
+from django.utils import timezone
+from ..jobs.models import Company, County, JobPosting, Town
+from ..jobs.extraction import EXTRACTION_VERSION, extract_fields
+from ..jobs.gazetteer import ROAD_WORDS, get_gazetteer
+from ..jobs.pgcopy import copy_into
+from ..jobs.skills import SKILLS, normalize as normalize_skill
+from ..analytics.similarity import build_job_vector
+from .dedupe import NUM_PERM, band_hashes, minhash_signature, shingles
+from .ingest import REQUIRED_FIELDS, _clip, parse_posted_date, stable_external_id
+
+logger = logging.getLogger(__name__)
+
+EMPLOYMENT_TYPES = {value for value, _ in JobPosting.EMPLOYMENT_TYPES}
+# salary_min/salary_max are numeric(10, 2)
+MAX_SALARY = Decimal('99999999.99')
+
+STAGING_COLUMNS = [
+    'seq', 'id', 'title', 'company', 'description', 'requirements', 'location', 'employment_type',
+    'salary_min', 'salary_max', 'feed_skills', 'extracted_skills', 'experience_level', 'remote_type',
+    'feature_vector', 'minhash', 'lsh_bands', 'source_platform', 'source_url', 'external_id', 'posted_date',
+]
+
+# Session-local tables: staged rows and the ids they created are dropped at
+# every commit, the lookups live for the whole import
+CREATE_TABLES = [
+    """
+    CREATE TEMP TABLE IF NOT EXISTS job_import_staging (
+        seq bigint PRIMARY KEY,
+        id uuid NOT NULL,
+        title text NOT NULL,
+        company text NOT NULL,
+        description text NOT NULL,
+        requirements text NOT NULL,
+        location text NOT NULL,
+        employment_type text NOT NULL,
+        salary_min numeric(10, 2),
+        salary_max numeric(10, 2),
+        feed_skills text[] NOT NULL,
+        extracted_skills text[] NOT NULL,
+        experience_level text NOT NULL,
+        remote_type text NOT NULL,
+        feature_vector double precision[] NOT NULL,
+        minhash integer[] NOT NULL,
+        lsh_bands bigint[] NOT NULL,
+        source_platform text NOT NULL,
+        source_url text NOT NULL,
+        external_id text NOT NULL,
+        posted_date timestamptz NOT NULL
+    ) ON COMMIT DELETE ROWS
+    """,
+    "CREATE TEMP TABLE IF NOT EXISTS job_import_new (id uuid PRIMARY KEY, seq bigint NOT NULL) ON COMMIT DELETE ROWS",
+    """
+    CREATE TEMP TABLE IF NOT EXISTS job_import_places (
+        alias text PRIMARY KEY, county text NOT NULL, county_id bigint, town_id bigint, is_town boolean NOT NULL,
+        is_county boolean NOT NULL
+    )
+    """,
+    "CREATE TEMP TABLE IF NOT EXISTS job_import_skills (alias text PRIMARY KEY, canonical text NOT NULL)",
+]
+
+# First mention of each employer supplies its location, as in ingest
+MERGE_COMPANIES = """
+    INSERT INTO {company} (name, industry, size, location, website, logo_url, created_at, updated_at)
+    SELECT DISTINCT ON (company) company, '', '', left(location, 100), '', '', now(), now()
+    FROM job_import_staging
+    ORDER BY company, seq
+    ON CONFLICT (name) DO NOTHING
+"""
+
+# Later rows for the same (platform, external id) win. Locations are split
+# into words and every 1..max_words phrase is looked up in the gazetteer
+# aliases, keeping the longest phrases and skipping road names. As in Gazetteer.match, the first county named
+# wins and only towns inside it are kept; without one the first town's county
+# is used. Feed skills are mapped
+# to canonical names and appended after the skills found in the text.
+# Known postings are only marked as seen, as scraped ingest does.
+MERGE_POSTINGS = """
+    WITH latest AS (
+        SELECT DISTINCT ON (source_platform, external_id) *
+        FROM job_import_staging
+        ORDER BY source_platform, external_id, seq DESC
+    ),
+    mentions AS (
+        SELECT w.seq, i, n, p.county, p.county_id, p.town_id, p.is_town, p.is_county
+        FROM (
+            SELECT seq, string_to_array(
+                btrim(regexp_replace(translate(lower(location), '''’', ''), '[^a-z0-9]+', ' ', 'g')), ' '
+            ) AS words
+            FROM latest
+        ) w
+        CROSS JOIN LATERAL generate_subscripts(w.words, 1) AS i
+        CROSS JOIN LATERAL generate_series(1, %s) AS n
+        JOIN job_import_places p ON p.alias = array_to_string(w.words[i:i + n - 1], ' ')
+        WHERE coalesce(w.words[i + n] <> ALL(%s), TRUE)
+    ),
+    longest AS (
+        SELECT * FROM mentions m
+        WHERE NOT EXISTS (
+            SELECT 1 FROM mentions o
+            WHERE o.seq = m.seq AND o.n > m.n AND o.i <= m.i AND o.i + o.n >= m.i + m.n
+        )
+    ),
+    named AS (
+        SELECT DISTINCT ON (seq) seq, county, county_id
+        FROM longest
+        WHERE is_county
+        ORDER BY seq, i, n DESC
+    ),
+    towns AS (
+        SELECT DISTINCT ON (m.seq) m.seq, m.county, m.county_id, m.town_id
+        FROM longest m
+        LEFT JOIN named c ON c.seq = m.seq
+        WHERE m.is_town AND (c.seq IS NULL OR c.county = m.county)
+        ORDER BY m.seq, m.i, m.n DESC
+    ),
+    places AS (
+        SELECT coalesce(c.seq, t.seq) AS seq, coalesce(c.county, t.county) AS county,
+               coalesce(c.county_id, t.county_id) AS county_id, t.town_id
+        FROM named c
+        FULL JOIN towns t ON t.seq = c.seq
+    ),
+    merged AS (
+        INSERT INTO {posting} (
+            id, title, company_id, description, requirements, location, county, county_ref_id, town_id,
+            remote_type, employment_type, experience_level, salary_min, salary_max, salary_currency,
+            salary_period, skills_required, technologies, extraction_version, feature_vector, minhash,
+            lsh_bands, source_platform, source_url, external_id, posted_date, scraped_at, last_updated,
+            is_active, view_count, application_count
+        )
+        SELECT
+            s.id, s.title, c.id, s.description, s.requirements, s.location,
+            coalesce(pl.county, ''), pl.county_id, pl.town_id, s.remote_type, s.employment_type,
+            s.experience_level, s.salary_min, s.salary_max, 'KES', 'monthly',
+            ARRAY(
+                SELECT skill FROM (
+                    SELECT e.skill, e.ord FROM unnest(s.extracted_skills) WITH ORDINALITY AS e(skill, ord)
+                    UNION ALL
+                    SELECT k.canonical, 1000000 + f.ord
+                    FROM unnest(s.feed_skills) WITH ORDINALITY AS f(skill, ord)
+                    JOIN job_import_skills k ON k.alias = f.skill
+                ) found
+                GROUP BY skill
+                ORDER BY min(ord)
+            ),
+            '{{}}', %s, s.feature_vector, s.minhash, s.lsh_bands, s.source_platform, s.source_url,
+            s.external_id, s.posted_date, now(), now(), TRUE, 0, 0
+        FROM latest s
+        JOIN {company} c ON c.name = s.company
+        LEFT JOIN places pl ON pl.seq = s.seq
+        ON CONFLICT (source_platform, external_id) DO UPDATE SET last_updated = EXCLUDED.last_updated, is_active = TRUE
+        RETURNING id, source_platform, external_id, xmax = 0 AS inserted
+    ),
+    new_rows AS (
+        INSERT INTO job_import_new (id, seq)
+        SELECT m.id, l.seq
+        FROM merged m
+        JOIN latest l ON l.source_platform = m.source_platform AND l.external_id = m.external_id
+        WHERE m.inserted
+    )
+    SELECT count(*) FILTER (WHERE inserted), count(*) FILTER (WHERE NOT inserted) FROM merged
+"""
+
+# Each new posting is linked to the most similar active posting sharing an
+# LSH band, found through the GIN index. Candidates are postings that existed
+# before this batch or came earlier in it, and, as in assign_duplicates, only
+# ones whose own platform and canonical's platform differ from the new posting's.
+LINK_DUPLICATES = """
+    UPDATE {posting} p
+    SET duplicate_of_id = best.canonical_id
+    FROM (
+        SELECT DISTINCT ON (n.id) n.id, coalesce(c.duplicate_of_id, c.id) AS canonical_id
+        FROM job_import_new n
+        JOIN {posting} np ON np.id = n.id
+        JOIN {posting} c ON c.lsh_bands && np.lsh_bands AND c.is_active AND c.id <> n.id
+            AND c.source_platform <> np.source_platform
+        LEFT JOIN {posting} cc ON cc.id = c.duplicate_of_id
+        LEFT JOIN job_import_new cn ON cn.id = c.id
+        CROSS JOIN LATERAL (
+            SELECT count(*) AS agree FROM unnest(np.minhash, c.minhash) AS m(a, b) WHERE a = b
+        ) sim
+        WHERE (cn.seq IS NULL OR cn.seq < n.seq) AND sim.agree::float / %s >= %s
+            AND cc.source_platform IS DISTINCT FROM np.source_platform
+        ORDER BY n.id, sim.agree DESC, cn.seq NULLS FIRST
+    ) best
+    WHERE p.id = best.id
+"""
+
+# A posting linked to an earlier row of the same batch points at that row's canonical instead
+FLATTEN_DUPLICATES = """
+    UPDATE {posting} p
+    SET duplicate_of_id = parent.duplicate_of_id
+    FROM job_import_new n, {posting} parent
+    WHERE p.id = n.id AND parent.id = p.duplicate_of_id AND parent.duplicate_of_id IS NOT NULL
+"""
+
+
+def _open(path):
+    if path.endswith('.gz'):
+        return gzip.open(path, 'rt', encoding='utf-8', newline='')
+    return open(path, encoding='utf-8', newline='')
+
+
+def read_ndjson(path):
+    """Yield one record per line; unparseable lines yield an empty record"""
+    with _open(path) as handle:
+        for line_number, line in enumerate(handle, start=1):
+            if not line.strip():
+                continue
+            try:
+                yield json.loads(line)
+            except ValueError as e:
+                logger.warning(f"{path}:{line_number}: invalid JSON: {e}")
+                yield {}
+
+
+def read_csv(path):
+    with _open(path) as handle:
+        yield from csv.DictReader(handle)
+
+
+def read_parquet(path, batch_size=10000):
+    """Yield records a row group slice at a time"""
+    import pyarrow.parquet as pq
+
+    for batch in pq.ParquetFile(path).iter_batches(batch_size=batch_size):
+        yield from batch.to_pylist()
+
+
+READERS = {
+    'ndjson': read_ndjson,
+    'csv': read_csv,
+    'parquet': read_parquet,
+}
+
+EXTENSIONS = {
+    '.ndjson': 'ndjson',
+    '.jsonl': 'ndjson',
+    '.json': 'ndjson',
+    '.csv': 'csv',
+    '.parquet': 'parquet',
+    '.pq': 'parquet',
+}
+
+
+def detect_format(path):
+    """Guess the file format from its extension, ignoring a trailing .gz"""
+    name = path[:-3] if path.endswith('.gz') else path
+    for extension, file_format in EXTENSIONS.items():
+        if name.endswith(extension):
+            return file_format
+    return None
+
+
+def _salary(value):
+    if value in (None, ''):
+        return None
+    try:
+        amount = Decimal(str(value).replace(',', '').strip())
+    except InvalidOperation:
+        return None
+    if not amount.is_finite() or amount < 0 or amount > MAX_SALARY:
+        return None
+    return amount.quantize(Decimal('0.01'))
+
+
+def _feed_skills(value):
+    """Normalized skill names from a list, a JSON list or a ;/,/| separated string"""
+    if isinstance(value, str):
+        value = value.strip()
+        if value.startswith('['):
+            try:
+                value = json.loads(value)
+            except ValueError:
+                value = []
+        else:
+            value = value.replace(';', ',').replace('|', ',').split(',')
+    return [normalize_skill(str(skill)) for skill in value or [] if str(skill).strip()]
+
+
+def _posted_date(value):
+    if isinstance(value, datetime):
+        return value if timezone.is_aware(value) else timezone.make_aware(value)
+    return parse_posted_date(str(value) if value else None)
+
+
+def stage_record(seq, record, platform=''):
+    """Turn a feed record into a staging row, or None when it lacks required fields.
+
+    Text extraction and fingerprints are computed here, with the same
+    functions scraped ingest uses; everything that needs other rows or
+    tables is left to the set-based merge.
+    """
+    job_data = {key: value for key, value in record.items() if value not in (None, '')}
+    if platform:
+        job_data.setdefault('source_platform', platform)
+    if not all(job_data.get(field) for field in REQUIRED_FIELDS):
+        return None
+    job_data = {
+        **job_data,
+        'title': str(job_data['title']),
+        'company': str(job_data['company']).strip()[:200],
+        'source_platform': str(job_data['source_platform']),
+        'source_url': str(job_data['source_url']),
+    }
+
+    title = _clip(job_data['title'], 'title')
+    description = str(job_data.get('description', ''))
+    location = _clip(str(job_data.get('location', '')), 'location')
+    fields = extract_fields(title, description)
+    extracted_skills = [skill[:50] for skill in fields['skills_required']]
+    minhash = minhash_signature(shingles(title, job_data['company'], location, description))
+    employment_type = str(job_data.get('employment_type', '')).lower().replace('-', '_').replace(' ', '_')
+
+    return [
+        seq,
+        uuid.uuid4(),
+        title,
+        job_data['company'],
+        description,
+        str(job_data.get('requirements', '')),
+        location,
+        employment_type if employment_type in EMPLOYMENT_TYPES else 'full_time',
+        _salary(job_data.get('salary_min')),
+        _salary(job_data.get('salary_max')),
+        _feed_skills(job_data.get('skills') or job_data.get('skills_required')),
+        extracted_skills,
+        fields['experience_level'],
+        fields['remote_type'],
+        build_job_vector(title, extracted_skills, description),
+        minhash,
+        band_hashes(minhash),
+        _clip(job_data['source_platform'], 'source_platform'),
+        _clip(job_data['source_url'], 'source_url'),
+        stable_external_id(job_data),
+        _posted_date(job_data.get('posted_date')),
+    ]
+
+
+def stage_batch(batch, platform=''):
+    """Staging rows for a batch of (seq, record) pairs, dropping incomplete records"""
+    rows = (stage_record(seq, record, platform) for seq, record in batch)
+    return [row for row in rows if row is not None]
+
+
+class BulkImporter:
+    """Streams feed records through COPY into a staging table and merges them with set-based SQL.
+
+    Records are staged batch_size at a time and each batch is merged in its
+    own transaction, so memory stays flat whatever the file size and an
+    interrupted import keeps the batches it committed. Per-row text
+    extraction runs on worker processes while the database merges.
+    """
+
+    def __init__(self, platform='', batch_size=50000, processes=1):
+        self.platform = platform
+        self.batch_size = batch_size
+        self.processes = processes
+        self.threshold = getattr(settings, 'DUPLICATE_SIMILARITY_THRESHOLD', 0.6)
+        self.tables = {
+            'company': connection.ops.quote_name(Company._meta.db_table),
+            'posting': connection.ops.quote_name(JobPosting._meta.db_table),
+        }
+        self.totals = {'read': 0, 'skipped': 0, 'inserted': 0, 'updated': 0, 'duplicates': 0}
+        self.started = None
+
+    @property
+    def rate(self):
+        return self.totals['read'] / max(time.perf_counter() - self.started, 1e-9)
+
+    def summary(self):
+        return (
+            f"{self.totals['read']} read, {self.totals['inserted']} inserted, {self.totals['updated']} updated, "
+            f"{self.totals['duplicates']} duplicates, {self.totals['skipped']} skipped, {self.rate:.0f} rows/s"
+        )
+
+    def _prepare(self):
+        """Create the session tables and load the place and skill lookups"""
+        gazetteer = get_gazetteer()
+        county_ids = dict(County.objects.values_list('name', 'id'))
+        town_ids = dict(Town.objects.values_list('name', 'id'))
+        places = {
+            alias: (county, county_ids.get(county), None, False, True)
+            for alias, county in gazetteer.counties.items()
+        }
+        for alias, town in gazetteer.towns.items():
+            county = gazetteer.town_county[town]
+            places[alias] = (county, county_ids.get(county), town_ids.get(town), True, alias in places)
+
+        # Feed skill lists are explicit, so ambiguous names like "R" are matched here too
+        aliases = {}
+        for canonical, synonyms in SKILLS.items():
+            for term in [canonical] + synonyms:
+                aliases.setdefault(normalize_skill(term), canonical)
+
+        with transaction.atomic():
+            with connection.cursor() as cursor:
+                for statement in CREATE_TABLES:
+                    cursor.execute(statement)
+                cursor.execute('TRUNCATE job_import_places, job_import_skills')
+            copy_into('job_import_places', ['alias', 'county', 'county_id', 'town_id', 'is_town', 'is_county'],
+                      ([alias] + list(place) for alias, place in places.items()))
+            copy_into('job_import_skills', ['alias', 'canonical'], aliases.items())
+        return gazetteer.max_words
+
+    def _merge(self, rows, max_words):
+        with transaction.atomic():
+            staged = copy_into('job_import_staging', STAGING_COLUMNS, rows)
+            with connection.cursor() as cursor:
+                # Temp tables are never auto-analyzed; the merge plans need row counts
+                cursor.execute('ANALYZE job_import_staging')
+                cursor.execute(MERGE_COMPANIES.format(**self.tables))
+                cursor.execute(MERGE_POSTINGS.format(**self.tables), [max_words, sorted(ROAD_WORDS), EXTRACTION_VERSION])
+                inserted, updated = cursor.fetchone()
+                cursor.execute(LINK_DUPLICATES.format(**self.tables), [NUM_PERM, self.threshold])
+                duplicates = cursor.rowcount
+                # Chains only form within one batch, so they settle in a few passes
+                flattened = duplicates
+                while flattened:
+                    cursor.execute(FLATTEN_DUPLICATES.format(**self.tables))
+                    flattened = cursor.rowcount
+        self.totals['inserted'] += inserted
+        self.totals['updated'] += updated
+        self.totals['duplicates'] += duplicates
+        return staged
+
+    def _batches(self, records):
+        batch = []
+        for seq, record in enumerate(records):
+            batch.append((seq, record))
+            if len(batch) >= self.batch_size:
+                yield batch
+                batch = []
+        if batch:
+            yield batch
+
+    def _staged(self, records):
+        """Yield (rows, records read) per batch, staging batches on worker processes.
+
+        Only a few batches are in flight at once, so a fast reader cannot
+        run ahead of the database.
+        """
+        if self.processes <= 1:
+            for batch in self._batches(records):
+                yield stage_batch(batch, self.platform), len(batch)
+            return
+
+        # Workers only run the text extraction and never use the database
+        # connection, which must stay open for the session's temp tables
+        with ProcessPoolExecutor(
+            max_workers=self.processes, mp_context=multiprocessing.get_context('fork')
+        ) as executor:
+            pending = deque()
+            for batch in self._batches(records):
+                pending.append((executor.submit(stage_batch, batch, self.platform), len(batch)))
+                if len(pending) > self.processes:
+                    future, read = pending.popleft()
+                    yield future.result(), read
+            while pending:
+                future, read = pending.popleft()
+                yield future.result(), read
+
+    def run(self, records):
+        """Import records, yielding the running totals after each committed batch"""
+        self.started = time.perf_counter()
+        max_words = self._prepare()
+        for rows, read in self._staged(records):
+            self.totals['read'] += read
+            self.totals['skipped'] += read - len(rows)
+            if rows:
+                self._merge(rows, max_words)
+            yield self.totals
@@ -1,151 +1,189 @@
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from django.conf import settings
+from selenium.common.exceptions import TimeoutException
 from .base_scraper import BaseScraper
-from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
-from selenium.common.exceptions import TimeoutException, NoSuchElementException
+from .career_sites import due_career_sites, record_site_results
+from .parsing import select_all, text_of, attr_of
 import re
+import zlib
 import logging
 
 logger = logging.getLogger(__name__)
 
 class CareerPagesScraper(BaseScraper):
-    def __init__(self):
-        super().__init__()
-        # List of major Kenyan companies with career pages
-        self.company_urls = {
-            'Safaricom': 'https://www.safaricom.co.ke/careers/current-opportunities',
-            'Equity Bank': 'https://equitygroupholdings.com/careers/',
-            'KCB Group': 'https://kcbgroup.com/careers/',
-            'East African Breweries': 'https://www.eabl.com/careers',
-            'Nation Media Group': 'https://www.nationmedia.com/careers/',
-            'Bamburi Cement': 'https://www.bamburicement.co.ke/careers/',
-            'Kenya Airways': 'https://www.kenya-airways.com/en/company/careers/',
-            'Co-operative Bank': 'https://www.co-opbank.co.ke/careers/',
-            'Standard Chartered': 'https://www.sc.com/ke/careers/',
-            'Barclays Bank': 'https://www.absa.co.ke/careers/',
-        }
+    platform = 'career_page'
+    max_records_per_page = 10  # Limit to 10 jobs per company
+
+    # Tried in order on a page with no learned profile, and after a profile stops matching
+    LISTING_SELECTORS = [
+        '.job-listing',
+        '.career-opportunity',
+        '.job-opening',
+        '.position',
+        '[class*="job"]',
+        '[class*="career"]',
+        'tr[class*="job"]',
+        '.vacancy',
+    ]
+    TITLE_SELECTORS = [
+        '.job-title', '.title', 'h3', 'h4', 'h5',
+        '[class*="title"]', 'a', 'strong',
+    ]
 
     def scrape_jobs(self, search_term="", location="Kenya", max_pages=1):
-        all_jobs = []
+        """Scrape every due career site and save the selectors that worked on each"""
+        results = self.scrape_sites(due_career_sites())
+        record_site_results(results)
         
-        for company_name, career_url in self.company_urls.items():
-            logger.info(f"Scraping {company_name} career page: {career_url}")
-            
-            try:
-                jobs = self._scrape_company_jobs(company_name, career_url)
-                all_jobs.extend(jobs)
-                self.random_delay()
-            except Exception as e:
-                logger.error(f"Error scraping {company_name}: {e}")
-                continue
-        
-        return all_jobs
+        return [job for _, jobs, _, _ in results for job in jobs]
 
-    def _scrape_company_jobs(self, company_name, career_url):
-        jobs = []
-        
+    def scrape_sites(self, sites):
+        """Scrape CareerSite rows in parallel; returns (site, jobs, matched profile, error) per site"""
+        with ThreadPoolExecutor(max_workers=settings.SCRAPER_CAREER_WORKERS) as executor:
+            return list(executor.map(self._scrape_site, sites))
+
+    def _scrape_site(self, site):
+        """Fetch and parse one company's page; returns (site, jobs, matched profile, error)"""
+        logger.info(f"Scraping {site.company} career page: {site.career_url}")
+        context = {
+            'company': site.company,
+            'career_url': site.career_url,
+            'profile': {'listing': site.listing_selector, 'title': site.title_selector},
+        }
         try:
-            self.driver.get(career_url)
-            self.random_delay()
-            
-            # Different strategies for different career page structures
-            job_elements = []
-            
-            # Try common job listing selectors
-            selectors = [
-                '.job-listing',
-                '.career-opportunity',
-                '.job-opening',
-                '.position',
-                '[class*="job"]',
-                '[class*="career"]',
-                'tr[class*="job"]',
-                '.vacancy'
-            ]
-            
-            for selector in selectors:
-                try:
-                    elements = self.driver.find_elements(By.CSS_SELECTOR, selector)
-                    if elements:
-                        job_elements = elements
-                        break
-                except:
-                    continue
-            
-            # If no specific job elements found, try to extract from general content
-            if not job_elements:
-                job_elements = self._extract_from_general_content()
-            
-            for element in job_elements[:10]:  # Limit to 10 jobs per company
-                try:
-                    job_data = self._parse_company_job(element, company_name, career_url)
-                    if job_data:
-                        jobs.append(job_data)
-                except Exception as e:
-                    logger.error(f"Error parsing job from {company_name}: {e}")
-                    continue
-        
+            document = self.fetch_document(site.career_url, self._wait_selector(site), context=context)
+            jobs, matched = self.parse_site_page(document, context)
+            return site, jobs, matched, ''
         except Exception as e:
-            logger.error(f"Error accessing {company_name} career page: {e}")
+            logger.error(f"Error accessing {site.company} career page: {e}")
+            return site, [], None, str(e)
+
+    def _wait_selector(self, site):
+        """What a career page must hold before it is parsed, or None to take any page.
+
+        A page matching none of the listing selectors is most likely rendered
+        client-side, so the HTTP response is retried in the browser. Sites
+        last parsed by the text scan have no listing element to wait for.
+        """
+        if site.last_success_at and not site.listing_selector:
+            return None
+        selectors = [site.listing_selector] if site.listing_selector else []
+        selectors += [selector for selector in self.LISTING_SELECTORS if selector != site.listing_selector]
+        return ', '.join(selectors)
+
+    def _wait_for(self, wait_selector):
+        # A rendered page with no listing element still gets the text scan
+        try:
+            super()._wait_for(wait_selector)
+        except TimeoutException:
+            logger.info("No listing element rendered, scanning the page text instead")
+
+    def parse_page(self, document, context=None):
+        return self.parse_site_page(document, context)[0]
+
+    def parse_site_page(self, document, context=None):
+        """Parse a career page, trying the site's learned selectors before the generic lists.
+
+        Returns the jobs and the profile that matched this time: the listing
+        selector (empty for the text-scan fallback) and the title selector
+        that found the most titles.
+        """
+        context = context or {}
+        profile = context.get('profile') or {}
+        company_name = context.get('company', 'Unknown')
+        career_url = context.get('career_url', '')
+        
+        jobs = []
+        failures = 0
+        title_hits = Counter()
+        with self.stats.timer('parse'):
+            elements, listing_selector = self._find_listing(document, profile.get('listing'))
+            for element in elements[:self.max_records_per_page]:
+                job_data, title_selector = self._parse_company_job(
+                    element, company_name, career_url, profile.get('title')
+                )
+                if job_data:
+                    jobs.append(job_data)
+                    title_hits[title_selector] += 1
+                else:
+                    failures += 1
+        self.stats.add('cards_parsed', len(jobs))
+        self.stats.add('parse_failures', failures)
         
-        return jobs
+        matched = {
+            'listing': listing_selector,
+            'title': title_hits.most_common(1)[0][0] if title_hits else None,
+        }
+        return jobs, matched
 
-    def _extract_from_general_content(self):
-        """Try to extract job information from general page content"""
-        job_elements = []
+    def parse_listing(self, document):
+        """Find job elements on a career page using common listing selectors"""
+        return self._find_listing(document)[0]
+
+    def _find_listing(self, document, preferred=None):
+        """Return (job elements, the selector that found them); preferred is tried first"""
+        selectors = self.LISTING_SELECTORS
+        if preferred:
+            selectors = [preferred] + [selector for selector in selectors if selector != preferred]
         
-        try:
-            # Look for text that might indicate job titles
-            elements = self.driver.find_elements(By.XPATH, "//*[contains(text(), 'Manager') or contains(text(), 'Officer') or contains(text(), 'Analyst') or contains(text(), 'Developer') or contains(text(), 'Engineer')]")
-            job_elements = elements[:5]  # Limit results
-        except:
-            pass
+        for selector in selectors:
+            elements = select_all(document, selector)
+            if elements:
+                return elements, selector
         
-        return job_elements
+        # If no specific job elements found, try to extract from general content
+        return self._extract_from_general_content(document), None
+
+    def parse_record(self, card, context=None):
+        """Parse one job element; context names the company the page belongs to"""
+        context = context or {}
+        profile = context.get('profile') or {}
+        return self._parse_company_job(
+            card, context.get('company', 'Unknown'), context.get('career_url', ''), profile.get('title')
+        )[0]
 
-    def _parse_company_job(self, job_element, company_name, career_url):
+    def _extract_from_general_content(self, document):
+        """Try to extract job information from general page content"""
+        # Look for text that might indicate job titles
+        elements = document.xpath(
+            "//*[contains(text(), 'Manager') or contains(text(), 'Officer') or "
+            "contains(text(), 'Analyst') or contains(text(), 'Developer') or contains(text(), 'Engineer')]"
+        )
+        return elements[:5]  # Limit results
+
+    def _parse_company_job(self, job_element, company_name, career_url, preferred_title=None):
+        """Return (job dict or None, the title selector that matched)"""
         try:
-            # Extract job title
+            # Extract job title, starting with the selector that worked on this site last time
             title = ""
-            title_selectors = [
-                '.job-title', '.title', 'h3', 'h4', 'h5',
-                '[class*="title"]', 'a', 'strong'
-            ]
+            title_selector = None
+            selectors = self.TITLE_SELECTORS
+            if preferred_title:
+                selectors = [preferred_title] + [selector for selector in selectors if selector != preferred_title]
             
-            for selector in title_selectors:
-                try:
-                    title_elem = job_element.find_element(By.CSS_SELECTOR, selector)
-                    title = title_elem.text.strip()
-                    if title and len(title) > 5:  # Basic validation
-                        break
-                except:
-                    continue
+            for selector in selectors:
+                title = text_of(job_element, selector)
+                if title and len(title) > 5:  # Basic validation
+                    title_selector = selector
+                    break
             
             # If no title found, use the element text
             if not title:
-                title = job_element.text.strip()[:100]  # First 100 chars
+                title = text_of(job_element)[:100]  # First 100 chars
             
             # Extract description if available
-            description = ""
-            try:
-                desc_elem = job_element.find_element(By.CSS_SELECTOR, '.description, .summary, p')
-                description = desc_elem.text.strip()
-            except:
-                description = job_element.text.strip()
+            description = text_of(job_element, '.description, .summary, p') or text_of(job_element)
             
             # Extract job URL if it's a link
             job_url = career_url
-            try:
-                link_elem = job_element.find_element(By.CSS_SELECTOR, 'a')
-                href = link_elem.get_attribute('href')
-                if href and href.startswith('http'):
-                    job_url = href
-            except:
-                pass
+            href = attr_of(job_element, 'a', 'href') or job_element.get('href')
+            if href and href.startswith('http'):
+                job_url = href
             
             # Basic job data validation
             if not title or len(title.strip()) < 3:
-                return None
+                return None, None
             
             job_data = {
                 'title': title,
@@ -153,66 +191,17 @@ class CareerPagesScraper(BaseScraper):
                 'location': 'Kenya',  # Default to Kenya for local companies
                 'description': description,
                 'source_url': job_url,
-                'external_id': f"{company_name.lower().replace(' ', '_')}_{hash(title) % 10000}",
+                'external_id': f"{company_name.lower().replace(' ', '_')}_{zlib.crc32(title.encode('utf-8')):08x}",
                 'source_platform': 'career_page',
                 'employment_type': 'full_time',
-                'experience_level': self._guess_experience_level(title, description),
-                'remote_type': self._guess_remote_type(title, description),
-                'skills_required': self._extract_skills(f"{title} {description}"),
             }
             
-            return job_data
+            return job_data, title_selector
             
         except Exception as e:
             logger.error(f"Error parsing company job details: {e}")
-            return None
-
-    def _guess_experience_level(self, title, description):
-        """Guess experience level from title and description"""
-        text = f"{title} {description}".lower()
-        
-        if any(term in text for term in ['senior', 'lead', 'principal', 'head', 'director', 'manager']):
-            return 'senior'
-        elif any(term in text for term in ['junior', 'entry', 'graduate', 'trainee', 'intern']):
-            return 'entry'
-        elif any(term in text for term in ['executive', 'ceo', 'cto', 'cfo', 'vp', 'vice president']):
-            return 'executive'
-        else:
-            return 'mid'
-
-    def _guess_remote_type(self, title, description):
-        """Guess remote work type from title and description"""
-        text = f"{title} {description}".lower()
-        
-        if any(term in text for term in ['remote', 'work from home', 'wfh']):
-            return 'remote'
-        elif any(term in text for term in ['hybrid', 'flexible']):
-            return 'hybrid'
-        else:
-            return 'on_site'
-
-    def _extract_skills(self, text):
-        """Extract skills from job title and description"""
-        tech_skills = [
-            'python', 'java', 'javascript', 'react', 'angular', 'vue', 'nodejs', 'django',
-            'flask', 'spring', 'mysql', 'postgresql', 'mongodb', 'aws', 'azure', 'gcp',
-            'docker', 'kubernetes', 'git', 'jenkins', 'terraform', 'ansible',
-            'machine learning', 'data science', 'artificial intelligence', 'blockchain',
-            'devops', 'agile', 'scrum', 'project management', 'digital marketing',
-            'seo', 'content marketing', 'social media', 'graphic design', 'ui/ux',
-            'excel', 'powerpoint', 'word', 'accounting', 'finance', 'sales', 'marketing',
-            'customer service', 'human resources', 'operations', 'strategy'
-        ]
-        
-        text_lower = text.lower()
-        found_skills = []
-        
-        for skill in tech_skills:
-            if skill in text_lower:
-                found_skills.append(skill.title())
-        
-        return found_skills
+            return None, None
 
     def parse_job_details(self, job_element):
         """Required by base class - delegates to _parse_company_job"""
-        return self._parse_company_job(job_element, "Unknown", "")
+        return self._parse_company_job(job_element, "Unknown", "")[0]
@@ -0,0 +1,77 @@
+import logging
+from datetime import timedelta
+from django.conf import settings
+from django.db.models import Q
+from django.utils import timezone
+from ..jobs.models import CareerSite
+
+logger = logging.getLogger(__name__)
+
+# Seeded into CareerSite the first time career pages are scraped; add more
+# employers in the admin or with `manage.py load_career_sites`
+DEFAULT_CAREER_SITES = {
+    'Safaricom': 'https://www.safaricom.co.ke/careers/current-opportunities',
+    'Equity Bank': 'https://equitygroupholdings.com/careers/',
+    'KCB Group': 'https://kcbgroup.com/careers/',
+    'East African Breweries': 'https://www.eabl.com/careers',
+    'Nation Media Group': 'https://www.nationmedia.com/careers/',
+    'Bamburi Cement': 'https://www.bamburicement.co.ke/careers/',
+    'Kenya Airways': 'https://www.kenya-airways.com/en/company/careers/',
+    'Co-operative Bank': 'https://www.co-opbank.co.ke/careers/',
+    'Standard Chartered': 'https://www.sc.com/ke/careers/',
+    'Barclays Bank': 'https://www.absa.co.ke/careers/',
+}
+
+
+def upsert_career_sites(sites):
+    """Add or update (company, career_url) pairs and reactivate them"""
+    return CareerSite.objects.bulk_create(
+        [CareerSite(company=company[:200], career_url=career_url) for company, career_url in sites],
+        batch_size=500,
+        update_conflicts=True,
+        unique_fields=['company'],
+        update_fields=['career_url', 'is_active'],
+    )
+
+
+def due_career_sites(now=None):
+    """Active sites whose failure backoff has passed, seeding the defaults into an empty table"""
+    if not CareerSite.objects.exists():
+        upsert_career_sites(DEFAULT_CAREER_SITES.items())
+    now = now or timezone.now()
+    return list(CareerSite.objects.filter(is_active=True).filter(
+        Q(next_attempt_at__isnull=True) | Q(next_attempt_at__lte=now)
+    ))
+
+
+def record_site_results(results, now=None):
+    """Save each site's outcome: the selectors that matched, or a failure and its backoff.
+
+    results is a list of (site, jobs, matched profile, error). A site that
+    keeps failing waits SCRAPER_CAREER_BACKOFF_HOURS, doubled per failure up
+    to SCRAPER_CAREER_MAX_BACKOFF_HOURS, so dead pages stop costing every run.
+    """
+    now = now or timezone.now()
+    sites = []
+    for site, jobs, matched, error in results:
+        if jobs:
+            site.listing_selector = matched['listing'] or ''
+            site.title_selector = matched['title'] or ''
+            site.last_success_at = now
+            site.consecutive_failures = 0
+            site.next_attempt_at = None
+            site.last_error = ''
+        else:
+            site.consecutive_failures += 1
+            backoff = min(
+                settings.SCRAPER_CAREER_BACKOFF_HOURS * 2 ** (site.consecutive_failures - 1),
+                settings.SCRAPER_CAREER_MAX_BACKOFF_HOURS,
+            )
+            site.next_attempt_at = now + timedelta(hours=backoff)
+            site.last_error = error or 'No jobs found'
+        sites.append(site)
+
+    CareerSite.objects.bulk_update(sites, [
+        'listing_selector', 'title_selector', 'last_success_at',
+        'consecutive_failures', 'next_attempt_at', 'last_error',
+    ], batch_size=500)
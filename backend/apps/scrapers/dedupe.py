@@ -0,0 +1,149 @@
+import re
+import zlib
+import logging
+from collections import defaultdict
+import numpy as np
+from django.conf import settings
+from ..jobs.models import JobPosting
+
+logger = logging.getLogger(__name__)
+
+NUM_PERM = 64
+NUM_BANDS = 16
+ROWS_PER_BAND = NUM_PERM // NUM_BANDS
+MERSENNE_PRIME = (1 << 31) - 1
+SHINGLE_SIZE = 3
+
+# Platforms spell the same employer differently ("Safaricom PLC" / "Safaricom")
+COMPANY_SUFFIXES = {'plc', 'ltd', 'limited', 'inc', 'llc', 'group', 'kenya', 'co', 'company'}
+
+_rng = np.random.default_rng(1729)
+_PERM_A = _rng.integers(1, MERSENNE_PRIME, size=NUM_PERM, dtype=np.uint64)
+_PERM_B = _rng.integers(0, MERSENNE_PRIME, size=NUM_PERM, dtype=np.uint64)
+
+
+def _words(text):
+    return re.findall(r'[a-z0-9]+', (text or '').lower())
+
+
+def shingles(title, company, location, description):
+    """Build the shingle set used to fingerprint a posting"""
+    company_words = [word for word in _words(company) if word not in COMPANY_SUFFIXES]
+    features = set()
+    # Title and employer carry most of the identity of a vacancy, so they are
+    # added several times to outweigh description length differences between
+    # snippets and full descriptions
+    for copy in range(3):
+        features.update(f"t{copy}:{word}" for word in _words(title))
+        features.update(f"c{copy}:{word}" for word in company_words)
+    features.update(f"l:{word}" for word in _words(location))
+
+    words = _words(description)
+    for i in range(max(len(words) - SHINGLE_SIZE + 1, 0)):
+        features.add(' '.join(words[i:i + SHINGLE_SIZE]))
+    return features
+
+
+def minhash_signature(features):
+    """Return a NUM_PERM-long MinHash signature for a shingle set"""
+    if not features:
+        return []
+    hashes = np.fromiter(
+        (zlib.crc32(feature.encode('utf-8')) for feature in features),
+        dtype=np.uint64, count=len(features),
+    )
+    values = (np.outer(_PERM_A, hashes) + _PERM_B[:, None]) % MERSENNE_PRIME
+    return [int(value) for value in values.min(axis=1)]
+
+
+def band_hashes(signature):
+    """Hash each band of a signature into a signed 63-bit key for the LSH index"""
+    if not signature:
+        return []
+    bands = []
+    for band in range(NUM_BANDS):
+        rows = signature[band * ROWS_PER_BAND:(band + 1) * ROWS_PER_BAND]
+        key = f"{band}:" + ','.join(str(value) for value in rows)
+        # Two crc32s give a wide enough key that unrelated bands rarely collide
+        high = zlib.crc32(key.encode('utf-8'))
+        low = zlib.crc32(key[::-1].encode('utf-8'))
+        bands.append(((high << 31) ^ low) & ((1 << 62) - 1))
+    return bands
+
+
+def estimated_similarity(sig_a, sig_b):
+    """Estimate Jaccard similarity from two MinHash signatures"""
+    if not sig_a or not sig_b:
+        return 0.0
+    return sum(1 for a, b in zip(sig_a, sig_b) if a == b) / NUM_PERM
+
+
+def fingerprint_posting(posting, company_name):
+    """Fill in a posting's minhash and lsh_bands fields"""
+    posting.minhash = minhash_signature(shingles(
+        posting.title, company_name, posting.location, posting.description
+    ))
+    posting.lsh_bands = band_hashes(posting.minhash)
+
+
+def assign_duplicates(postings, company_names):
+    """Link new postings to an existing vacancy they near-duplicate.
+
+    Looks up candidates that share at least one LSH band through the GIN
+    index, in a single query for the whole batch, and also clusters
+    near-duplicates within the batch itself. Only postings from another
+    platform are linked, and only to a vacancy first seen on another
+    platform: near-identical postings on one site (the same role in two
+    towns) are separate vacancies. Returns the number of postings marked
+    as duplicates.
+    """
+    threshold = getattr(settings, 'DUPLICATE_SIMILARITY_THRESHOLD', 0.6)
+
+    for posting in postings:
+        fingerprint_posting(posting, company_names.get(posting.company_id, ''))
+
+    all_bands = {band for posting in postings for band in posting.lsh_bands}
+    if not all_bands:
+        return 0
+
+    # band -> [(posting id, canonical id, signature, platforms of the posting and its canonical)]
+    index = defaultdict(list)
+    candidates = JobPosting.objects.filter(
+        lsh_bands__overlap=list(all_bands), is_active=True
+    ).values_list('id', 'duplicate_of_id', 'minhash', 'lsh_bands', 'source_platform', 'duplicate_of__source_platform')
+    for job_id, duplicate_of_id, signature, bands, platform, canonical_platform in candidates.iterator():
+        entry = (job_id, duplicate_of_id or job_id, signature, {platform, canonical_platform or platform})
+        for band in bands:
+            if band in all_bands:
+                index[band].append(entry)
+
+    duplicates = 0
+    for posting in postings:
+        best_score, best_canonical, best_platforms = 0.0, None, None
+        seen = set()
+        for band in posting.lsh_bands:
+            for job_id, canonical_id, signature, platforms in index[band]:
+                if job_id in seen or posting.source_platform in platforms:
+                    continue
+                seen.add(job_id)
+                score = estimated_similarity(posting.minhash, signature)
+                if score > best_score:
+                    best_score, best_canonical, best_platforms = score, canonical_id, platforms
+
+        platforms = {posting.source_platform}
+        if best_canonical is not None and best_score >= threshold:
+            posting.duplicate_of_id = best_canonical
+            duplicates += 1
+            canonical_id = best_canonical
+            platforms |= best_platforms
+        else:
+            canonical_id = posting.id
+
+        # Later postings in the same batch can cluster onto this one
+        entry = (posting.id, canonical_id, posting.minhash, platforms)
+        for band in posting.lsh_bands:
+            index[band].append(entry)
+
+    if duplicates:
+        logger.info(f"Marked {duplicates} of {len(postings)} new postings as cross-platform duplicates")
+    return duplicates
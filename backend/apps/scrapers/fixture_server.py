@@ -0,0 +1,100 @@
+import re
+import threading
+import logging
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+logger = logging.getLogger(__name__)
+
+FIXTURES_DIR = Path(__file__).resolve().parent / 'bench_pages'
+
+# Request path -> recorded page served for it
+ROUTES = [
+    (re.compile(r'^/linkedin/jobs/search'), 'linkedin_search.html'),
+    (re.compile(r'^/linkedin/jobs/view/'), 'linkedin_job.html'),
+    (re.compile(r'^/indeed/jobs'), 'indeed_search.html'),
+    (re.compile(r'^/glassdoor/Job/jobs\.htm'), 'glassdoor_search.html'),
+    (re.compile(r'^/careers/'), 'career_page.html'),
+]
+
+# Absolute links in the recorded pages that scrapers follow, rewritten to the server
+ORIGIN_REWRITES = {
+    'https://ke.linkedin.com': '/linkedin',
+    'https://www.linkedin.com': '/linkedin',
+}
+
+
+class FixtureServer:
+    """Serves the recorded scraper pages from a local HTTP server in a background thread.
+
+    Use as a context manager; base_urls() gives the SCRAPER_BASE_URLS that
+    point each scraper at it.
+    """
+
+    def __init__(self, pages_dir=FIXTURES_DIR, host='127.0.0.1', port=0):
+        self.pages = {}
+        self.requests = 0
+        self.lock = threading.Lock()
+        self.httpd = ThreadingHTTPServer((host, port), self._handler())
+        self.httpd.daemon_threads = True
+        self.url = f"http://{host}:{self.httpd.server_address[1]}"
+        for page in Path(pages_dir).glob('*.html'):
+            html = page.read_text(encoding='utf-8')
+            for origin, prefix in ORIGIN_REWRITES.items():
+                html = html.replace(origin, self.url + prefix)
+            self.pages[page.name] = html.encode('utf-8')
+        self.thread = None
+
+    def _handler(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                body = server.page_for(self.path)
+                with server.lock:
+                    server.requests += 1
+                if body is None:
+                    self.send_error(404)
+                    return
+                self.send_response(200)
+                self.send_header('Content-Type', 'text/html; charset=utf-8')
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass
+
+        return Handler
+
+    def page_for(self, path):
+        for pattern, page_name in ROUTES:
+            if pattern.match(path):
+                return self.pages.get(page_name)
+        return None
+
+    def base_urls(self):
+        return {
+            'linkedin': f"{self.url}/linkedin/jobs/search",
+            'indeed': f"{self.url}/indeed/jobs",
+            'glassdoor': f"{self.url}/glassdoor/Job/jobs.htm",
+        }
+
+    def career_url(self, index):
+        return f"{self.url}/careers/{index}"
+
+    def start(self):
+        self.thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+        self.thread.start()
+        logger.info(f"Serving scraper fixtures at {self.url}")
+        return self
+
+    def stop(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc_info):
+        self.stop()
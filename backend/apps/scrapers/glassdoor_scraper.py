@@ -1,17 +1,13 @@
 from .base_scraper import BaseScraper
-from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
-from selenium.common.exceptions import TimeoutException, NoSuchElementException
+from .parsing import select_all, text_of, attr_of
+from selenium.common.exceptions import TimeoutException
 import re
 import logging
 
 logger = logging.getLogger(__name__)
 
 class GlassdoorScraper(BaseScraper):
-    def __init__(self):
-        super().__init__()
-        self.base_url = "https://www.glassdoor.com/Job/jobs.htm"
+    platform = 'glassdoor'
 
     def scrape_jobs(self, search_term="", location="Kenya", max_pages=5):
         jobs = []
@@ -22,84 +18,52 @@ class GlassdoorScraper(BaseScraper):
                 
                 logger.info(f"Scraping Glassdoor page {page + 1}: {search_url}")
                 
-                self.driver.get(search_url)
-                self.random_delay()
-                
                 # Wait for job listings
                 try:
-                    WebDriverWait(self.driver, 10).until(
-                        EC.presence_of_element_located((By.CSS_SELECTOR, "[data-test='jobListing']"))
-                    )
+                    document = self.fetch_document(search_url, wait_selector="[data-test='jobListing']")
                 except TimeoutException:
                     logger.warning(f"Timeout waiting for Glassdoor job listings on page {page + 1}")
                     continue
                 
-                # Get job cards
-                job_cards = self.driver.find_elements(By.CSS_SELECTOR, "[data-test='jobListing']")
-                
-                for card in job_cards:
-                    try:
-                        job_data = self.parse_job_details(card)
-                        if job_data:
-                            jobs.append(job_data)
-                    except Exception as e:
-                        logger.error(f"Error parsing Glassdoor job card: {e}")
-                        continue
+                page_jobs = self.parse_page(document)
+                jobs.extend(page_jobs)
                 
-                self.random_delay()
+                if self.page_mostly_known(page_jobs, self.known_ids(page_jobs)):
+                    logger.info(f"Glassdoor page {page + 1} is mostly known postings, stopping")
+                    break
         
         except Exception as e:
             logger.error(f"Error scraping Glassdoor: {e}")
         
         return jobs
 
+    def parse_listing(self, document):
+        """Return the job cards on a search results page"""
+        return select_all(document, "[data-test='jobListing']")
+
     def parse_job_details(self, job_card):
         try:
             # Extract title
-            title_element = job_card.find_element(By.CSS_SELECTOR, "[data-test='job-title']")
-            title = title_element.text.strip()
+            title = text_of(job_card, "[data-test='job-title']")
+            if not title:
+                return None
             
-            # Extract company
-            try:
-                company_element = job_card.find_element(By.CSS_SELECTOR, "[data-test='employer-name']")
-                company = company_element.text.strip()
-            except NoSuchElementException:
-                company = "Unknown"
-            
-            # Extract location
-            try:
-                location_element = job_card.find_element(By.CSS_SELECTOR, "[data-test='job-location']")
-                location = location_element.text.strip()
-            except NoSuchElementException:
-                location = "Kenya"
+            company = text_of(job_card, "[data-test='employer-name']", default="Unknown")
+            location = text_of(job_card, "[data-test='job-location']", default="Kenya")
             
             # Extract salary if available
             salary_min, salary_max = None, None
-            try:
-                salary_element = job_card.find_element(By.CSS_SELECTOR, "[data-test='detailSalary']")
-                salary_text = salary_element.text
+            salary_text = text_of(job_card, "[data-test='detailSalary']")
+            if salary_text:
                 salary_min, salary_max = self._parse_salary(salary_text)
-            except NoSuchElementException:
-                pass
             
-            # Get job URL
-            try:
-                link_element = job_card.find_element(By.CSS_SELECTOR, "[data-test='job-title'] a")
-                job_url = link_element.get_attribute('href')
-                # Extract job ID from URL
-                job_id_match = re.search(r'jobListingId=(\d+)', job_url)
-                external_id = job_id_match.group(1) if job_id_match else ""
-            except NoSuchElementException:
-                job_url = ""
-                external_id = ""
+            # Get job URL and extract job ID from it
+            job_url = attr_of(job_card, "[data-test='job-title'] a, a[data-test='job-title']", 'href')
+            job_id_match = re.search(r'jobListingId=(\d+)', job_url)
+            external_id = job_id_match.group(1) if job_id_match else ""
             
             # Extract job description snippet
-            description = ""
-            try:
-                desc_element = job_card.find_element(By.CSS_SELECTOR, "[data-test='job-desc']")
-                description = desc_element.text.strip()
-            except NoSuchElementException:
-                pass
+            description = text_of(job_card, "[data-test='job-desc']")
             
             job_data = {
                 'title': title,
@@ -112,13 +76,10 @@ class GlassdoorScraper(BaseScraper):
                 'salary_min': salary_min,
                 'salary_max': salary_max,
                 'employment_type': 'full_time',
-                'experience_level': 'mid',
-                'remote_type': 'on_site',
-                'skills_required': self._extract_skills(description),
             }
             
             return job_data
-            
+        
         except Exception as e:
             logger.error(f"Error parsing Glassdoor job details: {e}")
             return None
@@ -143,23 +104,3 @@ class GlassdoorScraper(BaseScraper):
                 pass
         
         return salary_min, salary_max
-
-    def _extract_skills(self, text):
-        """Extract skills from job description"""
-        tech_skills = [
-            'python', 'java', 'javascript', 'react', 'angular', 'vue', 'nodejs', 'django',
-            'flask', 'spring', 'mysql', 'postgresql', 'mongodb', 'aws', 'azure', 'gcp',
-            'docker', 'kubernetes', 'git', 'jenkins', 'terraform', 'ansible',
-            'machine learning', 'data science', 'artificial intelligence', 'blockchain',
-            'devops', 'agile', 'scrum', 'project management', 'digital marketing',
-            'seo', 'content marketing', 'social media', 'graphic design', 'ui/ux'
-        ]
-        
-        text_lower = text.lower()
-        found_skills = []
-        
-        for skill in tech_skills:
-            if skill in text_lower:
-                found_skills.append(skill.title())
-        
-        return found_skills
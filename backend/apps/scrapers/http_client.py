@@ -0,0 +1,87 @@
+import random
+import threading
+import logging
+from contextlib import contextmanager
+from urllib.parse import urlsplit
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from django.conf import settings
+
+logger = logging.getLogger(__name__)
+
+
+class HttpClient:
+    """Pooled keep-alive HTTP client for server-rendered job pages"""
+
+    def __init__(self, pool_size=10, timeout=15, retries=2):
+        self.timeout = timeout
+        self.session = requests.Session()
+        adapter = HTTPAdapter(
+            pool_connections=pool_size,
+            pool_maxsize=pool_size,
+            max_retries=Retry(
+                total=retries,
+                backoff_factor=0.5,
+                status_forcelist=[429, 500, 502, 503, 504],
+                allowed_methods=['GET'],
+            ),
+        )
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+        self.session.headers.update({
+            'User-Agent': random.choice(settings.USER_AGENT_LIST),
+            'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8',
+            'Accept-Language': 'en-US,en;q=0.9',
+        })
+
+    def get_html(self, url):
+        """Fetch a page and return its decoded HTML"""
+        response = self.session.get(url, timeout=self.timeout)
+        response.raise_for_status()
+        return response.text
+
+    def close(self):
+        self.session.close()
+
+
+_client = None
+_client_lock = threading.Lock()
+
+
+def get_http_client():
+    """Return this process's shared HTTP client"""
+    global _client
+    with _client_lock:
+        if _client is None:
+            _client = HttpClient(
+                pool_size=settings.SCRAPER_HTTP_POOL_SIZE,
+                timeout=settings.SCRAPER_HTTP_TIMEOUT,
+            )
+    return _client
+
+
+_domain_slots = {}
+_domain_slots_lock = threading.Lock()
+
+
+def domain_setting(table, domain):
+    """Look up a per-domain setting, matching subdomains and falling back to 'default'"""
+    for suffix, value in table.items():
+        if domain == suffix or domain.endswith(f".{suffix}"):
+            return value
+    return table.get('default')
+
+
+@contextmanager
+def domain_slot(url):
+    """Hold one of the per-domain concurrent request slots while fetching url"""
+    domain = urlsplit(url).hostname or ''
+    with _domain_slots_lock:
+        semaphore = _domain_slots.get(domain)
+        if semaphore is None:
+            semaphore = _domain_slots[domain] = threading.BoundedSemaphore(
+                domain_setting(settings.SCRAPER_DOMAIN_CONCURRENCY, domain) or 2
+            )
+    with semaphore:
+        yield
@@ -0,0 +1,244 @@
+import zlib
+import logging
+from datetime import datetime, timedelta
+from django.db import transaction
+from django.utils import timezone
+from ..jobs.models import JobPosting, Company
+from ..jobs.gazetteer import get_gazetteer
+from ..jobs.extraction import EXTRACTION_VERSION, extract_fields
+from ..analytics.similarity import build_job_vector
+from .dedupe import assign_duplicates
+from .seen_index import get_seen_index
+
+logger = logging.getLogger(__name__)
+
+BULK_BATCH_SIZE = 500
+REQUIRED_FIELDS = ('title', 'company', 'source_platform', 'source_url')
+# Parser-derived columns rewritten when archived pages are re-parsed. posted_date
+# is left alone: relative dates ("3 days ago") would be re-read against today.
+# bulk_update skips auto_now, so last_updated is set by hand for index syncs
+REFRESH_FIELDS = [
+    'title', 'company', 'description', 'requirements', 'location', 'county', 'county_ref',
+    'town', 'remote_type', 'employment_type', 'experience_level', 'salary_min', 'salary_max',
+    'skills_required', 'extraction_version', 'feature_vector', 'source_url', 'last_updated',
+]
+
+
+def _max_length(field_name):
+    return JobPosting._meta.get_field(field_name).max_length
+
+
+def _clip(value, field_name):
+    """Trim a string to the column width so one long value cannot fail a batch"""
+    return (value or '')[:_max_length(field_name)]
+
+
+def stable_external_id(job_data):
+    """Return the posting's external id, deriving a stable one when missing"""
+    external_id = job_data.get('external_id')
+    if external_id:
+        return _clip(str(external_id), 'external_id')
+    key = f"{job_data['company']}|{job_data['title']}|{job_data['source_url']}"
+    return f"h{zlib.crc32(key.encode('utf-8')):08x}"
+
+
+def extract_county(location):
+    """Extract county from location string"""
+    return get_gazetteer().match(location).county or ''
+
+
+def parse_posted_date(date_str):
+    """Parse posted date string to datetime"""
+    if not date_str:
+        return timezone.now()
+
+    try:
+        # Handle different date formats
+        if 'ago' in date_str.lower():
+            return timezone.now() - timedelta(days=1)
+        else:
+            return datetime.fromisoformat(date_str.replace('Z', '+00:00'))
+    except:
+        return timezone.now()
+
+
+def _resolve_companies(jobs):
+    """Create missing companies in one statement and return a name -> id map"""
+    locations = {}
+    for job_data in jobs:
+        locations.setdefault(job_data['company'], job_data.get('location', ''))
+
+    Company.objects.bulk_create(
+        [Company(name=name, location=location[:100]) for name, location in locations.items()],
+        ignore_conflicts=True,
+        batch_size=BULK_BATCH_SIZE,
+    )
+    return dict(Company.objects.filter(name__in=locations).values_list('name', 'id'))
+
+
+def _build_posting(job_data, external_id, company_id):
+    gazetteer = get_gazetteer()
+    # Rule-based fields come from the same extractor that backfill_extraction runs
+    fields = extract_fields(job_data['title'], job_data.get('description', ''))
+    skills_required = [skill[:50] for skill in fields['skills_required']]
+    county, county_id, town_id = gazetteer.resolve_ids(job_data.get('location', ''))
+
+    return JobPosting(
+        title=_clip(job_data['title'], 'title'),
+        company_id=company_id,
+        description=job_data.get('description', ''),
+        requirements=job_data.get('requirements', ''),
+        location=_clip(job_data.get('location', ''), 'location'),
+        county=county,
+        county_ref_id=county_id,
+        town_id=town_id,
+        remote_type=fields['remote_type'],
+        employment_type=job_data.get('employment_type', 'full_time'),
+        experience_level=fields['experience_level'],
+        salary_min=job_data.get('salary_min'),
+        salary_max=job_data.get('salary_max'),
+        skills_required=skills_required,
+        extraction_version=EXTRACTION_VERSION,
+        feature_vector=build_job_vector(
+            job_data['title'], skills_required, job_data.get('description', '')
+        ),
+        source_platform=_clip(job_data['source_platform'], 'source_platform'),
+        source_url=_clip(job_data['source_url'], 'source_url'),
+        external_id=external_id,
+        posted_date=parse_posted_date(job_data.get('posted_date')),
+    )
+
+
+def _drop_conflicting(postings):
+    """Return the postings the upsert actually inserted and how many it did not.
+
+    A concurrent task can insert the same (platform, external id) first; ON
+    CONFLICT then only touched that row, so the client-side id was never
+    written. Postings linked as duplicates of such a row are pointed at the
+    stored one instead.
+    """
+    written = set(JobPosting.objects.filter(id__in=[posting.id for posting in postings]).values_list('id', flat=True))
+    lost = [posting for posting in postings if posting.id not in written]
+    if not lost:
+        return postings, 0
+
+    stored = {
+        (platform, external_id): job_id
+        for job_id, platform, external_id in JobPosting.objects.filter(
+            source_platform__in={posting.source_platform for posting in lost},
+            external_id__in={posting.external_id for posting in lost},
+        ).values_list('id', 'source_platform', 'external_id')
+    }
+    replaced = {posting.id: stored.get((posting.source_platform, posting.external_id)) for posting in lost}
+    inserted = [posting for posting in postings if posting.id in written]
+    relinked = [posting for posting in inserted if posting.duplicate_of_id in replaced]
+    for posting in relinked:
+        posting.duplicate_of_id = replaced[posting.duplicate_of_id]
+    if relinked:
+        JobPosting.objects.bulk_update(relinked, ['duplicate_of'], batch_size=BULK_BATCH_SIZE)
+    return inserted, len(lost)
+
+
+def ingest_job_postings(jobs_data, refresh=False):
+    """Upsert a batch of scraped jobs and return inserted/updated counts.
+
+    Companies are resolved in bulk, postings already known by
+    (source_platform, external_id) are refreshed with a single UPDATE and
+    the rest are fingerprinted for cross-platform duplicates, then inserted
+    with ON CONFLICT so concurrent tasks cannot create duplicates.
+    Everything runs in one transaction. The inserted postings are returned
+    under new_postings for the change feed, and the ids of known postings
+    that were inactive under reactivated.
+
+    With refresh=True (re-parsing archived pages) known postings get their
+    parsed fields rewritten instead of being marked as seen again. Nothing
+    is inserted: postings with no stored row are only counted under unknown,
+    so old archives cannot bring back postings that cleanup removed.
+    """
+    rows = {}
+    skipped = 0
+    for job_data in jobs_data:
+        if not all(job_data.get(field) for field in REQUIRED_FIELDS):
+            skipped += 1
+            continue
+        job_data = {**job_data, 'company': job_data['company'][:200]}
+        key = (_clip(job_data['source_platform'], 'source_platform'), stable_external_id(job_data))
+        rows[key] = job_data  # later duplicates in the same batch win
+
+    result = {'inserted': 0, 'updated': 0, 'duplicates': 0, 'skipped': skipped, 'new_postings': [], 'reactivated': []}
+    if not rows:
+        return result
+
+    platforms = {platform for platform, _ in rows}
+    external_ids = {external_id for _, external_id in rows}
+
+    with transaction.atomic():
+        existing = {}
+        inactive = []
+        for job_id, platform, external_id, is_active in JobPosting.objects.filter(
+            source_platform__in=platforms, external_id__in=external_ids
+        ).values_list('id', 'source_platform', 'external_id', 'is_active'):
+            if (platform, external_id) in rows:
+                existing[platform, external_id] = job_id
+                if not is_active:
+                    inactive.append(job_id)
+
+        # A refresh writes only stored rows, so it creates no employers either
+        company_ids = _resolve_companies([rows[key] for key in existing] if refresh else rows.values())
+
+        if refresh:
+            now = timezone.now()
+            postings = []
+            for key, job_id in existing.items():
+                job_data = rows[key]
+                posting = _build_posting(job_data, key[1], company_ids[job_data['company']])
+                posting.id = job_id
+                posting.last_updated = now
+                postings.append(posting)
+            JobPosting.objects.bulk_update(postings, REFRESH_FIELDS, batch_size=BULK_BATCH_SIZE)
+            result['updated'] = len(postings)
+            result['unknown'] = len(rows) - len(existing)
+            return result
+
+        if existing:
+            result['updated'] = JobPosting.objects.filter(id__in=existing.values()).update(
+                last_updated=timezone.now(), is_active=True
+            )
+            result['reactivated'] = inactive
+
+        new_postings = [
+            _build_posting(job_data, external_id, company_ids[job_data['company']])
+            for (platform, external_id), job_data in rows.items()
+            if (platform, external_id) not in existing
+        ]
+        if new_postings:
+            company_names = {company_id: name for name, company_id in company_ids.items()}
+            assign_duplicates(new_postings, company_names)
+            JobPosting.objects.bulk_create(
+                new_postings,
+                batch_size=BULK_BATCH_SIZE,
+                update_conflicts=True,
+                unique_fields=['source_platform', 'external_id'],
+                update_fields=['last_updated', 'is_active'],
+            )
+            new_postings, lost = _drop_conflicting(new_postings)
+            result['updated'] += lost
+        result['inserted'] = len(new_postings)
+        result['duplicates'] = sum(1 for posting in new_postings if posting.duplicate_of_id)
+        result['new_postings'] = new_postings
+
+    # Let the next run skip detail pages and stop paging on these postings
+    seen_index = get_seen_index()
+    for platform in platforms:
+        seen_index.add(platform, [external_id for key, external_id in rows if key == platform])
+
+    return result
+
+
+def changed_skills(new_postings, job_ids):
+    """Skills of the new postings plus those of the stored postings in job_ids"""
+    skills = {skill for posting in new_postings for skill in posting.skills_required}
+    if job_ids:
+        for skill_list in JobPosting.objects.filter(id__in=job_ids).values_list('skills_required', flat=True):
+            skills.update(skill_list)
+    return skills
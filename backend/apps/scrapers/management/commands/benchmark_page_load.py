@@ -0,0 +1,77 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from selenium.common.exceptions import WebDriverException
+from ...linkedin_scraper import LinkedInScraper
+from ...indeed_scraper import IndeedScraper
+from ...glassdoor_scraper import GlassdoorScraper
+
+# (label, scraper class, listing URL, selector the scraper waits for)
+PAGES = [
+    ('linkedin', LinkedInScraper,
+     'https://www.linkedin.com/jobs/search?keywords=software%20engineer&location=Kenya',
+     '.jobs-search__results-list'),
+    ('indeed', IndeedScraper, 'https://ke.indeed.com/jobs?q=software+engineer&l=Nairobi', '[data-jk]'),
+    ('glassdoor', GlassdoorScraper,
+     'https://www.glassdoor.com/Job/jobs.htm?sc.keyword=software%20engineer&locT=C&locId=115',
+     "[data-test='jobListing']"),
+]
+
+
+class Command(BaseCommand):
+    help = 'Compare per-page load time and bytes transferred across Chrome resource profiles'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--profiles', nargs='+', default=['full', 'lean'],
+            help='SCRAPER_BROWSER_PROFILES entries to compare; the first is the baseline',
+        )
+        parser.add_argument('--repeat', type=int, default=3, help='Loads per page and profile')
+        parser.add_argument('--page', choices=[label for label, _, _, _ in PAGES], help='Only this listing page')
+
+    def handle(self, *args, **options):
+        unknown = set(options['profiles']) - set(settings.SCRAPER_BROWSER_PROFILES)
+        if unknown:
+            raise CommandError(f"Unknown browser profiles: {', '.join(sorted(unknown))}")
+        pages = [page for page in PAGES if options['page'] in (None, page[0])]
+
+        self.stdout.write(
+            f"{'page':<11}{'profile':<9}{'load ms':>10}{'KB':>10}{'requests':>10}{'blocked':>9}"
+            f"{'time x':>8}{'bytes x':>9}"
+        )
+        for label, scraper_class, url, wait_selector in pages:
+            baseline = None
+            for profile in options['profiles']:
+                result = self._measure(scraper_class, profile, url, wait_selector, options['repeat'])
+                if result is None:
+                    self.stderr.write(f"{label} with {profile} profile: no page loaded")
+                    continue
+                baseline = baseline or result
+                self.stdout.write(
+                    f"{label:<11}{profile:<9}{result['ms']:>10.0f}{result['bytes'] / 1024:>10.0f}"
+                    f"{result['requests']:>10.0f}{result['blocked']:>9.0f}"
+                    f"{baseline['ms'] / result['ms']:>8.2f}{baseline['bytes'] / max(result['bytes'], 1):>9.2f}"
+                )
+
+    def _measure(self, scraper_class, profile, url, wait_selector, repeat):
+        """Average load time and transfer for one page, each load in a fresh browser"""
+        totals = {'ms': 0.0, 'bytes': 0, 'requests': 0, 'blocked': 0}
+        loads = 0
+        for _ in range(repeat):
+            # A fresh browser per load so every run starts with a cold cache
+            scraper = scraper_class(use_pool=False, fetch_backend='browser', incremental=False, browser_profile=profile)
+            scraper.archive = None
+            try:
+                scraper.fetch_document(url, wait_selector=wait_selector)
+            except WebDriverException as e:
+                self.stderr.write(f"{url} with {profile} profile: {e.msg}")
+                continue
+            finally:
+                scraper.close()
+            loads += 1
+            totals['ms'] += scraper.stats.seconds['page_load'] * 1000
+            for key in ('bytes', 'requests', 'blocked'):
+                totals[key] += scraper.last_transfer[key]
+
+        if not loads:
+            return None
+        return {key: value / loads for key, value in totals.items()}
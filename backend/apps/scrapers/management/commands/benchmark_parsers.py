@@ -0,0 +1,106 @@
+import time
+from pathlib import Path
+from django.core.management.base import BaseCommand
+from selenium.webdriver.common.by import By
+from selenium.common.exceptions import NoSuchElementException, WebDriverException
+from ...browser_pool import build_chrome_driver
+from ...parsing import parse_html
+from ...linkedin_scraper import LinkedInScraper
+from ...indeed_scraper import IndeedScraper
+from ...glassdoor_scraper import GlassdoorScraper
+from ...career_pages_scraper import CareerPagesScraper
+
+PAGES_DIR = Path(__file__).resolve().parents[2] / 'bench_pages'
+
+# (page, scraper class, card selector, fields the old find_element code read per card)
+CASES = [
+    ('linkedin_search.html', LinkedInScraper, '.base-card.relative', [
+        '.base-search-card__title', '.base-search-card__subtitle',
+        '.job-search-card__location', '.base-card__full-link', '.job-search-card__listdate',
+    ]),
+    ('linkedin_job.html', LinkedInScraper, '.show-more-less-html__markup', []),
+    ('indeed_search.html', IndeedScraper, '[data-jk]', [
+        "[data-testid='job-title'] a", "[data-testid='company-name']",
+        "[data-testid='job-location']", "[data-testid='attribute_snippet_testid']",
+        "[data-testid='job-snippet']",
+    ]),
+    ('glassdoor_search.html', GlassdoorScraper, "[data-test='jobListing']", [
+        "[data-test='job-title']", "[data-test='employer-name']", "[data-test='job-location']",
+        "[data-test='detailSalary']", "[data-test='job-title'] a", "[data-test='job-desc']",
+    ]),
+    ('career_page.html', CareerPagesScraper, '.job-listing', [
+        '.job-title', '.description, .summary, p', 'a',
+    ]),
+]
+
+
+def parse_page(scraper, page_name, document):
+    """Run a scraper's HTML parsers over a fixture page and return the records"""
+    if page_name == 'linkedin_job.html':
+        return [scraper.parse_detail(document)]
+    return scraper.parse_page(
+        document, {'company': 'Benchmark Ltd', 'career_url': 'https://careers.example.co.ke/'}
+    )
+
+
+class Command(BaseCommand):
+    help = 'Compare HTTP+lxml and Selenium parsing speed on saved scraper pages'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--iterations', type=int, default=50)
+        parser.add_argument(
+            '--skip-browser', action='store_true',
+            help='Only benchmark the lxml path (no Chrome needed)',
+        )
+
+    def handle(self, *args, **options):
+        iterations = options['iterations']
+        driver = None
+        if not options['skip_browser']:
+            try:
+                driver = build_chrome_driver(headless=True)
+            except WebDriverException as e:
+                self.stderr.write(f"Chrome unavailable, benchmarking lxml only: {e}")
+
+        self.stdout.write(f"{'page':<24}{'records':>8}{'lxml ms':>10}{'selenium ms':>13}{'speedup':>9}")
+        try:
+            for page_name, scraper_class, card_selector, fields in CASES:
+                scraper = scraper_class(use_pool=False, fetch_backend='http')
+                html = (PAGES_DIR / page_name).read_text(encoding='utf-8')
+
+                records = []
+                start = time.perf_counter()
+                for _ in range(iterations):
+                    records = parse_page(scraper, page_name, parse_html(html, base_url='https://example.com/'))
+                lxml_ms = (time.perf_counter() - start) * 1000 / iterations
+
+                selenium_ms = None
+                if driver is not None:
+                    selenium_ms = self._time_selenium(driver, page_name, card_selector, fields, iterations)
+
+                if selenium_ms is None:
+                    self.stdout.write(f"{page_name:<24}{len(records):>8}{lxml_ms:>10.2f}{'-':>13}{'-':>9}")
+                else:
+                    self.stdout.write(
+                        f"{page_name:<24}{len(records):>8}{lxml_ms:>10.2f}"
+                        f"{selenium_ms:>13.2f}{selenium_ms / lxml_ms:>8.1f}x"
+                    )
+        finally:
+            if driver is not None:
+                driver.quit()
+
+    def _time_selenium(self, driver, page_name, card_selector, fields, iterations):
+        """Time the old WebDriver path: one find_element round trip per field per card"""
+        driver.get((PAGES_DIR / page_name).as_uri())
+        runs = max(1, iterations // 10)  # WebDriver calls are slow, keep the run short
+        start = time.perf_counter()
+        for _ in range(runs):
+            for card in driver.find_elements(By.CSS_SELECTOR, card_selector):
+                if not fields:
+                    card.text
+                for selector in fields:
+                    try:
+                        card.find_element(By.CSS_SELECTOR, selector).text
+                    except NoSuchElementException:
+                        pass
+        return (time.perf_counter() - start) * 1000 / runs
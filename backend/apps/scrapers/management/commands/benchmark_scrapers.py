@@ -0,0 +1,143 @@
+import json
+import time
+import tracemalloc
+from django.core.management.base import BaseCommand, CommandError
+from ....jobs.models import CareerSite
+from ...fixture_server import FixtureServer
+from ...rate_limit import NullRateLimiter, get_rate_limiter, set_rate_limiter
+from ...linkedin_scraper import LinkedInScraper
+from ...indeed_scraper import IndeedScraper
+from ...glassdoor_scraper import GlassdoorScraper
+from ...career_pages_scraper import CareerPagesScraper
+
+SCRAPERS = [
+    ('linkedin', LinkedInScraper),
+    ('indeed', IndeedScraper),
+    ('glassdoor', GlassdoorScraper),
+    ('career_page', CareerPagesScraper),
+]
+
+# Compared against a saved baseline: (metric, True when higher is better)
+TRACKED_METRICS = [('pages_per_second', True), ('parse_ms_per_card', False), ('peak_kb', False)]
+
+
+class Command(BaseCommand):
+    help = 'Benchmark the scrapers end to end against recorded pages served from a local HTTP server'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--iterations', type=int, default=5, help='Scrape runs per scraper')
+        parser.add_argument('--max-pages', type=int, default=3, help='Results pages per search scrape')
+        parser.add_argument('--companies', type=int, default=20, help='Career sites served for CareerPagesScraper')
+        parser.add_argument('--backend', choices=['http', 'browser'], default='http')
+        parser.add_argument('--platform', choices=[name for name, _ in SCRAPERS], help='Only this scraper')
+        parser.add_argument('--save', help='Write the results to this JSON file')
+        parser.add_argument('--baseline', help='JSON file from --save to compare against')
+        parser.add_argument(
+            '--tolerance', type=float, default=0.2,
+            help='Allowed fractional regression against the baseline before the command fails',
+        )
+
+    def handle(self, *args, **options):
+        # Benchmark mode: the fixture server needs no politeness delays
+        previous_limiter = get_rate_limiter()
+        set_rate_limiter(NullRateLimiter())
+
+        results = {}
+        try:
+            with FixtureServer() as server:
+                for name, scraper_class in SCRAPERS:
+                    if options['platform'] in (None, name):
+                        results[name] = self._benchmark(server, name, scraper_class, options)
+        finally:
+            set_rate_limiter(previous_limiter)
+
+        self.stdout.write(
+            f"{'scraper':<13}{'pages':>7}{'cards':>7}{'pages/s':>10}{'load ms/page':>14}"
+            f"{'parse ms/card':>15}{'peak KB':>10}"
+        )
+        for name, result in results.items():
+            self.stdout.write(
+                f"{name:<13}{result['pages']:>7}{result['cards']:>7}{result['pages_per_second']:>10.1f}"
+                f"{result['load_ms_per_page']:>14.2f}{result['parse_ms_per_card']:>15.3f}{result['peak_kb']:>10.0f}"
+            )
+
+        if options['save']:
+            with open(options['save'], 'w', encoding='utf-8') as handle:
+                json.dump(results, handle, indent=2)
+        if options['baseline']:
+            self._compare(results, options['baseline'], options['tolerance'])
+
+    def _scraper(self, server, name, scraper_class, options):
+        scraper = scraper_class(
+            use_pool=False, fetch_backend=options['backend'], incremental=False,
+            base_url=server.base_urls().get(name),
+        )
+        scraper.archive = None
+        return scraper
+
+    def _scrape(self, scraper, name, sites, options):
+        if name == 'career_page':
+            return [job for _, jobs, _, _ in scraper.scrape_sites(sites) for job in jobs]
+        return scraper.scrape_jobs('software engineer', 'Nairobi', options['max_pages'])
+
+    def _benchmark(self, server, name, scraper_class, options):
+        """Time the scraper's runs, then one more run under tracemalloc for peak memory"""
+        sites = [
+            CareerSite(company=f"Fixture Company {index}", career_url=server.career_url(index))
+            for index in range(options['companies'])
+        ]
+        pages = cards = 0
+        wall = load = parse = 0.0
+        for _ in range(options['iterations']):
+            scraper = self._scraper(server, name, scraper_class, options)
+            start = time.perf_counter()
+            try:
+                self._scrape(scraper, name, sites, options)
+            finally:
+                scraper.close()
+            wall += time.perf_counter() - start
+            pages += scraper.stats.counts['pages_fetched']
+            cards += scraper.stats.counts['cards_parsed']
+            load += scraper.stats.seconds['page_load']
+            parse += scraper.stats.seconds['parse']
+
+        scraper = self._scraper(server, name, scraper_class, options)
+        tracemalloc.start()
+        try:
+            self._scrape(scraper, name, sites, options)
+            peak = tracemalloc.get_traced_memory()[1]
+        finally:
+            tracemalloc.stop()
+            scraper.close()
+
+        return {
+            'pages': pages,
+            'cards': cards,
+            'pages_per_second': pages / wall if wall else 0,
+            'load_ms_per_page': load * 1000 / pages if pages else 0,
+            'parse_ms_per_card': parse * 1000 / cards if cards else 0,
+            'peak_kb': peak / 1024,
+        }
+
+    def _compare(self, results, baseline_path, tolerance):
+        try:
+            with open(baseline_path, encoding='utf-8') as handle:
+                baseline = json.load(handle)
+        except (OSError, ValueError) as e:
+            raise CommandError(f"Could not read baseline {baseline_path}: {e}")
+
+        regressions = []
+        for name, result in results.items():
+            for metric, higher_is_better in TRACKED_METRICS:
+                before = baseline.get(name, {}).get(metric)
+                if not before:
+                    continue
+                change = (result[metric] - before) / before
+                if higher_is_better:
+                    change = -change
+                if change > tolerance:
+                    regressions.append(f"{name} {metric}: {before:.2f} -> {result[metric]:.2f}")
+
+        if regressions:
+            raise CommandError('Regressed against baseline:\n' + '\n'.join(regressions))
+        self.stdout.write(self.style.SUCCESS(f"Within {tolerance:.0%} of baseline {baseline_path}"))
@@ -0,0 +1,41 @@
+import os
+import multiprocessing
+from django.core.management.base import BaseCommand, CommandError
+from ...bulk_import import READERS, BulkImporter, detect_format
+
+
+class Command(BaseCommand):
+    help = 'Bulk import job postings from NDJSON, CSV or Parquet files through COPY and a set-based merge'
+
+    def add_arguments(self, parser):
+        parser.add_argument('files', nargs='+', help='Files to import; .gz is allowed for NDJSON and CSV')
+        parser.add_argument('--format', choices=sorted(READERS), help='Defaults to the file extension')
+        parser.add_argument(
+            '--platform', default='',
+            help='source_platform for records that do not name one, e.g. the partner feed name',
+        )
+        parser.add_argument('--batch-size', type=int, default=50000, help='Rows staged and merged per transaction')
+        parser.add_argument(
+            '--processes', type=int, default=multiprocessing.cpu_count(),
+            help='Worker processes for text extraction and fingerprinting',
+        )
+
+    def handle(self, *args, **options):
+        for path in options['files']:
+            if not os.path.exists(path):
+                raise CommandError(f"{path} does not exist")
+            file_format = options['format'] or detect_format(path)
+            if file_format is None:
+                raise CommandError(f"Cannot tell the format of {path}; pass --format")
+
+            try:
+                records = READERS[file_format](path)
+                importer = BulkImporter(options['platform'], options['batch_size'], options['processes'])
+                for _ in importer.run(records):
+                    self.stdout.write(f"{path}: {importer.summary()}")
+            except ImportError as e:
+                raise CommandError(f"Reading {file_format} files needs pyarrow: {e}")
+            except (OSError, UnicodeDecodeError) as e:
+                raise CommandError(f"Could not read {path}: {e}")
+
+            self.stdout.write(self.style.SUCCESS(f"Imported {path}: {importer.summary()}"))
@@ -0,0 +1,30 @@
+import csv
+from django.core.management.base import BaseCommand, CommandError
+from ...career_sites import DEFAULT_CAREER_SITES, upsert_career_sites
+
+
+class Command(BaseCommand):
+    help = 'Add or update company career pages for the career page scraper'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            'csv_file', nargs='?',
+            help='CSV with company and career_url columns; omit to load the built-in sites',
+        )
+
+    def handle(self, *args, **options):
+        if not options['csv_file']:
+            sites = list(DEFAULT_CAREER_SITES.items())
+        else:
+            try:
+                with open(options['csv_file'], newline='', encoding='utf-8') as handle:
+                    sites = [
+                        (row['company'].strip(), row['career_url'].strip())
+                        for row in csv.DictReader(handle)
+                        if row.get('company') and row.get('career_url')
+                    ]
+            except (OSError, KeyError) as e:
+                raise CommandError(f"Could not read {options['csv_file']}: {e}")
+
+        upsert_career_sites(sites)
+        self.stdout.write(self.style.SUCCESS(f"Loaded {len(sites)} career sites"))
@@ -0,0 +1,129 @@
+import time
+import logging
+import multiprocessing
+from datetime import timedelta
+from concurrent.futures import ProcessPoolExecutor
+from django.core.management.base import BaseCommand
+from django.db import connections
+from django.utils import timezone
+from ....jobs.models import ArchivedPage
+from ...archive import get_blob_store
+from ...parsing import parse_html
+from ...ingest import ingest_job_postings
+from ...linkedin_scraper import LinkedInScraper
+from ...indeed_scraper import IndeedScraper
+from ...glassdoor_scraper import GlassdoorScraper
+from ...career_pages_scraper import CareerPagesScraper
+
+SCRAPERS = {
+    'linkedin': LinkedInScraper,
+    'indeed': IndeedScraper,
+    'glassdoor': GlassdoorScraper,
+    'career_page': CareerPagesScraper,
+}
+
+logger = logging.getLogger(__name__)
+
+# Scrapers are built once per worker process
+_scrapers = {}
+
+
+def _scraper_for(platform):
+    if platform not in _scrapers:
+        _scrapers[platform] = SCRAPERS[platform](use_pool=False, fetch_backend='http', incremental=False)
+    return _scrapers[platform]
+
+
+def reparse_pages(pages):
+    """Run the current parsers over a chunk of archived pages (in a worker process).
+
+    Returns (listing records, {detail url: detail fields}, unreadable page count).
+    A page that cannot be read or parsed is counted and skipped, so one bad
+    capture does not abort the whole run.
+    """
+    store = get_blob_store()
+    records, details, failed = [], {}, 0
+    for url, platform, page_type, content_hash, context in pages:
+        try:
+            document = parse_html(store.get(content_hash), base_url=url)
+            scraper = _scraper_for(platform)
+            if page_type == 'detail':
+                details[url] = scraper.parse_detail(document)
+            else:
+                records.extend(scraper.parse_page(document, context))
+        except Exception as e:
+            logger.warning(f"Could not re-parse {url}: {e}")
+            failed += 1
+    return records, details, failed
+
+
+class Command(BaseCommand):
+    help = 'Re-run the current scraper parsers over archived pages and re-ingest the results'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--platform', choices=sorted(SCRAPERS), help='Only re-parse this platform')
+        parser.add_argument(
+            '--days', type=int,
+            help='Only re-parse listing pages fetched in the last N days (detail pages are always used)',
+        )
+        parser.add_argument('--processes', type=int, default=multiprocessing.cpu_count())
+        parser.add_argument('--chunk-size', type=int, default=200, help='Pages per worker task')
+
+    def handle(self, *args, **options):
+        pages = ArchivedPage.objects.filter(platform__in=SCRAPERS)
+        if options['platform']:
+            pages = pages.filter(platform=options['platform'])
+        listings = pages.filter(page_type='listing')
+        if options['days']:
+            listings = listings.filter(fetched_at__gte=timezone.now() - timedelta(days=options['days']))
+
+        # Only the newest capture of each URL; detail pages first so LinkedIn
+        # summaries can be joined with their descriptions as listings stream in
+        rows = []
+        for queryset in (pages.filter(page_type='detail'), listings):
+            rows.extend(
+                queryset.order_by('url', '-fetched_at').distinct('url')
+                .values_list('url', 'platform', 'page_type', 'content_hash', 'context')
+            )
+        chunk_size = options['chunk_size']
+        chunks = [rows[i:i + chunk_size] for i in range(0, len(rows), chunk_size)]
+        self.stdout.write(f"Re-parsing {len(rows)} archived pages in {len(chunks)} chunks")
+
+        totals = {'records': 0, 'failed': 0, 'no_detail': 0, 'updated': 0, 'unknown': 0}
+        details = {}
+        start = time.perf_counter()
+        # Forked workers must not share the parent's database connection
+        connections.close_all()
+        with ProcessPoolExecutor(
+            max_workers=max(1, options['processes']), mp_context=multiprocessing.get_context('fork')
+        ) as executor:
+            for records, chunk_details, failed in executor.map(reparse_pages, chunks):
+                details.update(chunk_details)
+                totals['failed'] += failed
+                if records:
+                    self._ingest(records, details, totals)
+
+        elapsed = time.perf_counter() - start
+        self.stdout.write(self.style.SUCCESS(
+            f"Parsed {totals['records']} jobs from {len(rows)} pages in {elapsed:.1f}s "
+            f"({len(rows) / max(elapsed, 1e-9):.0f} pages/s): {totals['updated']} updated, "
+            f"{totals['unknown']} no longer stored, {totals['no_detail']} without a detail page, "
+            f"{totals['failed']} unreadable pages"
+        ))
+
+    def _ingest(self, records, details, totals):
+        jobs = []
+        for record in records:
+            if record['source_platform'] == 'linkedin':
+                # A card alone would overwrite the stored description with defaults
+                detail = details.get(record['source_url'])
+                if detail is None:
+                    totals['no_detail'] += 1
+                    continue
+                record = {**record, **detail}
+            jobs.append(record)
+
+        result = ingest_job_postings(jobs, refresh=True)
+        totals['records'] += len(jobs)
+        totals['updated'] += result['updated']
+        totals['unknown'] += result['unknown']
@@ -0,0 +1,48 @@
+import re
+from functools import lru_cache
+from lxml import html as lxml_html
+from lxml.cssselect import CSSSelector
+
+WHITESPACE = re.compile(r'\s+')
+
+
+@lru_cache(maxsize=256)
+def _compiled(selector):
+    return CSSSelector(selector)
+
+
+def parse_html(text, base_url=None):
+    """Parse page HTML into an lxml document with absolute links"""
+    document = lxml_html.fromstring(text)
+    if base_url:
+        document.make_links_absolute(base_url, resolve_base_href=True)
+    return document
+
+
+def select_all(element, selector):
+    """Return all descendants matching a CSS selector"""
+    return _compiled(selector)(element)
+
+
+def select_one(element, selector):
+    """Return the first descendant matching a CSS selector, or None"""
+    matches = _compiled(selector)(element)
+    return matches[0] if matches else None
+
+
+def text_of(element, selector=None, default=''):
+    """Return whitespace-normalized text of element (or its first match)"""
+    if selector is not None:
+        element = select_one(element, selector)
+    if element is None:
+        return default
+    text = WHITESPACE.sub(' ', element.text_content()).strip()
+    return text or default
+
+
+def attr_of(element, selector, attribute, default=''):
+    """Return an attribute of the first match of selector"""
+    match = select_one(element, selector)
+    if match is None:
+        return default
+    return match.get(attribute) or default
@@ -0,0 +1,110 @@
+import time
+import threading
+import logging
+from urllib.parse import urlsplit
+import redis
+from django.conf import settings
+from .http_client import domain_setting
+
+logger = logging.getLogger(__name__)
+
+# Reserve one token and return how long the caller must wait for it.
+# Tokens may go negative: each caller gets its own place in the queue, so
+# waiters never poll and the long-run rate stays at `rate` per second.
+TOKEN_BUCKET_SCRIPT = """
+local rate = tonumber(ARGV[1])
+local capacity = tonumber(ARGV[2])
+local clock = redis.call('TIME')
+local now = tonumber(clock[1]) + tonumber(clock[2]) / 1000000
+local state = redis.call('HMGET', KEYS[1], 'tokens', 'updated')
+local tokens = tonumber(state[1]) or capacity
+local updated = tonumber(state[2]) or now
+tokens = math.min(capacity, tokens + math.max(0, now - updated) * rate) - 1
+redis.call('HSET', KEYS[1], 'tokens', tokens, 'updated', now)
+redis.call('EXPIRE', KEYS[1], math.ceil(capacity / rate) + 60)
+if tokens >= 0 then
+    return '0'
+end
+return tostring(-tokens / rate)
+"""
+
+
+class RedisTokenBucket:
+    """Token bucket shared by every worker through Redis"""
+
+    def __init__(self, client):
+        self.client = client
+        self.script = client.register_script(TOKEN_BUCKET_SCRIPT)
+
+    def reserve(self, key, rate, capacity):
+        """Take a token for key and return the seconds to wait before using it"""
+        return float(self.script(keys=[f"scrapers:ratelimit:{key}"], args=[rate, capacity]))
+
+
+class LocalTokenBucket:
+    """In-process stand-in for RedisTokenBucket"""
+
+    def __init__(self):
+        self.buckets = {}
+        self.lock = threading.Lock()
+
+    def reserve(self, key, rate, capacity):
+        now = time.monotonic()
+        with self.lock:
+            tokens, updated = self.buckets.get(key, (capacity, now))
+            tokens = min(capacity, tokens + (now - updated) * rate) - 1
+            self.buckets[key] = (tokens, now)
+        return 0.0 if tokens >= 0 else -tokens / rate
+
+
+class RateLimiter:
+    """Hands out per-domain request permits according to SCRAPER_RATE_LIMITS"""
+
+    def __init__(self, bucket, fallback=None):
+        self.bucket = bucket
+        self.fallback = fallback
+
+    def acquire(self, url):
+        """Block until a request to url is allowed"""
+        domain = urlsplit(url).hostname or ''
+        rate, capacity = domain_setting(settings.SCRAPER_RATE_LIMITS, domain)
+        try:
+            wait = self.bucket.reserve(domain, rate, capacity)
+        except redis.RedisError as e:
+            if self.fallback is None:
+                raise
+            logger.warning(f"Shared rate limiter unavailable, limiting {domain} locally: {e}")
+            wait = self.fallback.reserve(domain, rate, capacity)
+        if wait > 0:
+            time.sleep(wait)
+        return wait
+
+
+class NullRateLimiter:
+    """Permits every request immediately (benchmarks and local fixtures)"""
+
+    def acquire(self, url):
+        return 0.0
+
+
+_limiter = None
+
+
+def set_rate_limiter(limiter):
+    """Replace this process's rate limiter, e.g. with NullRateLimiter for offline benchmarks"""
+    global _limiter
+    _limiter = limiter
+
+
+def get_rate_limiter():
+    """Return the configured rate limiter for this process"""
+    global _limiter
+    if _limiter is None:
+        if not settings.SCRAPER_RATE_LIMIT_ENABLED:
+            _limiter = NullRateLimiter()
+        elif settings.SCRAPER_RATE_LIMIT_REDIS_URL:
+            client = redis.Redis.from_url(settings.SCRAPER_RATE_LIMIT_REDIS_URL)
+            _limiter = RateLimiter(RedisTokenBucket(client), fallback=LocalTokenBucket())
+        else:
+            _limiter = RateLimiter(LocalTokenBucket())
+    return _limiter
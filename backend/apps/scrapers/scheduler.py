@@ -0,0 +1,131 @@
+import math
+import logging
+from datetime import timedelta
+from itertools import product
+from django.conf import settings
+from django.db.models import Sum
+from django.utils import timezone
+from ..jobs.models import ScrapePartition, ScrapeTaskStat
+
+logger = logging.getLogger(__name__)
+
+SEARCH_TERMS = [
+    "software engineer", "data scientist", "product manager",
+    "marketing manager", "sales representative", "accountant",
+    "project manager", "business analyst", "ui/ux designer",
+]
+LOCATIONS = ["Nairobi", "Mombasa", "Kisumu", "Nakuru", "Kenya"]
+SEARCH_PLATFORMS = ['linkedin', 'indeed', 'glassdoor']
+
+
+def _hours(delta):
+    return delta.total_seconds() / 3600
+
+
+def partition_yields(since):
+    """New postings found per (platform, search term, location) since a time, from task telemetry"""
+    rows = ScrapeTaskStat.objects.filter(
+        started_at__gte=since, platform__in=SEARCH_PLATFORMS,
+    ).values('platform', 'search_term', 'location').annotate(jobs_new=Sum('jobs_new'))
+    return {(row['platform'], row['search_term'], row['location']): row for row in rows}
+
+
+def plan_scrapes(ignore_intervals=False, now=None):
+    """Choose which search partitions to scrape this cycle and how many pages each gets.
+
+    A partition's yield is the new postings it produced per hour over the
+    last SCRAPER_YIELD_WINDOW_DAYS, so the postings waiting since its last
+    visit are estimated as yield x hours since it was last queued. Partitions
+    are due once that estimate reaches SCRAPER_MIN_EXPECTED_NEW, or after
+    SCRAPER_MAX_INTERVAL_HOURS regardless; unseen partitions are always due.
+    Overdue partitions, then the highest estimates, are taken until
+    SCRAPER_PAGE_BUDGET pages are allocated.
+
+    Full runs (the ones allowed to sweep) always get SCRAPER_MAX_PAGES, since
+    a shorter crawl would deactivate postings listed on the pages it skipped.
+    """
+    now = now or timezone.now()
+    window_hours = settings.SCRAPER_YIELD_WINDOW_DAYS * 24
+    yields = partition_yields(now - timedelta(hours=window_hours))
+    partitions = {
+        (partition.platform, partition.search_term, partition.location): partition
+        for partition in ScrapePartition.objects.filter(platform__in=SEARCH_PLATFORMS)
+    }
+
+    candidates = []
+    for platform, search_term, location in product(SEARCH_PLATFORMS, SEARCH_TERMS, LOCATIONS):
+        key = (platform, search_term, location)
+        partition = partitions.get(key)
+        full_run = partition is None or partition.runs % settings.SCRAPER_FULL_RUN_INTERVAL == 0
+        last_queued_at = partition.last_queued_at if partition else None
+
+        if last_queued_at is None:
+            expected_new, overdue = math.inf, True
+        else:
+            since_queued = _hours(now - last_queued_at)
+            if since_queued < settings.SCRAPER_MIN_INTERVAL_HOURS and not ignore_intervals:
+                continue
+            new_per_hour = (yields[key]['jobs_new'] or 0) / window_hours if key in yields else 0
+            expected_new = new_per_hour * since_queued
+            overdue = since_queued >= settings.SCRAPER_MAX_INTERVAL_HOURS
+            if expected_new < settings.SCRAPER_MIN_EXPECTED_NEW and not overdue and not ignore_intervals:
+                continue
+
+        if full_run or expected_new == math.inf:
+            max_pages = settings.SCRAPER_MAX_PAGES
+        else:
+            jobs_per_page = settings.SCRAPER_JOBS_PER_PAGE.get(platform, 20)
+            max_pages = min(max(math.ceil(expected_new / jobs_per_page), 1), settings.SCRAPER_MAX_PAGES)
+
+        candidates.append({
+            'platform': platform,
+            'search_term': search_term,
+            'location': location,
+            'max_pages': max_pages,
+            'expected_new': expected_new,
+            'overdue': overdue,
+        })
+
+    # Overdue partitions first so dead queries still get their periodic visit
+    candidates.sort(key=lambda scrape: (scrape['overdue'], scrape['expected_new']), reverse=True)
+    budget = settings.SCRAPER_PAGE_BUDGET
+    planned = []
+    for scrape in candidates:
+        if scrape['max_pages'] > budget:
+            continue
+        budget -= scrape['max_pages']
+        planned.append(scrape)
+
+    logger.info(
+        f"Scrape plan: {len(planned)} of {len(candidates)} due partitions, "
+        f"{settings.SCRAPER_PAGE_BUDGET - budget}/{settings.SCRAPER_PAGE_BUDGET} pages"
+    )
+    return planned
+
+
+def mark_queued(scrapes, now=None):
+    """Record when the planned partitions were queued so the next cycle measures from it"""
+    now = now or timezone.now()
+    ScrapePartition.objects.bulk_create(
+        [
+            ScrapePartition(
+                platform=scrape['platform'],
+                search_term=scrape['search_term'][:200],
+                location=scrape['location'][:100],
+                last_queued_at=now,
+            )
+            for scrape in scrapes
+        ],
+        update_conflicts=True,
+        unique_fields=['platform', 'search_term', 'location'],
+        update_fields=['last_queued_at'],
+    )
+
+
+def career_pages_due(now=None):
+    """Career pages are not searched, so they keep a fixed SCRAPER_CAREER_INTERVAL_HOURS cadence"""
+    now = now or timezone.now()
+    last_queued_at = ScrapePartition.objects.filter(
+        platform='career_page', search_term='', location='',
+    ).values_list('last_queued_at', flat=True).first()
+    return last_queued_at is None or _hours(now - last_queued_at) >= settings.SCRAPER_CAREER_INTERVAL_HOURS
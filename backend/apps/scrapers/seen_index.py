@@ -0,0 +1,95 @@
+import time
+import threading
+import logging
+import redis
+from django.conf import settings
+
+logger = logging.getLogger(__name__)
+
+
+class SeenIndex:
+    """External ids seen in recent scrape runs, one Redis sorted set per platform.
+
+    Members are external ids scored by the time they were last seen, so
+    entries older than the retention window can be trimmed cheaply.
+    """
+
+    def __init__(self, client, retention_days=14):
+        self.client = client
+        self.retention = retention_days * 24 * 60 * 60
+
+    def _key(self, platform):
+        return f"scrapers:seen:{platform}"
+
+    def known(self, platform, external_ids):
+        """Return the subset of external_ids seen within the retention window"""
+        external_ids = [external_id for external_id in external_ids if external_id]
+        if not external_ids:
+            return set()
+        try:
+            scores = self.client.zmscore(self._key(platform), external_ids)
+        except redis.RedisError as e:
+            logger.warning(f"Seen index unavailable, treating all {platform} postings as new: {e}")
+            return set()
+        cutoff = time.time() - self.retention
+        return {
+            external_id for external_id, score in zip(external_ids, scores)
+            if score is not None and score >= cutoff
+        }
+
+    def add(self, platform, external_ids):
+        """Mark external_ids as seen now and drop expired entries"""
+        external_ids = [external_id for external_id in external_ids if external_id]
+        if not external_ids:
+            return
+        now = time.time()
+        key = self._key(platform)
+        try:
+            pipeline = self.client.pipeline(transaction=False)
+            pipeline.zadd(key, {external_id: now for external_id in external_ids})
+            pipeline.zremrangebyscore(key, 0, now - self.retention)
+            pipeline.execute()
+        except redis.RedisError as e:
+            logger.warning(f"Could not update seen index for {platform}: {e}")
+
+
+class LocalSeenIndex(SeenIndex):
+    """In-process stand-in for SeenIndex when no Redis is configured"""
+
+    def __init__(self, retention_days=14):
+        super().__init__(client=None, retention_days=retention_days)
+        self.entries = {}
+        self.lock = threading.Lock()
+
+    def known(self, platform, external_ids):
+        cutoff = time.time() - self.retention
+        with self.lock:
+            seen = self.entries.get(platform, {})
+            return {
+                external_id for external_id in external_ids
+                if external_id and seen.get(external_id, 0) >= cutoff
+            }
+
+    def add(self, platform, external_ids):
+        now = time.time()
+        with self.lock:
+            seen = self.entries.setdefault(platform, {})
+            for external_id in external_ids:
+                if external_id:
+                    seen[external_id] = now
+
+
+_index = None
+
+
+def get_seen_index():
+    """Return the configured seen-posting index"""
+    global _index
+    if _index is None:
+        url = settings.SEEN_INDEX_REDIS_URL
+        retention_days = settings.SEEN_INDEX_RETENTION_DAYS
+        if url:
+            _index = SeenIndex(redis.Redis.from_url(url), retention_days)
+        else:
+            _index = LocalSeenIndex(retention_days)
+    return _index
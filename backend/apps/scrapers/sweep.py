@@ -0,0 +1,92 @@
+import logging
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Exists, F, OuterRef
+from django.utils import timezone
+from ..jobs.models import JobPosting, PartitionSighting, ScrapePartition
+from .ingest import stable_external_id
+
+logger = logging.getLogger(__name__)
+
+
+def _partition_key(platform, search_term, location):
+    return {'platform': platform, 'search_term': (search_term or '')[:200], 'location': (location or '')[:100]}
+
+
+def is_full_run(platform, search_term, location):
+    """Whether this run must page through all results instead of stopping at known postings.
+
+    Incremental runs stop paging early, so postings further down the results
+    are not seen. Only full runs may sweep; every SCRAPER_FULL_RUN_INTERVAL-th
+    run of a partition is one.
+    """
+    runs = ScrapePartition.objects.filter(
+        **_partition_key(platform, search_term, location)
+    ).values_list('runs', flat=True).first() or 0
+    return runs % settings.SCRAPER_FULL_RUN_INTERVAL == 0
+
+
+def record_partition_run(platform, search_term, location, jobs_data, full_run=True):
+    """Mark the postings a run saw and sweep the partition's missing ones.
+
+    Call after the jobs are ingested. Returns the ids of the postings
+    deactivated. A run that returned nothing is treated as failed and not
+    counted, so a blocked scrape cannot deactivate a whole partition.
+
+    Sightings are stamped with the partition's full-run count. A posting
+    seen by an incremental run was listed after that many full runs, and
+    only full runs that miss it count towards SCRAPER_SWEEP_MISSED_RUNS.
+    """
+    external_ids = {stable_external_id(job_data) for job_data in jobs_data if job_data.get('title')}
+    if not external_ids:
+        return []
+
+    with transaction.atomic():
+        partition, _ = ScrapePartition.objects.select_for_update().get_or_create(
+            **_partition_key(platform, search_term, location)
+        )
+        partition.runs += 1
+        if full_run:
+            partition.full_runs += 1
+        partition.last_run_at = timezone.now()
+        partition.save(update_fields=['runs', 'full_runs', 'last_run_at'])
+
+        job_ids = JobPosting.objects.filter(
+            source_platform=platform, external_id__in=external_ids
+        ).values_list('id', flat=True)
+        PartitionSighting.objects.bulk_create(
+            [PartitionSighting(partition=partition, job_id=job_id, last_seen_run=partition.full_runs) for job_id in job_ids],
+            batch_size=1000,
+            update_conflicts=True,
+            unique_fields=['partition', 'job'],
+            update_fields=['last_seen_run'],
+        )
+
+        if not full_run:
+            return []
+        return sweep_partition(partition)
+
+
+def sweep_partition(partition):
+    """Deactivate the partition's postings missed by SCRAPER_SWEEP_MISSED_RUNS full runs and return their ids.
+
+    A posting still listed under another partition (the same job found by
+    a different search term or location) stays active. Runs inside
+    record_partition_run's transaction, which holds the partition lock.
+    """
+    missed_runs = settings.SCRAPER_SWEEP_MISSED_RUNS
+    seen_elsewhere = PartitionSighting.objects.filter(
+        job_id=OuterRef('pk'),
+        last_seen_run__gt=F('partition__full_runs') - missed_runs,
+    )
+    missed = list(JobPosting.objects.filter(
+        is_active=True,
+        sightings__partition=partition,
+        sightings__last_seen_run__lte=partition.full_runs - missed_runs,
+    ).exclude(Exists(seen_elsewhere)).values_list('id', flat=True))
+    if not missed:
+        return []
+
+    JobPosting.objects.filter(id__in=missed, is_active=True).update(is_active=False, last_updated=timezone.now())
+    logger.info(f"Deactivated {len(missed)} postings no longer listed in {partition}")
+    return missed
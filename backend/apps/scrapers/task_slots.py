@@ -0,0 +1,75 @@
+import time
+import uuid
+import logging
+import redis
+from django.conf import settings
+
+logger = logging.getLogger(__name__)
+
+
+class PlatformSlots:
+    """Caps how many scrape tasks per platform run at once across all workers.
+
+    Holders are members of a Redis sorted set scored by when they took the
+    slot. A holder whose worker died without releasing is dropped once it
+    is older than ttl seconds.
+    """
+
+    def __init__(self, client, ttl):
+        self.client = client
+        self.ttl = ttl
+
+    def _key(self, platform):
+        return f"scrapers:slots:{platform}"
+
+    def acquire(self, platform, limit):
+        """Take a slot and return its token, or None if the platform is at its cap"""
+        key = self._key(platform)
+        token = uuid.uuid4().hex
+        now = time.time()
+        try:
+            pipeline = self.client.pipeline()
+            pipeline.zremrangebyscore(key, '-inf', now - self.ttl)
+            pipeline.zadd(key, {token: now})
+            pipeline.zrank(key, token)
+            pipeline.expire(key, self.ttl)
+            rank = pipeline.execute()[2]
+            if rank is not None and rank < limit:
+                return token
+            self.client.zrem(key, token)
+            return None
+        except redis.RedisError as e:
+            logger.warning(f"Task slots unavailable, running {platform} task uncapped: {e}")
+            return ''
+
+    def release(self, platform, token):
+        if not token:
+            return
+        try:
+            self.client.zrem(self._key(platform), token)
+        except redis.RedisError as e:
+            logger.warning(f"Could not release {platform} task slot: {e}")
+
+
+class UnlimitedSlots:
+    """Stand-in when no Redis is configured; every task runs"""
+
+    def acquire(self, platform, limit):
+        return ''
+
+    def release(self, platform, token):
+        pass
+
+
+_slots = None
+
+
+def get_platform_slots():
+    """Return the configured per-platform task slots"""
+    global _slots
+    if _slots is None:
+        if settings.SCRAPER_SLOTS_REDIS_URL:
+            _slots = PlatformSlots(redis.Redis.from_url(settings.SCRAPER_SLOTS_REDIS_URL), settings.SCRAPER_SLOT_TTL)
+        else:
+            _slots = UnlimitedSlots()
+    return _slots
@@ -1,199 +1,193 @@
-from celery import shared_task
+from celery import chord, shared_task
+from celery.signals import worker_process_shutdown
+from django.conf import settings
+from django.db import transaction
 from django.utils import timezone
-from datetime import datetime, timedelta
+from datetime import timedelta
+import time
 import logging
 from .linkedin_scraper import LinkedInScraper
 from .indeed_scraper import IndeedScraper
 from .glassdoor_scraper import GlassdoorScraper
 from .career_pages_scraper import CareerPagesScraper
-from ..jobs.models import JobPosting, Company, SkillDemand
+from .ingest import changed_skills, ingest_job_postings, extract_county, parse_posted_date
+from .browser_pool import shutdown_browser_pool
+from .sweep import is_full_run, record_partition_run
+from .scheduler import career_pages_due, mark_queued, plan_scrapes
+from .task_slots import get_platform_slots
+from .telemetry import ScrapeStats, record_ingest_failure, record_ingest_stats
+from ..jobs.models import JobPosting, ScrapeRun
+from ..jobs.change_feed import publish_posting_changes
+from ..jobs.percolator import percolate
+from ..jobs.backfill import Throughput, pk_ranges, reextract_range, stale_postings
 from ..analytics.services import AnalyticsService
 
 logger = logging.getLogger(__name__)
 
+# Quit pooled browsers when a worker child exits so Chrome processes are not leaked
+worker_process_shutdown.connect(shutdown_browser_pool)
+
 @shared_task
-def scrape_all_platforms():
-    """Scrape jobs from all platforms"""
-    search_terms = [
-        "software engineer", "data scientist", "product manager", 
-        "marketing manager", "sales representative", "accountant",
-        "project manager", "business analyst", "ui/ux designer"
+def scrape_all_platforms(trigger='schedule'):
+    """Queue the search partitions the adaptive scheduler picks for this cycle"""
+    # Manual runs skip the per-partition intervals but still keep to the page budget
+    scrapes = plan_scrapes(ignore_intervals=trigger == 'manual')
+    career_pages = trigger == 'manual' or career_pages_due()
+    
+    # Each task reports its stats against this run
+    run = ScrapeRun.objects.create(trigger=trigger, tasks_queued=len(scrapes) + int(career_pages))
+    
+    # Manual runs wait behind scheduled work on the scrape queue
+    priority = settings.SCRAPER_MANUAL_PRIORITY if trigger == 'manual' else settings.CELERY_TASK_DEFAULT_PRIORITY
+    
+    tasks = {'linkedin': scrape_linkedin_jobs, 'indeed': scrape_indeed_jobs, 'glassdoor': scrape_glassdoor_jobs}
+    signatures = [
+        tasks[scrape['platform']].signature(
+            (scrape['search_term'], scrape['location'], scrape['max_pages']),
+            {'run_id': run.id},
+            priority=priority,
+        )
+        for scrape in scrapes
     ]
+    mark_queued(scrapes)
     
-    locations = ["Nairobi", "Mombasa", "Kisumu", "Nakuru", "Kenya"]
+    # Career pages are not searched, so they keep a fixed cadence
+    if career_pages:
+        signatures.append(scrape_career_pages.signature(kwargs={'run_id': run.id}, priority=priority))
+        mark_queued([{'platform': 'career_page', 'search_term': '', 'location': ''}])
     
-    for search_term in search_terms:
-        for location in locations:
-            scrape_linkedin_jobs.delay(search_term, location)
-            scrape_indeed_jobs.delay(search_term, location)
-            scrape_glassdoor_jobs.delay(search_term, location)
+    # Each scrape task replaces itself with its ingest task, so the chord
+    # fires once every job of the run is saved
+    if signatures:
+        chord(signatures)(refresh_analytics_after_run.si(run.id))
     
-    # Scrape career pages (doesn't need search terms/locations)
-    scrape_career_pages.delay()
+    return f"Queued {run.tasks_queued} scrape tasks"
 
-@shared_task
-def scrape_linkedin_jobs(search_term="", location="Kenya", max_pages=3):
-    """Scrape jobs from LinkedIn"""
-    scraper = LinkedInScraper()
+def _scrape_partition(task, scraper_class, platform, label, search_term, location, max_pages, run_id):
+    """Scrape one search partition, save the task's stats and hand the jobs to the ingest queue"""
+    slots = get_platform_slots()
+    token = slots.acquire(platform, settings.SCRAPER_PLATFORM_CONCURRENCY.get(platform, 1))
+    if token is None:
+        if task.request.retries < settings.SCRAPER_SLOT_MAX_RETRIES:
+            raise task.retry(countdown=settings.SCRAPER_SLOT_RETRY_DELAY, max_retries=settings.SCRAPER_SLOT_MAX_RETRIES)
+        # Give up rather than wait forever, so the run's chord can still finish
+        stats = ScrapeStats()
+        stats.skip(f"No free {platform} slot after {task.request.retries} retries")
+        stats.save(platform, search_term, location, run_id)
+        logger.warning(f"{label}: skipped {search_term or '*'} in {location or '*'}, platform slots stayed full")
+        return f"{label} scraping skipped: no free slot"
+    
+    full_run = is_full_run(platform, search_term, location)
+    scraper = scraper_class(full_scan=full_run)
+    stats = scraper.stats
     
     try:
         jobs = scraper.scrape_jobs(search_term, location, max_pages)
-        saved_count = 0
-        
-        for job_data in jobs:
-            if save_job_posting(job_data):
-                saved_count += 1
-        
-        logger.info(f"LinkedIn: Scraped {len(jobs)} jobs, saved {saved_count} new jobs")
-        return f"LinkedIn: {saved_count} new jobs saved"
-        
     except Exception as e:
-        logger.error(f"Error in LinkedIn scraping task: {e}")
-        return f"LinkedIn scraping failed: {e}"
+        stats.fail(e)
+        logger.error(f"Error in {label} scraping task: {e}")
+        return f"{label} scraping failed: {e}"
     finally:
         scraper.close()
+        slots.release(platform, token)
+        stat = stats.save(platform, search_term, location, run_id)
+    
+    logger.info(f"{label}: Scraped {len(jobs)} jobs, queued for ingest")
+    max_description = settings.SCRAPER_MAX_DESCRIPTION_CHARS
+    jobs = [
+        {**job, 'description': job['description'][:max_description]}
+        if len(job.get('description') or '') > max_description else job
+        for job in jobs
+    ]
+    # Replacing (rather than just queueing) keeps the ingest inside the run's chord
+    return task.replace(ingest_scraped_jobs.s(
+        jobs, platform, search_term, location, full_run,
+        stat_id=stat.id if stat else None, label=label,
+    ).set(compression='gzip'))
 
-@shared_task
-def scrape_indeed_jobs(search_term="", location="Nairobi", max_pages=3):
+@shared_task(bind=True)
+def scrape_linkedin_jobs(self, search_term="", location="Kenya", max_pages=3, run_id=None):
+    """Scrape jobs from LinkedIn"""
+    return _scrape_partition(self, LinkedInScraper, 'linkedin', 'LinkedIn', search_term, location, max_pages, run_id)
+
+@shared_task(bind=True)
+def scrape_indeed_jobs(self, search_term="", location="Nairobi", max_pages=3, run_id=None):
     """Scrape jobs from Indeed"""
-    scraper = IndeedScraper()
-    
-    try:
-        jobs = scraper.scrape_jobs(search_term, location, max_pages)
-        saved_count = 0
-        
-        for job_data in jobs:
-            if save_job_posting(job_data):
-                saved_count += 1
-        
-        logger.info(f"Indeed: Scraped {len(jobs)} jobs, saved {saved_count} new jobs")
-        return f"Indeed: {saved_count} new jobs saved"
-        
-    except Exception as e:
-        logger.error(f"Error in Indeed scraping task: {e}")
-        return f"Indeed scraping failed: {e}"
-    finally:
-        scraper.close()
+    return _scrape_partition(self, IndeedScraper, 'indeed', 'Indeed', search_term, location, max_pages, run_id)
 
-@shared_task
-def scrape_glassdoor_jobs(search_term="", location="Kenya", max_pages=3):
+@shared_task(bind=True)
+def scrape_glassdoor_jobs(self, search_term="", location="Kenya", max_pages=3, run_id=None):
     """Scrape jobs from Glassdoor"""
-    scraper = GlassdoorScraper()
-    
-    try:
-        jobs = scraper.scrape_jobs(search_term, location, max_pages)
-        saved_count = 0
-        
-        for job_data in jobs:
-            if save_job_posting(job_data):
-                saved_count += 1
-        
-        logger.info(f"Glassdoor: Scraped {len(jobs)} jobs, saved {saved_count} new jobs")
-        return f"Glassdoor: {saved_count} new jobs saved"
-        
-    except Exception as e:
-        logger.error(f"Error in Glassdoor scraping task: {e}")
-        return f"Glassdoor scraping failed: {e}"
-    finally:
-        scraper.close()
+    return _scrape_partition(self, GlassdoorScraper, 'glassdoor', 'Glassdoor', search_term, location, max_pages, run_id)
 
-@shared_task
-def scrape_career_pages():
+@shared_task(bind=True)
+def scrape_career_pages(self, run_id=None):
     """Scrape jobs from company career pages"""
-    scraper = CareerPagesScraper()
+    return _scrape_partition(self, CareerPagesScraper, 'career_page', 'Career Pages', '', '', 1, run_id)
+
+@shared_task
+def ingest_scraped_jobs(jobs, platform, search_term='', location='', full_run=True, stat_id=None, label=''):
+    """Save one scrape task's jobs, sweep its partition, record its stats and publish the changes"""
+    start = time.perf_counter()
+    label = label or platform
     
     try:
-        jobs = scraper.scrape_jobs()
-        saved_count = 0
+        result = ingest_job_postings(jobs)
         
-        for job_data in jobs:
-            if save_job_posting(job_data):
-                saved_count += 1
+        if platform == 'career_page':
+            # Each company's page is its own partition, so one unreachable site
+            # does not count as a run in which every other company's jobs vanished
+            by_company = {}
+            for job_data in jobs:
+                by_company.setdefault(job_data['company'], []).append(job_data)
+            deactivated_ids = [
+                job_id
+                for company, company_jobs in by_company.items()
+                for job_id in record_partition_run(platform, company, '', company_jobs)
+            ]
+        else:
+            deactivated_ids = record_partition_run(platform, search_term, location, jobs, full_run)
+        deactivated = len(deactivated_ids)
         
-        logger.info(f"Career Pages: Scraped {len(jobs)} jobs, saved {saved_count} new jobs")
-        return f"Career Pages: {saved_count} new jobs saved"
+        skills = changed_skills(result['new_postings'], result['reactivated'] + deactivated_ids)
+        record_ingest_stats(stat_id, result, deactivated, time.perf_counter() - start, skills)
+        publish_posting_changes(result['new_postings'], deactivated_ids, platform, result['reactivated'])
+        # Cross-platform duplicates of a vacancy already alerted on are left out
+        new_vacancies = [str(posting.id) for posting in result['new_postings'] if posting.duplicate_of_id is None]
+        if new_vacancies:
+            match_saved_searches.delay(new_vacancies)
+        logger.info(
+            f"{label}: saved {result['inserted']} new jobs, updated {result['updated']}, "
+            f"deactivated {deactivated}"
+        )
+        return f"{label}: {result['inserted']} new jobs saved"
         
     except Exception as e:
-        logger.error(f"Error in Career Pages scraping task: {e}")
-        return f"Career Pages scraping failed: {e}"
-    finally:
-        scraper.close()
+        record_ingest_failure(stat_id, e)
+        logger.error(f"Error ingesting {label} jobs: {e}")
+        return f"{label} ingest failed: {e}"
 
 def save_job_posting(job_data):
-    """Save job posting to database"""
+    """Save a single job posting to database"""
     try:
-        # Get or create company
-        company, created = Company.objects.get_or_create(
-            name=job_data['company'],
-            defaults={'industry': '', 'size': '', 'location': job_data.get('location', '')}
-        )
-        
-        # Check if job already exists
-        existing_job = JobPosting.objects.filter(
-            external_id=job_data.get('external_id', ''),
-            source_platform=job_data['source_platform'],
-            company=company
-        ).first()
-        
-        if existing_job:
-            # Update existing job
-            existing_job.last_updated = timezone.now()
-            existing_job.is_active = True
-            existing_job.save()
-            return False
-        
-        # Create new job posting
-        job_posting = JobPosting.objects.create(
-            title=job_data['title'],
-            company=company,
-            description=job_data.get('description', ''),
-            requirements=job_data.get('requirements', ''),
-            location=job_data.get('location', ''),
-            county=extract_county(job_data.get('location', '')),
-            remote_type=job_data.get('remote_type', 'on_site'),
-            employment_type=job_data.get('employment_type', 'full_time'),
-            experience_level=job_data.get('experience_level', 'mid'),
-            salary_min=job_data.get('salary_min'),
-            salary_max=job_data.get('salary_max'),
-            skills_required=job_data.get('skills_required', []),
-            source_platform=job_data['source_platform'],
-            source_url=job_data['source_url'],
-            external_id=job_data.get('external_id', ''),
-            posted_date=parse_posted_date(job_data.get('posted_date')),
-        )
-        
-        return True
-        
+        return ingest_job_postings([job_data])['inserted'] == 1
     except Exception as e:
         logger.error(f"Error saving job posting: {e}")
         return False
 
-def extract_county(location):
-    """Extract county from location string"""
-    kenyan_counties = [
-        'Nairobi', 'Mombasa', 'Kisumu', 'Nakuru', 'Eldoret', 'Thika', 'Malindi',
-        'Kitale', 'Garissa', 'Kakamega', 'Machakos', 'Meru', 'Nyeri', 'Kericho'
-    ]
-    
-    location_lower = location.lower()
-    for county in kenyan_counties:
-        if county.lower() in location_lower:
-            return county
-    return ''
-
-def parse_posted_date(date_str):
-    """Parse posted date string to datetime"""
-    if not date_str:
-        return timezone.now()
-    
+@shared_task
+def match_saved_searches(job_ids):
+    """Create job alerts for the saved searches newly ingested postings match"""
     try:
-        # Handle different date formats
-        if 'ago' in date_str.lower():
-            return timezone.now() - timedelta(days=1)
-        else:
-            return datetime.fromisoformat(date_str.replace('Z', '+00:00'))
-    except:
-        return timezone.now()
+        postings = JobPosting.objects.filter(id__in=job_ids, is_active=True).only(
+            'id', 'skills_required', 'county', 'remote_type', 'salary_min'
+        )
+        created = percolate(postings)
+        logger.info(f"Matched {len(job_ids)} new postings to saved searches: {created} alerts")
+        return f"Created {created} job alerts"
+    except Exception as e:
+        logger.error(f"Error matching saved searches: {e}")
+        return f"Saved search matching failed: {e}"
 
 @shared_task
 def update_skill_demand():
@@ -207,18 +201,73 @@ def update_skill_demand():
         logger.error(f"Error updating skill demand: {e}")
         return f"Skill demand update failed: {e}"
 
+@shared_task
+def refresh_analytics_after_run(run_id):
+    """Refresh skill demand for the postings a finished scrape run changed"""
+    try:
+        run = ScrapeRun.objects.get(id=run_id)
+        refresh = AnalyticsService().refresh_skill_demand(run)
+        logger.info(
+            f"Skill demand refreshed for run {run_id}: {refresh.postings_changed} postings changed, "
+            f"{refresh.skills_updated} skills updated, lag {refresh.lag_seconds or 0:.0f}s"
+        )
+        return f"Refreshed {refresh.skills_updated} skills"
+    except Exception as e:
+        logger.error(f"Error refreshing skill demand for run {run_id}: {e}")
+        return f"Skill demand refresh failed: {e}"
+
 @shared_task
 def cleanup_old_jobs():
-    """Remove old inactive job postings"""
+    """Remove old inactive job postings in short batches"""
     try:
-        cutoff_date = timezone.now() - timedelta(days=90)
-        deleted_count = JobPosting.objects.filter(
+        cutoff_date = timezone.now() - timedelta(days=settings.JOB_RETENTION_DAYS)
+        stale_ids = JobPosting.objects.filter(
             last_updated__lt=cutoff_date,
             is_active=False
-        ).delete()[0]
+        ).order_by('last_updated').values_list('id', flat=True)
+        
+        # One bounded transaction per batch keeps row locks and cascades short
+        deleted_count = 0
+        while True:
+            batch = list(stale_ids[:settings.JOB_CLEANUP_BATCH_SIZE])
+            if not batch:
+                break
+            with transaction.atomic():
+                # Locked and re-checked, so a posting ingest reactivated since the SELECT is kept
+                still_stale = list(JobPosting.objects.select_for_update().filter(
+                    id__in=batch, is_active=False, last_updated__lt=cutoff_date
+                ).values_list('id', flat=True))
+                deleted_count += JobPosting.objects.filter(id__in=still_stale).delete()[1].get('jobs.JobPosting', 0)
         
         logger.info(f"Cleaned up {deleted_count} old job postings")
         return f"Cleaned up {deleted_count} jobs"
     except Exception as e:
         logger.error(f"Error cleaning up old jobs: {e}")
-        return f"Cleanup failed: {e}"
\ No newline at end of file
+        return f"Cleanup failed: {e}"
+
+@shared_task
+def backfill_extraction(chunk_size=2000):
+    """Queue re-extraction of stale postings, one task per primary key range"""
+    if not stale_postings().exists():
+        return "No stale postings to backfill"
+    
+    ranges = [
+        (str(lower) if lower else None, str(upper) if upper else None)
+        for lower, upper in pk_ranges(chunk_size)
+    ]
+    # Skill demand is recomputed once every range has written its skills
+    chord(backfill_extraction_range.si(lower, upper) for lower, upper in ranges)(update_skill_demand.si())
+    logger.info(f"Queued extraction backfill over {len(ranges)} ranges")
+    return f"Queued {len(ranges)} backfill ranges"
+
+@shared_task
+def backfill_extraction_range(lower, upper):
+    """Re-extract one primary key range of postings"""
+    try:
+        progress = Throughput()
+        progress.add(*reextract_range((lower, upper)))
+        logger.info(f"Extraction backfill ({lower}, {upper}]: {progress.summary()}")
+        return progress.summary()
+    except Exception as e:
+        logger.error(f"Error in extraction backfill ({lower}, {upper}]: {e}")
+        return f"Extraction backfill failed: {e}"
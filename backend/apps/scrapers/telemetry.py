@@ -0,0 +1,106 @@
+import time
+import threading
+import logging
+from contextlib import contextmanager
+from django.db.models import F
+from django.utils import timezone
+from ..jobs.models import ScrapeTaskStat
+
+logger = logging.getLogger(__name__)
+
+COUNTERS = (
+    'pages_fetched', 'cards_parsed', 'parse_failures', 'jobs_new', 'jobs_updated',
+    'jobs_duplicates', 'jobs_deactivated', 'jobs_reactivated', 'bytes_fetched',
+)
+TIMERS = ('page_load', 'sleep', 'parse', 'db')
+
+
+class ScrapeStats:
+    """In-memory counters for one scrape task, saved as a single row at the end.
+
+    Detail pages are fetched from several threads, so updates take a lock.
+    """
+
+    def __init__(self):
+        self.started_at = timezone.now()
+        self.started = time.perf_counter()
+        self.counts = dict.fromkeys(COUNTERS, 0)
+        self.seconds = dict.fromkeys(TIMERS, 0.0)
+        self.error = ''
+        self.status = None
+        self.lock = threading.Lock()
+
+    def add(self, counter, amount=1):
+        with self.lock:
+            self.counts[counter] += amount
+
+    def add_time(self, phase, seconds):
+        with self.lock:
+            self.seconds[phase] += seconds
+
+    @contextmanager
+    def timer(self, phase):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add_time(phase, time.perf_counter() - start)
+
+    def fail(self, error):
+        self.error = str(error)
+
+    def skip(self, reason):
+        self.status = 'skipped'
+        self.error = reason
+
+    def save(self, platform, search_term='', location='', run_id=None):
+        """Write the task's stats row; telemetry must never fail the task"""
+        try:
+            return ScrapeTaskStat.objects.create(
+                run_id=run_id,
+                platform=platform,
+                search_term=(search_term or '')[:200],
+                location=(location or '')[:100],
+                status=self.status or ('failed' if self.error else 'ok'),
+                error=self.error,
+                started_at=self.started_at,
+                finished_at=timezone.now(),
+                total_seconds=time.perf_counter() - self.started,
+                page_load_seconds=self.seconds['page_load'],
+                sleep_seconds=self.seconds['sleep'],
+                parse_seconds=self.seconds['parse'],
+                db_seconds=self.seconds['db'],
+                **self.counts,
+            )
+        except Exception as e:
+            logger.error(f"Could not save scrape stats for {platform}: {e}")
+            return None
+
+
+def record_ingest_stats(stat_id, result, deactivated, seconds, skills=()):
+    """Add an ingest task's counts, changed skills and DB time to the scrape task's stats row"""
+    if stat_id is None:
+        return
+    try:
+        ScrapeTaskStat.objects.filter(id=stat_id).update(
+            jobs_new=F('jobs_new') + result['inserted'],
+            jobs_updated=F('jobs_updated') + result['updated'],
+            jobs_duplicates=F('jobs_duplicates') + result['duplicates'],
+            jobs_deactivated=F('jobs_deactivated') + deactivated,
+            jobs_reactivated=F('jobs_reactivated') + len(result['reactivated']),
+            skills_changed=sorted(skills),
+            db_seconds=F('db_seconds') + seconds,
+            total_seconds=F('total_seconds') + seconds,
+        )
+    except Exception as e:
+        logger.error(f"Could not save ingest stats for task {stat_id}: {e}")
+
+
+def record_ingest_failure(stat_id, error):
+    """Mark the scrape task's stats row failed when its jobs could not be saved"""
+    if stat_id is None:
+        return
+    try:
+        ScrapeTaskStat.objects.filter(id=stat_id).update(status='failed', error=str(error))
+    except Exception as e:
+        logger.error(f"Could not save ingest failure for task {stat_id}: {e}")
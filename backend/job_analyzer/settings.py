@@ -1,6 +1,7 @@
 import os
 from pathlib import Path
 from decouple import config
+from kombu import Queue
 
 BASE_DIR = Path(__file__).resolve().parent.parent
 
@@ -75,6 +76,34 @@ CELERY_TASK_SERIALIZER = 'json'
 CELERY_RESULT_SERIALIZER = 'json'
 CELERY_TIMEZONE = 'Africa/Nairobi'
 
+# Queues: browser scrapes, ingest (DB writes) and analytics each get their own
+# workers, sized in docker-compose, so a long scrape cannot starve the others.
+CELERY_TASK_QUEUES = (
+    Queue('default'),
+    Queue('scrape'),
+    Queue('ingest'),
+    Queue('analytics'),
+)
+CELERY_TASK_DEFAULT_QUEUE = 'default'
+CELERY_TASK_ROUTES = {
+    'apps.scrapers.tasks.scrape_all_platforms': {'queue': 'default'},
+    'apps.scrapers.tasks.scrape_*': {'queue': 'scrape'},
+    'apps.scrapers.tasks.ingest_scraped_jobs': {'queue': 'ingest'},
+    'apps.scrapers.tasks.backfill_extraction_range': {'queue': 'ingest'},
+    'apps.scrapers.tasks.cleanup_old_jobs': {'queue': 'ingest', 'priority': 9},
+    'apps.scrapers.tasks.update_skill_demand': {'queue': 'analytics', 'priority': 0},
+    'apps.scrapers.tasks.refresh_analytics_after_run': {'queue': 'analytics', 'priority': 0},
+    'apps.scrapers.tasks.match_saved_searches': {'queue': 'analytics', 'priority': 0},
+}
+# Redis priorities: 0 is served first, 9 last
+CELERY_BROKER_TRANSPORT_OPTIONS = {
+    'priority_steps': list(range(10)),
+    'sep': ':',
+    'queue_order_strategy': 'priority',
+}
+CELERY_TASK_DEFAULT_PRIORITY = 5
+CELERY_WORKER_PREFETCH_MULTIPLIER = 1  # long tasks: do not reserve work another worker could start
+
 # CORS settings
 CORS_ALLOWED_ORIGINS = [
     "http://localhost:3000",
@@ -121,22 +150,165 @@ MEDIA_ROOT = BASE_DIR / 'media'
 DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 
 # Scraping settings
-SCRAPING_DELAY = 2  # seconds between requests
+# Per-domain request budget shared by all workers: (requests per second, burst)
+SCRAPER_RATE_LIMITS = {
+    'linkedin.com': (1.0, 5),
+    'indeed.com': (0.5, 3),
+    'glassdoor.com': (0.5, 3),
+    'default': (0.5, 2),
+}
+SCRAPER_RATE_LIMIT_ENABLED = config('SCRAPER_RATE_LIMIT_ENABLED', default=True, cast=bool)
+SCRAPER_RATE_LIMIT_REDIS_URL = config('REDIS_URL', default='redis://localhost:6379/0')  # empty = per-process buckets
+# Search page per platform; override to point the scrapers at a fixture server
+SCRAPER_BASE_URLS = {
+    'linkedin': config('SCRAPER_LINKEDIN_BASE_URL', default='https://www.linkedin.com/jobs/search'),
+    'indeed': config('SCRAPER_INDEED_BASE_URL', default='https://ke.indeed.com/jobs'),
+    'glassdoor': config('SCRAPER_GLASSDOOR_BASE_URL', default='https://www.glassdoor.com/Job/jobs.htm'),
+}
 USER_AGENT_LIST = [
     'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36',
     'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36',
     'Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36',
 ]
 
+# Fetch backend per platform: 'http' fetches server-rendered pages with a pooled
+# HTTP client and only falls back to Chrome when the expected markup is missing;
+# 'browser' always uses Chrome.
+SCRAPER_FETCH_BACKENDS = {
+    'linkedin': 'http',
+    'career_page': 'http',
+    'indeed': 'browser',
+    'glassdoor': 'browser',
+}
+SCRAPER_HTTP_POOL_SIZE = 10
+SCRAPER_HTTP_TIMEOUT = 15  # seconds
+SCRAPER_DETAIL_WORKERS = 4  # concurrent detail-page fetches per scrape task
+SCRAPER_CAREER_WORKERS = 8  # career sites fetched at once; each is a different domain
+SCRAPER_CAREER_BACKOFF_HOURS = 6  # first wait after a site yields nothing, doubled per failure
+SCRAPER_CAREER_MAX_BACKOFF_HOURS = 24 * 7
+# Max in-flight requests per domain within a worker process
+SCRAPER_DOMAIN_CONCURRENCY = {
+    'linkedin.com': 3,
+    'default': 2,
+}
+
+# Incremental scraping: external ids stored in recent runs, per platform
+SEEN_INDEX_REDIS_URL = config('REDIS_URL', default='redis://localhost:6379/0')  # empty = in-process only
+SEEN_INDEX_RETENTION_DAYS = 14
+SCRAPER_KNOWN_PAGE_RATIO = 0.8  # stop paging once this share of a results page is known
+
+# Mark-and-sweep deactivation per (platform, search term, location) partition
+SCRAPER_SWEEP_MISSED_RUNS = 3  # deactivate postings missing from this many full runs of a partition
+SCRAPER_FULL_RUN_INTERVAL = 4  # every Nth run of a partition pages through all results so it can sweep
+
+# Scrape tasks running at once per platform, across all workers. A task that
+# finds its platform full is retried after SCRAPER_SLOT_RETRY_DELAY seconds, up
+# to SCRAPER_SLOT_MAX_RETRIES times, then recorded as skipped so its run completes.
+SCRAPER_PLATFORM_CONCURRENCY = {
+    'linkedin': 2,
+    'indeed': 1,
+    'glassdoor': 1,
+    'career_page': 1,
+}
+SCRAPER_SLOTS_REDIS_URL = config('REDIS_URL', default='redis://localhost:6379/0')  # empty = uncapped
+SCRAPER_SLOT_TTL = 60 * 60  # seconds before a crashed task's slot is reclaimed
+SCRAPER_SLOT_RETRY_DELAY = 60
+SCRAPER_SLOT_MAX_RETRIES = 30
+# Scraped jobs travel to the ingest queue through the broker, gzip-compressed;
+# descriptions are cut to this length so one message stays bounded
+SCRAPER_MAX_DESCRIPTION_CHARS = 20000
+SCRAPER_MANUAL_PRIORITY = 7  # admin-triggered scrapes queue behind scheduled ones
+
+# Adaptive scheduling: scrape_all_platforms runs every cycle and queues only the
+# partitions whose recent new-job yield makes a visit worthwhile, within a
+# page budget per cycle (see apps/scrapers/scheduler.py)
+SCRAPER_PAGE_BUDGET = 70  # results pages per hourly cycle, about the old 405 pages every 6 hours
+SCRAPER_MAX_PAGES = 3  # results pages per partition; full (sweep) runs always get this many
+SCRAPER_YIELD_WINDOW_DAYS = 7  # telemetry window for new jobs per hour
+SCRAPER_MIN_EXPECTED_NEW = 5  # visit once this many new postings are estimated to be waiting
+SCRAPER_MIN_INTERVAL_HOURS = 1
+SCRAPER_MAX_INTERVAL_HOURS = 24  # revisit even partitions that have stopped yielding
+SCRAPER_CAREER_INTERVAL_HOURS = 6
+SCRAPER_JOBS_PER_PAGE = {
+    'linkedin': 25,
+    'indeed': 15,
+    'glassdoor': 30,
+}
+
+# Browser pool: warm Chrome sessions kept per Celery worker process. With the
+# default prefork pool each child runs one task at a time, so 1 is enough;
+# for threaded/gevent workers set it to the worker --concurrency.
+SCRAPER_BROWSER_POOL_SIZE = config('SCRAPER_BROWSER_POOL_SIZE', default=1, cast=int)
+SCRAPER_BROWSER_MAX_PAGES = config('SCRAPER_BROWSER_MAX_PAGES', default=200, cast=int)  # recycle after N pages
+
+# Resource profiles for Chrome sessions. 'lean' returns at DOMContentLoaded and
+# never requests images, media, fonts or the third-party hosts listed; scrapers
+# wait for their own listing selectors instead. 'full' is Chrome's default,
+# kept for comparison (`manage.py benchmark_page_load`).
+SCRAPER_BROWSER_PROFILE = config('SCRAPER_BROWSER_PROFILE', default='lean')
+SCRAPER_BROWSER_PROFILES = {
+    'lean': {
+        'page_load_strategy': 'eager',
+        'block_images': True,
+        'block_media': True,
+        'block_fonts': True,
+        'blocked_urls': [
+            '*google-analytics.com*', '*googletagmanager.com*', '*googlesyndication.com*',
+            '*doubleclick.net*', '*adservice.google.*', '*facebook.net*', '*connect.facebook.com*',
+            '*hotjar.com*', '*clarity.ms*', '*segment.io*', '*segment.com/analytics*',
+            '*newrelic.com*', '*nr-data.net*', '*optimizely.com*', '*criteo.com*',
+            '*adnxs.com*', '*scorecardresearch.com*', '*quantserve.com*', '*taboola.com*',
+            '*outbrain.com*', '*intercom.io*', '*licdn.com/li/track*', '*ads.linkedin.com*',
+        ],
+    },
+    'full': {
+        'page_load_strategy': 'normal',
+        'block_images': False,
+        'block_media': False,
+        'block_fonts': False,
+        'blocked_urls': [],
+    },
+}
+SCRAPER_BROWSER_WAIT_TIMEOUT = 10  # seconds to wait for a scraper's selector
+
+# Raw page archive: gzip-compressed page bodies keyed by sha256, re-parsed
+# offline with `manage.py reparse_archive`
+SCRAPER_ARCHIVE_ENABLED = config('SCRAPER_ARCHIVE_ENABLED', default=True, cast=bool)
+SCRAPER_ARCHIVE_ROOT = config('SCRAPER_ARCHIVE_ROOT', default=str(BASE_DIR / 'page_archive'))
+
+# Similar jobs
+SIMILAR_JOBS_INDEX_REFRESH = 300  # seconds between incremental index syncs
+SIMILAR_JOBS_MAX_RESULTS = 50
+
+# Cross-platform duplicate detection
+DUPLICATE_SIMILARITY_THRESHOLD = 0.6  # estimated Jaccard similarity of posting shingles
+
+# Live change feed: ingest publishes new and deactivated postings, streamed to
+# dashboards as Server-Sent Events from /api/jobs/stream/
+CHANGE_FEED_REDIS_URL = config('REDIS_URL', default='redis://localhost:6379/0')  # empty = in-process only
+CHANGE_FEED_CHANNEL = 'jobs:changes'
+CHANGE_FEED_BUFFER_SIZE = 256  # recent events replayed to reconnecting clients
+CHANGE_FEED_HEARTBEAT_SECONDS = 15
+CHANGE_FEED_STREAM_SECONDS = 300  # streams end after this long and the client reconnects
+
+# Job alerts: seconds between syncs of each worker's saved search index
+SAVED_SEARCH_INDEX_REFRESH = 60
+
+# Retention: inactive postings untouched for this long are deleted in batches
+JOB_RETENTION_DAYS = 90
+JOB_CLEANUP_BATCH_SIZE = 1000
+
 # Celery Beat Schedule
 CELERY_BEAT_SCHEDULE = {
     'scrape-all-platforms': {
         'task': 'apps.scrapers.tasks.scrape_all_platforms',
-        'schedule': 60.0 * 60.0 * 6,  # Every 6 hours
+        'schedule': 60.0 * 60.0,  # Hourly; the scheduler decides which partitions are due
     },
+    # Each scrape run refreshes the skills it touched; the daily full pass
+    # moves the 30-day growth windows and catches chords that never fired
     'update-skill-demand': {
         'task': 'apps.scrapers.tasks.update_skill_demand',
-        'schedule': 60.0 * 60.0 * 12,  # Every 12 hours
+        'schedule': 60.0 * 60.0 * 24,  # Daily
     },
     'cleanup-old-jobs': {
         'task': 'apps.scrapers.tasks.cleanup_old_jobs',
@@ -14,3 +14,8 @@ from django.core.wsgi import get_wsgi_application
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'job_analyzer.settings')
 
 application = get_wsgi_application()
+
+# Load the similar-jobs index in the background before the first request needs it
+from apps.analytics.similarity import get_similarity_index  # noqa: E402
+
+get_similarity_index()
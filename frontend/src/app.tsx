@@ -1,6 +1,7 @@
-import React from 'react';
+import React, { useEffect } from 'react';
 import { BrowserRouter as Router, Routes, Route } from 'react-router-dom';
-import { QueryClient, QueryClientProvider } from 'react-query';
+import { QueryClient, QueryClientProvider, useQueryClient } from 'react-query';
+import { AxiosResponse } from 'axios';
 import { ThemeProvider, createTheme } from '@mui/material/styles';
 import CssBaseline from '@mui/material/CssBaseline';
 import { AppBar, Toolbar, Typography, Container } from '@mui/material';
@@ -9,6 +10,8 @@ import Dashboard from './components/Dashboard/Dashboard';
 import JobList from './components/Jobs/JobList';
 import JobDetail from './components/Jobs/JobDetail';
 import Analytics from './components/Analytics/Analytics';
+import { subscribeToJobChanges } from './services/api';
+import { MarketOverview, PostingChanges } from './types';
 
 const theme = createTheme({
   palette: {
@@ -31,9 +34,72 @@ const queryClient = new QueryClient({
   },
 });
 
+// Queries a posting change can move; detail pages are refreshed only for their own posting
+const LIVE_QUERY_KEYS = [
+  'jobs',
+  'marketOverview',
+  'locationDistribution',
+  'topSkills',
+  'experienceDistribution',
+  'employmentTypeDistribution',
+  'remoteWorkTrends',
+  'hiringTrends',
+  'industryInsights',
+];
+// Events arrive once per ingest batch, so refetches are batched per window,
+// and jittered so connected dashboards do not all refetch at the same moment
+const REFRESH_DELAY_MS = 60 * 1000;
+const REFRESH_JITTER_MS = 30 * 1000;
+
+// Keep what is on screen current from the change feed instead of polling
+const LiveUpdates: React.FC = () => {
+  const client = useQueryClient();
+
+  useEffect(() => {
+    let timer: ReturnType<typeof setTimeout> | undefined;
+
+    const scheduleRefresh = () => {
+      if (timer !== undefined) return;
+      timer = setTimeout(() => {
+        timer = undefined;
+        LIVE_QUERY_KEYS.forEach((key) => client.invalidateQueries(key));
+      }, REFRESH_DELAY_MS + Math.random() * REFRESH_JITTER_MS);
+    };
+
+    const applyChanges = (changes: PostingChanges) => {
+      // Headline counts take the published deltas right away; the refresh reconciles the rest
+      // The query caches the whole axios response, so the counts live under data
+      const overview = client.getQueryData<AxiosResponse<MarketOverview>>('marketOverview');
+      if (overview) {
+        client.setQueryData<AxiosResponse<MarketOverview>>('marketOverview', {
+          ...overview,
+          data: {
+            ...overview.data,
+            total_active_jobs: overview.data.total_active_jobs + changes.deltas.active_jobs,
+            new_jobs_last_30_days: overview.data.new_jobs_last_30_days + changes.deltas.new_jobs,
+          },
+        });
+      }
+      [...changes.reactivated, ...changes.deactivated].forEach((id) =>
+        client.invalidateQueries(['job', id], { exact: true })
+      );
+      scheduleRefresh();
+    };
+
+    const unsubscribe = subscribeToJobChanges(applyChanges, scheduleRefresh);
+    return () => {
+      unsubscribe();
+      if (timer !== undefined) clearTimeout(timer);
+    };
+  }, [client]);
+
+  return null;
+};
+
 function App() {
   return (
     <QueryClientProvider client={queryClient}>
+      <LiveUpdates />
       <ThemeProvider theme={theme}>
         <CssBaseline />
         <Router>
@@ -19,10 +19,10 @@ import { jobsApi } from '../../services/api';
 import { formatCurrency, formatNumber } from '../../utils/formatters';
 
 const MarketOverview: React.FC = () => {
+  // Kept current by the live change feed (LiveUpdates in app.tsx)
   const { data: overview, isLoading, error } = useQuery(
     'marketOverview',
-    () => jobsApi.getMarketOverview(),
-    { refetchInterval: 300000 } // Refetch every 5 minutes
+    () => jobsApi.getMarketOverview()
   );
 
   if (isLoading) {
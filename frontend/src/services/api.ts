@@ -9,7 +9,8 @@ import {
   HiringTrend,
   RemoteWorkTrend,
   SearchFilters,
-  PaginatedResponse
+  PaginatedResponse,
+  PostingChanges
 } from '../types';
 
 const API_BASE_URL = process.env.REACT_APP_API_URL || 'http://localhost:8000/api';
@@ -36,6 +37,9 @@ export const jobsApi = {
   getJobById: (id: string) =>
     api.get<JobPosting>(`/jobs/${id}/`),
 
+  getSimilarJobs: (id: string, limit?: number) =>
+    api.get<(JobPosting & { similarity: number })[]>(`/jobs/${id}/similar/`, { params: { limit } }),
+
   // Companies
   getCompanies: (params?: { page?: number; page_size?: number }) =>
     api.get<PaginatedResponse<Company>>('/companies/', { params }),
@@ -75,4 +79,16 @@ export const jobsApi = {
   // Admin actions
   triggerScraping: () =>
     api.post('/admin/trigger-scraping/'),
-};
\ No newline at end of file
+};
+
+// Live posting changes over Server-Sent Events; returns a function that closes the stream.
+// onReset fires when the server no longer has the events missed while disconnected.
+export const subscribeToJobChanges = (
+  onChange: (changes: PostingChanges) => void,
+  onReset: () => void
+) => {
+  const source = new EventSource(`${API_BASE_URL}/jobs/stream/`);
+  source.addEventListener('postings', (event) => onChange(JSON.parse((event as MessageEvent).data)));
+  source.addEventListener('reset', onReset);
+  return () => source.close();
+};
@@ -44,6 +44,7 @@ export interface SkillDemand {
 
 export interface MarketOverview {
   total_active_jobs: number;
+  unique_vacancies: number;
   new_jobs_last_30_days: number;
   remote_opportunities: number;
   remote_percentage: number;
@@ -99,4 +100,21 @@ export interface PaginatedResponse<T> {
   next: string | null;
   previous: string | null;
   results: T[];
-}
\ No newline at end of file
+}
+
+export interface PostingChanges {
+  at: string;
+  platform: string;
+  inserted: string[];
+  reactivated: string[];
+  deactivated: string[];
+  deltas: {
+    active_jobs: number;
+    new_jobs: number;
+    reactivated_jobs: number;
+    deactivated_jobs: number;
+    counties: Record<string, number>;
+    remote_types: Record<string, number>;
+    skills: Record<string, number>;
+  };
+}